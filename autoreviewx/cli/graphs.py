@@ -1,11 +1,12 @@
 import os
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from math import pi
 from datetime import datetime
 from pathlib import Path
 
+from autoreviewx.core.schema import read_table
+
 
 def generate_graphs(input_file, output_dir=None):
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -28,13 +29,13 @@ def generate_graphs(input_file, output_dir=None):
 
     output_path.mkdir(parents=True, exist_ok=True)
 
-    # Load dataset
-    df = pd.read_csv(input_file)
+    # Load dataset (CSV, Parquet or Feather)
+    df = read_table(input_file)
 
     # === PRISMA Heatmap ===
     prisma_cols = [col for col in df.columns if col.startswith("prisma_") and col.endswith("_pass")]
     if prisma_cols:
-        prisma_data = df[prisma_cols].mean().to_frame().T
+        prisma_data = df[prisma_cols].mean().astype(float).to_frame().T
         plt.figure(figsize=(12, 2))
         sns.heatmap(prisma_data, annot=True, cmap="YlGnBu", cbar=False)
         plt.title("PRISMA: Percentage of articles satisfying each item")
@@ -56,7 +57,7 @@ def generate_graphs(input_file, output_dir=None):
     # === CASP Radar Chart ===
     casp_cols = [col for col in df.columns if col.startswith("casp_") and col.endswith("_score")]
     if casp_cols:
-        scores = df[casp_cols].mean().tolist()
+        scores = df[casp_cols].mean().astype(float).tolist()
         categories = casp_cols
         N = len(categories)
         angles = [n / float(N) * 2 * pi for n in range(N)]
@@ -74,7 +75,7 @@ def generate_graphs(input_file, output_dir=None):
     # === TAPUPAS Barplot ===
     tapupas_cols = ['transparency', 'accuracy', 'purposivity', 'utility', 'propriety', 'accessibility', 'specificity']
     if all(col in df.columns for col in tapupas_cols):
-        tapupas_scores = df[tapupas_cols].mean()
+        tapupas_scores = df[tapupas_cols].mean().astype(float)
         plt.figure(figsize=(10, 6))
         sns.barplot(x=tapupas_scores.index, y=tapupas_scores.values)
         plt.xticks(rotation=45, ha="right")
@@ -87,8 +88,8 @@ def generate_graphs(input_file, output_dir=None):
     score_cols = [col for col in df.columns if col.startswith("kitch_") and col.endswith("_score")]
     bool_cols = [col for col in df.columns if col.startswith("kitch_") and col.endswith("_pass")]
     if score_cols and bool_cols:
-        score_vals = df[score_cols].mean().tolist()
-        bool_vals = df[bool_cols].mean().tolist()
+        score_vals = df[score_cols].mean().astype(float).tolist()
+        bool_vals = df[bool_cols].mean().astype(float).tolist()
         labels = [col.replace("kitch_", "").replace("_score", "") for col in score_cols]
         score_vals += score_vals[:1]
         bool_vals += bool_vals[:1]
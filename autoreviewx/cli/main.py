@@ -1,103 +1,20 @@
 # autoreviewx/cli/main.py
 import argparse
-import re
 import pandas as pd
 import os
-import spacy
 from tqdm import tqdm
 from datetime import datetime
 from autoreviewx.core.config import load_config, ConfigError
-from autoreviewx.core.extractor import extract_text_from_pdf
+from autoreviewx.core.extractor import extract_metadata_from_text, extract_text_from_pdf, find_pdf_files
+from autoreviewx.core.enrichment import enrich_frame
+from autoreviewx.core.schema import apply_schema, export_columns, read_table, to_frame, write_table
+from autoreviewx.core.sharding import shard_suffix
 
-from autoreviewx.core.grobid_extractor import extract_metadata_with_grobid
+from autoreviewx.core.grobid_extractor import collect_pdf_files, extract_metadata_with_grobid
 from autoreviewx.core.grobid_extractor import extract_batch_metadata_with_grobid
 from autoreviewx.core.enhanced_extraction import enrich_metadata, extract_title_candidates
 from autoreviewx.cli.graphs import generate_graphs
 
-# Charge le modèle spaCy une seule fois
-nlp = spacy.load("en_core_web_sm")
-
-def extract_year_from_text(text: str) -> str:
-    match = re.search(r"(20[0-2][0-9])", text)
-    return match.group(1) if match else ""
-
-def extract_doi(text: str) -> str:
-    match = re.search(r'(10\.\d{4,9}/[-._;()/:A-Z0-9]+)', text, re.IGNORECASE)
-    return match.group(1) if match else ""
-
-def extract_authors(lines: list) -> str:
-    stopwords = ["license", "open access", "copyright", "rights", "university", "school", "learning", "department"]
-    best_candidate = ""
-    max_count = 0
-
-    for line in lines[:50]:  # Analyse les 50 premières lignes
-        lowered = line.lower()
-        if any(word in lowered for word in stopwords):
-            continue
-
-        # Extraire les "Prénom Nom" avec majuscules
-        names = re.findall(r"\b[A-Z][a-z]+ [A-Z][a-z]+(?:\b|,)", line)
-        if len(names) > max_count:
-            max_count = len(names)
-            best_candidate = line
-
-    # Nettoyage des noms
-    author_list = [a.strip(" ,;") for a in re.split(r"\||,| and ", best_candidate) if len(a.strip()) > 3]
-    return "; ".join(author_list)
-
-def extract_authors_with_ner(text: str) -> str:
-    # Prendre seulement le début du texte (généralement là où les auteurs apparaissent)
-    header_text = "\n".join(text.split("\n")[:100])
-
-    # Nettoyer les lignes inutiles (licence, éditeurs, etc.)
-    filtered_lines = []
-    stopwords = ["license", "journal", "publisher", "open access", "rights", "doi", "abstract", "©"]
-    for line in header_text.split("\n"):
-        if any(bad in line.lower() for bad in stopwords):
-            continue
-        filtered_lines.append(line.strip())
-
-    clean_text = " ".join(filtered_lines)
-
-    doc = nlp(clean_text)
-    people = [ent.text for ent in doc.ents if ent.label_ == "PERSON"]
-    unique_people = list(set([p.strip() for p in people if len(p.strip()) > 5]))
-
-    return "; ".join(unique_people[:8])
-
-def extract_metadata_from_text(text: str, source_file: str) -> dict:
-    lines = [line.strip() for line in text.split("\n") if line.strip()]
-    title_candidates = sorted(lines[:10], key=len, reverse=True)
-    title = title_candidates[0] if title_candidates else ""
-
-    abstract = ""
-    for i, line in enumerate(lines):
-        if "abstract" in line.lower():
-            abstract = " ".join(lines[i + 1:i + 6])
-            break
-
-    keywords = []
-    for line in lines:
-        lowered = line.lower()
-        if "keywords" in lowered or "index terms" in lowered:
-            keyword_line = re.split(r":|—", line, maxsplit=1)[-1]
-            keywords = [kw.strip().strip('.') for kw in keyword_line.split(",")]
-            break
-
-    # Heuristique d’auteurs
-    authors = extract_authors(lines)
-    if not authors or len(authors.split()) < 2:
-        authors = extract_authors_with_ner(text)
-    return {
-        "title": title,
-        "authors": authors,
-        "abstract": abstract,
-        "year": extract_year_from_text(text),
-        "keywords": "; ".join(keywords),
-        "doi": extract_doi(text),
-        "source_file": os.path.basename(source_file)
-    }
-
 def run_review(config_path):
     print(f"📄 Loading config from {config_path}...")
     config = load_config(config_path)
@@ -111,19 +28,125 @@ def main():
     )
     subparsers = parser.add_subparsers(dest="command")
 
+    # Options shared by every command that talks to GROBID
+    grobid_options = argparse.ArgumentParser(add_help=False)
+    grobid_options.add_argument("--grobid", action="append", metavar="URL",
+                                help="GROBID base URL (repeatable; default: $AUTOREVIEWX_GROBID_URLS or localhost:8070)")
+    grobid_options.add_argument("--grobid-concurrency", type=int, default=4,
+                                help="Maximum requests in flight per GROBID endpoint")
+    grobid_options.add_argument("--deadline", type=float, metavar="SECONDS",
+                                help="Give up on GROBID for a document after this long, retries included")
+    grobid_options.add_argument("--hedge-percentile", type=float, metavar="P",
+                                help="Send a duplicate request to another endpoint once a document is slower "
+                                     "than this latency percentile (e.g. 95)")
+    grobid_options.add_argument("--local-fallback", action="store_true",
+                                help="Extract with PyMuPDF when GROBID fails or misses the deadline "
+                                     "(rows tagged extraction_source=local)")
+
+    # Full text (title, abstract, body) in an inverted index for `search`
+    text_index_options = argparse.ArgumentParser(add_help=False)
+    text_index_options.add_argument("--text-index", type=str, nargs="?", const="data/index/fulltext.sqlite",
+                                    metavar="PATH", help="Also index each document's text for `search` "
+                                                         "(default: data/index/fulltext.sqlite)")
+
+    # Options shared by extraction commands: persist document vectors for `similar`,
+    # references for `citations` and the text for `search`
+    index_options = argparse.ArgumentParser(add_help=False, parents=[text_index_options])
+    index_options.add_argument("--index", type=str, metavar="DIR",
+                               help="Also store each document vector in this index (see `similar`)")
+    index_options.add_argument("--citations", type=str, metavar="DIR",
+                               help="Also add each document's references to this citation graph (see `citations`)")
+
+    # Options shared by batch commands: deterministic partitioning over machines
+    shard_options = argparse.ArgumentParser(add_help=False)
+    shard_options.add_argument("--shard", type=str, metavar="i/N",
+                               help="Only process shard i of N (0-based), assigned by a stable hash")
+    shard_options.add_argument("--shard-by", choices=["path", "content"], default="path",
+                               help="Hash the relative path (default) or the file content")
+
+    # Word vectors memory-mapped from one exported table (shared by worker processes)
+    vector_options = argparse.ArgumentParser(add_help=False)
+    vector_options.add_argument("--shared-vectors", type=str, nargs="?", const="data/cache/vectors", metavar="DIR",
+                                help="Export the spaCy word vectors once to DIR and memory-map them in every process")
+    vector_options.add_argument("--float16-vectors", action="store_true",
+                                help="Share the word vectors as float16 (half the memory, scores within ~1e-3; "
+                                     "tokenizer-only pipeline)")
+
+    # Options shared by commands that run spaCy on documents
+    cache_options = argparse.ArgumentParser(add_help=False, parents=[vector_options])
+    cache_options.add_argument("--nlp-cache", type=str, default="data/cache/nlp", metavar="DIR",
+                               help="Per-document NLP cache (document vectors) reused across runs")
+    cache_options.add_argument("--no-nlp-cache", action="store_true", help="Do not read or write the NLP cache")
+    cache_options.add_argument("--stage-budget", action="append", metavar="STAGE=SECONDS",
+                               help="Per-document time budget of an analysis stage (frameworks, semantic, samples, "
+                                    "pico, goal; 0 = unlimited); stages over budget are listed in stage_timeouts")
+
+    # Columns to compute: only the extraction stages they need are run
+    selection_options = argparse.ArgumentParser(add_help=False)
+    selection_options.add_argument("--fields", nargs="+", metavar="FIELD",
+                                   help="Only compute these columns or groups (header, semantic, samples, pico, "
+                                        "frameworks, scores), comma- or space-separated")
+    selection_options.add_argument("--frameworks", nargs="+", metavar="NAME",
+                                   help="Only score these frameworks (e.g. casp prisma)")
+    selection_options.add_argument("--cascade", type=float, nargs="?", const=0.1, metavar="MARGIN",
+                                   help="Score framework dimensions on the abstract first; only scores within MARGIN "
+                                        "of the threshold (default 0.1) are rescored on the full text (*_tier)")
+
+    # Missing DOI/year/journal looked up in OpenAlex and Crossref (cached, rate limited)
+    enrichment_options = argparse.ArgumentParser(add_help=False)
+    enrichment_options.add_argument("--sources", nargs="+", choices=["openalex", "crossref"],
+                                    default=["openalex", "crossref"], help="Sources to query, in order")
+    enrichment_options.add_argument("--mailto", type=str, metavar="EMAIL",
+                                    help="Contact address sent to the APIs (polite pool)")
+    enrichment_options.add_argument("--rate", action="append", default=[], metavar="SOURCE=PER_SECOND",
+                                    help="Request rate limit of a source (default: openalex=10, crossref=5)")
+    enrichment_options.add_argument("--enrichment-cache", type=str, default="data/cache/enrichment.sqlite",
+                                    metavar="PATH", help="SQLite cache of API answers (reruns are offline)")
+    enrichment_options.add_argument("--offline", action="store_true",
+                                    help="Only use answers already in the enrichment cache")
+
+    # Options shared by commands that write extraction tables
+    output_options = argparse.ArgumentParser(add_help=False)
+    output_options.add_argument("--format", choices=["csv", "parquet", "feather"], default="csv",
+                                help="Output format of timestamped outputs (Parquet/Feather keep column types)")
+
+    # Pre-flight checks (PyMuPDF) run before files are sent to GROBID
+    preflight_limit_options = argparse.ArgumentParser(add_help=False)
+    preflight_limit_options.add_argument("--min-text-chars", type=int, default=200,
+                                         help="Minimum characters of text in the first pages "
+                                              "(below: scanned/no text layer)")
+    preflight_limit_options.add_argument("--max-pages", type=int, help="Skip PDFs with more pages")
+    preflight_limit_options.add_argument("--max-size-mb", type=float, help="Skip PDFs larger than this")
+    preflight_options = argparse.ArgumentParser(add_help=False, parents=[preflight_limit_options])
+    preflight_options.add_argument("--preflight", action="store_true",
+                                   help="Quarantine encrypted, corrupted or text-less PDFs and extract largest first")
+
     parser_enhanced = subparsers.add_parser("extract-intelligent",
-                                            help="Extract metadata using intelligent heuristics and NLP")
+                                            help="Extract metadata using intelligent heuristics and NLP",
+                                            parents=[cache_options])
     parser_enhanced.add_argument("--pdf", type=str, required=True, help="Path to PDF file")
+    parser_enhanced.add_argument("--cluster-model", type=str,
+                                 help="Topic model from `autoreviewx cluster` (default: keyword clusters)")
 
     parser_validate = subparsers.add_parser("validate-config", help="Validate a YAML protocol config file")
     parser_validate.add_argument("--path", type=str, default="config.yaml", help="Path to config file")
 
     parser_extract_with_config = subparsers.add_parser(
         "extract-with-config",
-        help="Extract and filter metadata from PDFs using a review protocol config"
+        help="Extract and filter metadata from PDFs using a review protocol config",
+        parents=[grobid_options, selection_options, cache_options, index_options, shard_options, preflight_options,
+                 output_options]
+    )
+    parser_extract_with_config.add_argument(
+        "--config", type=str, nargs="+", default=["config.yaml"],
+        help="Path to config file; several configs share one extraction pass and get one output each"
+    )
+    parser_extract_with_config.add_argument(
+        "--screen", action="store_true", help="Also rank each config's papers against its criteria (screen_*)"
     )
     parser_extract_with_config.add_argument(
-        "--config", type=str, default="config.yaml", help="Path to config file"
+        "--margin", type=float, default=0.5, help="Screening score beyond which a paper is suggested for "
+                                                  "inclusion/exclusion"
     )
     parser_extract_with_config.add_argument(
         "--dir", type=str, required=True, help="Directory containing PDFs to extract"
@@ -133,19 +156,65 @@ def main():
     parser_run.add_argument("--config", type=str, default="config.yaml", help="Path to YAML config file")
 
     parser_extract_grobid_batch = subparsers.add_parser("extract-grobid-batch",
-                                                        help="Batch extract metadata using GROBID")
+                                                        help="Batch extract metadata using GROBID",
+                                                        parents=[grobid_options, selection_options, cache_options,
+                                                                 index_options, shard_options, preflight_options,
+                                                                 output_options, enrichment_options])
     parser_extract_grobid_batch.add_argument("--dir", type=str, required=True, help="Directory containing PDF files")
+    parser_extract_grobid_batch.add_argument("--recursive", action="store_true", help="Include PDFs in sub-folders")
+    parser_extract_grobid_batch.add_argument("--nlp-batch", type=int, default=64,
+                                             help="Papers collected before each batched spaCy pass")
+    parser_extract_grobid_batch.add_argument("--nlp-batch-size", type=int, default=16,
+                                             help="Documents per nlp.pipe batch (batches are bucketed by length)")
+    parser_extract_grobid_batch.add_argument("--nlp-processes", type=int, default=1,
+                                             help="spaCy worker processes (e.g. the number of cores)")
+    parser_extract_grobid_batch.add_argument("--enrich", action="store_true",
+                                             help="Fill missing DOI/year/journal from OpenAlex and Crossref")
+    parser_extract_grobid_batch.add_argument("--sample", type=int, metavar="N",
+                                             help="Quick look: extract a stratified random sample of N papers and "
+                                                  "estimate corpus statistics with confidence intervals")
+    parser_extract_grobid_batch.add_argument("--sample-fraction", type=float, metavar="F",
+                                             help="Sample this fraction of the corpus instead (e.g. 0.05)")
+    parser_extract_grobid_batch.add_argument("--stratify", choices=["folder", "year", "none"], default="folder",
+                                             help="Strata of the sample: sub-folder, year (PDF metadata or first "
+                                                  "page) or none")
+    parser_extract_grobid_batch.add_argument("--target-width", type=float, metavar="W",
+                                             help="Keep adding samples of the same size until every interval is "
+                                                  "at most W wide (e.g. 0.1)")
+    parser_extract_grobid_batch.add_argument("--confidence", type=float, default=0.95,
+                                             help="Confidence level of the bootstrap intervals")
+    parser_extract_grobid_batch.add_argument("--seed", type=int, default=0, help="Random seed of the sample")
+
+    parser_extract_local_batch = subparsers.add_parser(
+        "extract-local-batch", help="Batch extract and score PDFs without GROBID (PyMuPDF text, process pool)",
+        parents=[selection_options, cache_options, text_index_options, shard_options, preflight_options,
+                 output_options, enrichment_options])
+    parser_extract_local_batch.add_argument("--dir", type=str, required=True, help="Directory containing PDF files")
+    parser_extract_local_batch.add_argument("--recursive", action="store_true", help="Include PDFs in sub-folders")
+    parser_extract_local_batch.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                                            help="Worker processes, each running the whole pipeline "
+                                                 "(default: number of cores)")
+    parser_extract_local_batch.add_argument("--chunk-size", type=int, default=16,
+                                            help="PDFs handed to a worker at a time")
+    parser_extract_local_batch.add_argument("--nlp-batch-size", type=int, default=16,
+                                            help="Documents per nlp.pipe batch (batches are bucketed by length)")
+    parser_extract_local_batch.add_argument("--enrich", action="store_true",
+                                            help="Fill missing DOI/year/journal from OpenAlex and Crossref")
 
     # Subcommand: extract
     parser_extract = subparsers.add_parser("extract", help="Extract metadata from a PDF")
     parser_extract.add_argument("--pdf", type=str, required=True, help="Path to PDF file")
 
     # Subcommand: extract-grobid
-    parser_extract_grobid = subparsers.add_parser("extract-grobid", help="Extract metadata using GROBID")
+    parser_extract_grobid = subparsers.add_parser("extract-grobid", help="Extract metadata using GROBID",
+                                                  parents=[grobid_options, selection_options, cache_options,
+                                                           index_options, output_options])
     parser_extract_grobid.add_argument("--pdf", type=str, required=True, help="Path to PDF file")
 
     parser_extract_grobid_batch_percent = subparsers.add_parser(
-        "extract-grobid-batch-percent", help="Batch extract metadata using GROBID with progress feedback"
+        "extract-grobid-batch-percent", help="Batch extract metadata using GROBID with progress feedback",
+        parents=[grobid_options, selection_options, cache_options, index_options, shard_options, preflight_options,
+                 output_options]
     )
     parser_extract_grobid_batch_percent.add_argument("--dir", type=str, required=True,
                                                      help="Directory containing PDF files")
@@ -159,12 +228,134 @@ def main():
     parser_graphs.add_argument('--input', '-i', required=True, help='CSV file with metadata')
     parser_graphs.add_argument('--output', '-o', default='output/graphs', help='Output directory for graphs')
 
+    # Command: watch
+    parser_watch = subparsers.add_parser("watch", help="Watch a folder and extract newly dropped PDFs with GROBID",
+                                         parents=[grobid_options, selection_options, cache_options, index_options])
+    parser_watch.add_argument("--dir", type=str, default="data/raw_pdfs", help="Folder to watch (recursively)")
+    parser_watch.add_argument("--output", "-o", type=str, default="data/extracted/metadata_grobid_watch.csv",
+                              help="CSV file the results are appended to")
+    parser_watch.add_argument("--settle", type=float, default=5.0,
+                              help="Seconds a file must stay unchanged before it is processed")
+    parser_watch.add_argument("--interval", type=float, default=2.0, help="Polling / wake-up interval in seconds")
+    parser_watch.add_argument("--polling", action="store_true", help="Force polling instead of inotify")
+    parser_watch.add_argument("--retry-backoff", type=float, default=30.0,
+                              help="Seconds before a failed PDF is retried (doubling, up to one hour)")
+    parser_watch.add_argument("--once", action="store_true", help="Process the current delta and exit")
+
+    # Command: merge
+    parser_merge = subparsers.add_parser("merge", help="Merge shard outputs into one deduplicated table")
+    parser_merge.add_argument("--input", "-i", nargs="+", required=True,
+                              help="Shard files to merge (.csv, .parquet or .feather)")
+    parser_merge.add_argument("--output", "-o", type=str,
+                              help="Output table, format from its extension "
+                                   "(default: data/extracted/merged_<timestamp>.csv)")
+
+    # Command: cluster
+    parser_cluster = subparsers.add_parser("cluster", help="Incremental topic clustering of extracted papers")
+    parser_cluster.add_argument("--input", "-i", type=str, required=True,
+                                help="Metadata table (.csv, .parquet or .feather)")
+    parser_cluster.add_argument("--model", type=str, default="data/clusters/topic_model.joblib",
+                                help="Topic model file; updated in place if it already exists")
+    parser_cluster.add_argument("--clusters", "-k", type=int, default=8, help="Number of clusters for a new model")
+    parser_cluster.add_argument("--chunksize", type=int, default=2048, help="Rows read and learned per batch")
+    parser_cluster.add_argument("--no-update", action="store_true",
+                                help="Only assign clusters with an existing model, do not learn from the input")
+    parser_cluster.add_argument("--output", "-o", type=str,
+                                help="Output CSV (default: data/extracted/clustered_<timestamp>.csv)")
+    parser_cluster.add_argument("--text-index", type=str, dest="body_index",
+                                help="Also cluster on the body text of this full-text index (see --text-index "
+                                     "of the extraction commands), matched by DOI, else file name")
+
+    # Command: similar
+    parser_similar = subparsers.add_parser("similar", help="Find the papers closest to a PDF or DOI",
+                                           parents=[vector_options])
+    parser_similar.add_argument("--index", type=str, default="data/index", help="Vector index directory")
+    similar_query = parser_similar.add_mutually_exclusive_group(required=True)
+    similar_query.add_argument("--pdf", type=str, help="PDF file (indexed or not)")
+    similar_query.add_argument("--doi", type=str, help="DOI of an indexed paper")
+    parser_similar.add_argument("-k", type=int, default=10, help="Number of results")
+
+    # Command: search
+    parser_search = subparsers.add_parser("search", help="Full-text search (BM25, phrases) over indexed papers",
+                                          parents=[output_options])
+    parser_search.add_argument("--index", type=str, default="data/index/fulltext.sqlite",
+                               help="Text index built with --text-index")
+    search_query = parser_search.add_mutually_exclusive_group(required=True)
+    search_query.add_argument("--query", "-q", type=str,
+                              help='FTS5 query: words, "exact phrases", OR/NOT, NEAR(a b, 5), prefix*, title: word')
+    search_query.add_argument("--config", type=str,
+                              help="Test every exclusion criterion of this config as a phrase over the corpus")
+    parser_search.add_argument("--phrase", action="store_true", help="Match the query words as one phrase")
+    parser_search.add_argument("--fields", nargs="+", choices=["title", "abstract", "body"], dest="search_fields",
+                               help="Fields to search (default: all; title and abstract for --config)")
+    parser_search.add_argument("-k", type=int, default=10, help="Number of results (examples per criterion)")
+    parser_search.add_argument("--output", "-o", type=str, help="Also save the results (.csv/.parquet/.feather)")
+
+    # Command: preflight
+    parser_preflight = subparsers.add_parser("preflight", help="Check PDFs before extraction (no GROBID needed)",
+                                             parents=[preflight_limit_options])
+    parser_preflight.add_argument("--dir", type=str, required=True, help="Directory containing PDF files")
+    parser_preflight.add_argument("--recursive", action="store_true", help="Include PDFs in sub-folders")
+    parser_preflight.add_argument("--output", "-o", type=str,
+                                  help="Report CSV (default: data/extracted/preflight_<timestamp>.csv)")
+
+    # Command: screen
+    parser_screen = subparsers.add_parser("screen", parents=[output_options, vector_options],
+                                          help="Rank papers against the config's inclusion/exclusion criteria")
+    parser_screen.add_argument("--input", "-i", type=str, required=True,
+                               help="Table with at least title and/or abstract columns (extraction or database export)")
+    parser_screen.add_argument("--config", type=str, default="config.yaml", help="Path to config file")
+    parser_screen.add_argument("--margin", type=float, default=0.5,
+                               help="Score beyond which a paper is suggested for inclusion/exclusion")
+    parser_screen.add_argument("--batch-size", type=int, default=5000, help="Texts embedded per batch")
+    parser_screen.add_argument("--output", "-o", type=str,
+                               help="Output .csv/.parquet/.feather (default: data/extracted/screened_<timestamp>)")
+
+    # Command: citations
+    parser_citations = subparsers.add_parser("citations", help="Most-cited papers and snowballing candidates")
+    parser_citations.add_argument("--graph", type=str, default="data/citations", help="Citation graph directory")
+    parser_citations.add_argument("--top", type=int, default=20, help="Number of papers listed")
+    parser_citations.add_argument("--output", "-o", type=str,
+                                  help="Also save the snowballing candidates to this CSV")
+
+    # Command: dashboard
+    parser_dashboard = subparsers.add_parser("dashboard", help="Interactive review dashboard (Streamlit)")
+    parser_dashboard.add_argument("--input", "-i", type=str, required=True,
+                                  help="Extracted metadata (.parquet recommended for large reviews)")
+    parser_dashboard.add_argument("--port", type=int, default=8501, help="Port of the Streamlit server")
+
+    # Command: enrich
+    parser_enrich = subparsers.add_parser(
+        "enrich", help="Fill missing DOI, year and journal from OpenAlex and Crossref",
+        parents=[enrichment_options, output_options]
+    )
+    parser_enrich.add_argument("--input", "-i", type=str, required=True,
+                               help="Extracted metadata (.csv, .parquet or .feather)")
+    parser_enrich.add_argument("--output", "-o", type=str,
+                               help="Output .csv/.parquet/.feather (default: data/extracted/enriched_<timestamp>)")
+
+    # Command: rescore
+    parser_rescore = subparsers.add_parser(
+        "rescore", help="Recompute pass flags and global scores from stored similarity scores",
+        parents=[output_options]
+    )
+    parser_rescore.add_argument("--input", "-i", type=str, required=True,
+                                help="Extracted metadata (.csv, .parquet or .feather)")
+    parser_rescore.add_argument("--output", "-o", type=str,
+                                help="Output .csv/.parquet/.feather (default: data/extracted/rescored_<timestamp>)")
+    parser_rescore.add_argument("--threshold", action="append", default=[], metavar="KEY=VALUE",
+                                help="Pass threshold for a dimension (casp_ethics=0.8) or framework (casp=0.7); repeatable")
+    parser_rescore.add_argument("--weight", action="append", default=[], metavar="KEY=VALUE",
+                                help="Weight of a dimension or framework in its global score; repeatable")
+    parser_rescore.add_argument("--default-threshold", type=float,
+                                help="Threshold for dimensions without an explicit --threshold "
+                                     "(default: each framework's threshold in frameworks.yaml)")
+
     args = parser.parse_args()
 
     if args.command == 'graphs':
         generate_graphs(args.input, args.output)
-    else:
-        parser.print_help()
+        return
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
 
@@ -172,52 +363,99 @@ def main():
 
     os.makedirs("data/extracted", exist_ok=True)
 
-    columns = [
-        "title", "data_used", "models_used", "tools_used", "keywords",
-        "participants", "participants_count",
-        "biological_data", "physiological_data", "methodology",
-        "transparency", "accuracy", "purposivity",
-        "utility", "propriety", "accessibility", "specificity",
-        "score_tapupas",
-        "population", "intervention", "comparison", "outcome",
-        "score_pico",
-        "casp_clear_aim", "casp_methodology", "casp_recruitment",
-        "casp_ethics", "casp_analysis", "casp_results_stated", "casp_value",
-        "casp_clear_aim_score", "casp_clear_aim_pass",
-        "casp_methodology_score", "casp_methodology_pass",
-        "casp_recruitment_score", "casp_recruitment_pass",
-        "casp_ethics_score", "casp_ethics_pass",
-        "casp_analysis_score", "casp_analysis_pass",
-        "casp_results_stated_score", "casp_results_stated_pass",
-        "casp_value_score", "casp_value_pass",
-        "score_casp",
-        "kitch_research_question", "kitch_study_context", "kitch_data_collection",
-        "kitch_data_analysis", "kitch_validity", "kitch_replication", "kitch_contribution",
-        "kitch_research_question_score", "kitch_research_question_pass",
-        "kitch_search_strategy_score", "kitch_search_strategy_pass",
-        "kitch_inclusion_criteria_score", "kitch_inclusion_criteria_pass",
-        "kitch_data_extraction_score", "kitch_data_extraction_pass",
-        "kitch_quality_assessment_score", "kitch_quality_assessment_pass",
-        "kitch_data_synthesis_score", "kitch_data_synthesis_pass",
-        "kitch_limitations_score", "kitch_limitations_pass",
-        "score_kitchenham",
-        # Add to your CSV export columns list
-        "score_prisma",
-        "prisma_objective_pass",
-        "prisma_eligibility_criteria_pass",
-        "prisma_information_sources_pass",
-        "prisma_search_strategy_pass",
-        "prisma_selection_process_pass",
-        "prisma_data_collection_pass",
-        "prisma_risk_of_bias_pass",
-        "prisma_synthesis_pass",
-        "prisma_limitations_pass",
-        "prisma_registration_pass",
-        "title_source", "authors", "abstract", "abstract_length",
-        "doi", "year", "journal", "keywords",
-        "target_education_level",   "countries",
-        "source_file",
-    ]
+    if getattr(args, "shard", None):
+        from autoreviewx.core.sharding import parse_shard
+        try:
+            parse_shard(args.shard)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+
+    if hasattr(args, "grobid_concurrency"):
+        from autoreviewx.core.grobid_client import GrobidPool, set_default_pool
+        pool = GrobidPool(args.grobid, max_concurrency=args.grobid_concurrency, deadline=args.deadline,
+                          hedge_percentile=args.hedge_percentile)
+        if len(pool.endpoints) > 1:
+            healthy = pool.check_health()
+            print(f"🌐 {len(healthy)}/{len(pool.endpoints)} GROBID endpoint(s) healthy")
+        set_default_pool(pool)
+
+    if getattr(args, "shared_vectors", None) or getattr(args, "float16_vectors", False):
+        from autoreviewx.core.nlp import DEFAULT_MODEL
+        from autoreviewx.core.shared_vectors import DEFAULT_SHARED_DIR, enable_shared_vectors
+        try:
+            prefix = enable_shared_vectors(DEFAULT_MODEL, args.shared_vectors or DEFAULT_SHARED_DIR,
+                                           dtype="float16" if args.float16_vectors else "float32")
+        except (OSError, ValueError) as e:
+            print(f"❌ Cannot share word vectors: {e}")
+            return
+        print(f"🧠 Word vectors memory-mapped from {prefix}.data.npy")
+
+    if getattr(args, "stage_budget", None):
+        from autoreviewx.core.budget import DEFAULT_BUDGETS, set_default_budgets
+        from autoreviewx.core.scoring import parse_key_values
+        try:
+            budgets = parse_key_values(args.stage_budget)
+        except ValueError as e:
+            print(f"❌ Invalid --stage-budget: {e}")
+            return
+        unknown = sorted(set(budgets) - set(DEFAULT_BUDGETS))
+        if unknown:
+            print(f"❌ Unknown stage(s) in --stage-budget: {', '.join(unknown)} (use {', '.join(DEFAULT_BUDGETS)})")
+            return
+        set_default_budgets({**DEFAULT_BUDGETS, **budgets})
+
+    if hasattr(args, "nlp_cache") and not args.no_nlp_cache:
+        from autoreviewx.core.doc_cache import DocCache, set_default_cache
+        set_default_cache(DocCache(args.nlp_cache))
+
+    vector_index = None
+    if getattr(args, "index", None) and args.command not in ("similar", "search"):
+        from autoreviewx.core.nlp import DEFAULT_MODEL
+        from autoreviewx.core.vector_index import VectorIndex
+        vector_index = VectorIndex(args.index, model=DEFAULT_MODEL)
+
+    text_index = None
+    if getattr(args, "text_index", None):
+        from autoreviewx.core.text_index import TextIndex
+        try:
+            text_index = TextIndex(args.text_index)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return
+
+    citation_graph = None
+    if getattr(args, "citations", None):
+        from autoreviewx.core.citations import CitationGraph
+        citation_graph = CitationGraph(args.citations)
+
+    selection = None
+    if hasattr(args, "fields"):
+        from autoreviewx.core.grobid_extractor import FieldSelection
+        split = lambda values: [v.strip() for value in values or [] for v in value.split(",") if v.strip()]
+        try:
+            selection = FieldSelection(split(args.fields), split(args.frameworks), cascade=args.cascade)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+
+    enricher = None
+    if args.command == "enrich" or getattr(args, "enrich", False):
+        from autoreviewx.core.enrichment import Enricher, EnrichmentCache
+        from autoreviewx.core.scoring import parse_key_values
+        try:
+            enricher = Enricher(EnrichmentCache(args.enrichment_cache), sources=args.sources,
+                                rates=parse_key_values(args.rate), mailto=args.mailto, offline=args.offline)
+        except ValueError as e:
+            print(f"❌ Invalid --rate: {e}")
+            return
+
+    preflight_limits = {"min_text_chars": getattr(args, "min_text_chars", None),
+                        "max_pages": getattr(args, "max_pages", None),
+                        "max_size_mb": getattr(args, "max_size_mb", None)}
+    quarantine_report = f"data/extracted/quarantine_{timestamp}{shard_suffix(getattr(args, 'shard', None))}.csv"
+
+    extension = f".{getattr(args, 'format', 'csv')}"
 
     if args.command == "run":
         run_review(args.config)
@@ -250,55 +488,329 @@ def main():
         print(f"📚 APA references saved to {output_path}")
 
     elif args.command == "extract-grobid":
-        metadata = extract_metadata_with_grobid(args.pdf)
+        metadata = extract_metadata_with_grobid(args.pdf, vector_index=vector_index, citation_graph=citation_graph,
+                                                fallback=args.local_fallback, selection=selection,
+                                                text_index=text_index)
 
         print("\n✅ GROBID Metadata extracted:")
         for key, value in metadata.items():
             print(f"{key.capitalize()}: {value}")
 
-        output_path = f"data/extracted/metadata_grobid_{timestamp}.csv"
-        #output_path = "data/extracted/metadata_enriched.csv"
-
-        df = pd.DataFrame([metadata], columns=columns)
-        if os.path.exists(output_path):
-            df.to_csv(output_path, mode="a", header=False, index=False)
-        else:
-            df.to_csv(output_path, index=False)
+        output_path = f"data/extracted/metadata_grobid_{timestamp}{extension}"
+        write_table(to_frame([metadata], schema=selection.schema, extra=False), output_path)
         print(f"\n📄 Saved to {output_path}")
 
     elif args.command == "extract-with-config":
-        try:
-            config = load_config(args.config)
-        except Exception as e:
-            print(f"❌ Config error: {e}")
-            return
+        from autoreviewx.core.screening import apply_protocols, framework_columns
+        configs = []
+        for config_path in args.config:
+            try:
+                configs.append(load_config(config_path))
+                framework_columns(configs[-1]["framework"])
+            except Exception as e:
+                print(f"❌ Config error in {config_path}: {e}")
+                return
 
+        # Every PDF is extracted and analyzed once, whatever the number of configs
         results = []
-        for file in os.listdir(args.dir):
-            if not file.lower().endswith(".pdf"):
-                continue
-            path = os.path.join(args.dir, file)
+        pdf_files = collect_pdf_files(args.dir, shard=args.shard, shard_by=args.shard_by, preflight=args.preflight,
+                                      preflight_limits=preflight_limits, quarantine_report=quarantine_report)
+        for path in pdf_files:
+            file = os.path.basename(path)
             print(f"🔍 Processing {file}...")
-            data = extract_metadata_with_grobid(path)
-
-            # Filtres d’inclusion basés sur config (ex: langue, outil, etc.)
-            text = " ".join([data.get("abstract", ""), data.get("title", "")]).lower()
-            skip = False
-            for excl in config.get("exclusion_criteria", []):
-                if excl.lower() in text:
-                    skip = True
-            if skip:
-                print(f"⚠️  Excluded by criteria → {file}")
-                continue
+            results.append(extract_metadata_with_grobid(path, vector_index=vector_index, citation_graph=citation_graph,
+                                                        fallback=args.local_fallback, selection=selection,
+                                                        text_index=text_index))
 
-            results.append(data)
+        # Filtres d’inclusion basés sur chaque config (ex: langue, outil, etc.)
+        try:
+            # Several protocols without an explicit --fields/--frameworks: each output keeps its framework's columns
+            views = len(configs) > 1 and not args.fields and not args.frameworks
+            tables = apply_protocols(to_frame(results, schema=selection.schema), configs, screen_papers=args.screen,
+                                     margin=args.margin, views=views)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = f"data/extracted/filtered_metadata_{timestamp}.csv"
-        df = pd.DataFrame(results)
-        df.to_csv(output_path, index=False)
-        print(f"\n📄 Saved filtered metadata to {output_path}")
+        stems = [os.path.splitext(os.path.basename(path))[0] for path in args.config]
+        for i, (config_path, stem, (table, excluded)) in enumerate(zip(args.config, stems, tables)):
+            for file in excluded.get("source_file", []):
+                print(f"⚠️  Excluded by criteria ({stem}) → {file}")
+            name = "" if len(args.config) == 1 else f"{stem}_" if stems.count(stem) == 1 else f"{stem}{i}_"
+            output_path = f"data/extracted/filtered_metadata_{name}{timestamp}{shard_suffix(args.shard)}{extension}"
+            write_table(table, output_path)
+            print(f"\n📄 Saved {len(table)} paper(s) filtered by {config_path} to {output_path}")
+
+    elif args.command == "watch":
+        from autoreviewx.core.watcher import PdfWatcher
+
+        def append_results(paths):
+            rows, done = [], []
+            for path in paths:
+                print(f"🔍 Processing {os.path.relpath(path, args.dir)}...")
+                try:
+                    data = extract_metadata_with_grobid(path, vector_index=vector_index, citation_graph=citation_graph,
+                                                        fallback=args.local_fallback, selection=selection,
+                                                        text_index=text_index)
+                except Exception as e:
+                    print(f"❌ Failed to process {path}: {e}")
+                    continue
+                if "error" in data:
+                    print(f"❌ {path}: {data['error']}")
+                    continue
+                rows.append(data)
+                done.append(path)
+            if rows:
+                write_table(to_frame(rows, schema=selection.schema, extra=False), args.output, append=True)
+                print(f"📄 Appended {len(rows)} row(s) to {args.output}")
+            return done
+
+        watcher = PdfWatcher(args.dir, append_results, state_path=f"{args.output}.state.json",
+                             settle=args.settle, interval=args.interval, use_inotify=not args.polling,
+                             backoff=args.retry_backoff)
+        watcher.run(once=args.once)
+
+    elif args.command == "cluster":
+        from autoreviewx.core.clustering import TopicClusterer, document_text
+        from autoreviewx.core.schema import iter_table
+
+        body_index = None
+        if args.body_index:
+            from autoreviewx.core.text_index import TextIndex
+            if not os.path.exists(args.body_index):
+                print(f"❌ No text index at {args.body_index}: extract with --text-index first")
+                return
+            try:
+                body_index = TextIndex(args.body_index)
+            except RuntimeError as e:
+                print(f"❌ {e}")
+                return
+
+        def read_chunks():
+            return iter_table(args.input, chunksize=args.chunksize)
+
+        def texts(chunk):
+            records = chunk.to_dict("records")
+            if body_index is not None:
+                for record in records:
+                    doi, source_file = record.get("doi"), record.get("source_file")
+                    record["body"] = body_index.body(doi if isinstance(doi, str) else "",
+                                                     source_file if isinstance(source_file, str) else "")
+            return [document_text(record) for record in records]
+
+        if os.path.exists(args.model):
+            clusterer = TopicClusterer.load(args.model)
+            print(f"📦 Loaded topic model ({clusterer.n_docs} documents seen) from {args.model}")
+        elif args.no_update:
+            print(f"❌ No topic model at {args.model}")
+            return
+        else:
+            clusterer = TopicClusterer(n_clusters=args.clusters)
+
+        # Pass 1: learn incrementally, one chunk at a time
+        if not args.no_update:
+            for chunk in read_chunks():
+                clusterer.partial_fit(texts(chunk))
+            clusterer.save(args.model)
+            print(f"💾 Topic model saved to {args.model} ({clusterer.n_docs} documents seen)")
+
+        if not clusterer.fitted:
+            # k-means waits for at least one document per cluster
+            print(f"❌ Only {clusterer.n_docs} non-empty document(s) for {clusterer.n_clusters} clusters: "
+                  f"lower --clusters or add documents")
+            return
+
+        # Pass 2: assign clusters, streaming the output
+        labels = clusterer.cluster_labels()
+        output_path = args.output or f"data/extracted/clustered_{timestamp}.csv"
+        header = True
+        for chunk in read_chunks():
+            assigned = clusterer.predict(texts(chunk))
+            chunk["cluster"] = assigned
+            chunk["clusters"] = [labels[c] for c in assigned]
+            chunk.to_csv(output_path, mode="w" if header else "a", header=header, index=False)
+            header = False
+
+        for i, label in enumerate(labels):
+            print(f"  {i}: {label}")
+        print(f"📄 Saved to {output_path}")
+
+    elif args.command == "similar":
+        import time
+        from autoreviewx.core.vector_index import VectorIndex
+        from autoreviewx.core.frameworks import get_registry
+        from autoreviewx.core.sharding import document_key
+
+        index = VectorIndex(args.index)
+        if not len(index):
+            print(f"❌ Index {args.index} is empty: extract with --index first")
+            return
+        if args.pdf and not os.path.isfile(args.pdf):
+            print(f"❌ No such PDF: {args.pdf}")
+            return
+
+        row = index.find(doi=args.doi, key=document_key(args.pdf) if args.pdf else None)
+        if row is not None:
+            query = index.vector(row)
+        elif args.pdf:
+            query = get_registry().vectorize(extract_text_from_pdf(args.pdf))
+        else:
+            print(f"❌ DOI not in index: {args.doi}")
+            return
+
+        start = time.perf_counter()
+        hits = index.search(query, k=args.k, exclude=row)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"\n🔗 {len(hits)} closest of {len(index)} papers ({elapsed:.1f} ms):")
+        for rank, (score, record) in enumerate(hits, 1):
+            doi = f" — {record['doi']}" if record.get("doi") else ""
+            print(f"{rank:>3}. {score:.3f}  {record.get('title')}{doi} [{record.get('source_file')}]")
+
+    elif args.command == "search":
+        import time
+        from autoreviewx.core.text_index import TextIndex, phrase_query
+        if not os.path.exists(args.index):
+            print(f"❌ No text index at {args.index}: extract with --text-index first")
+            return
+        try:
+            index = TextIndex(args.index)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return
+        start = time.perf_counter()
+        try:
+            if args.config:
+                config = load_config(args.config)
+                report = index.check_criteria(config.get("exclusion_criteria") or [],
+                                              fields=args.search_fields or ("title", "abstract"), k=args.k)
+            else:
+                query = phrase_query(args.query) if args.phrase else args.query
+                hits = index.search(query, k=args.k, fields=args.search_fields)
+                total = index.count(query, fields=args.search_fields)
+        except (ConfigError, ValueError) as e:
+            print(f"❌ {e}")
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+
+        if args.config:
+            print(f"\n🧪 Exclusion criteria of {args.config} over {len(index)} papers ({elapsed:.1f} ms):")
+            for item in report:
+                examples = f" — e.g. {', '.join(item['examples'])}" if item["examples"] else ""
+                print(f"{item['matches']:>6}  {item['criterion']}{examples}")
+            results = pd.DataFrame(report, columns=["criterion", "matches", "examples"])
+            results["examples"] = results["examples"].str.join("; ")
+        else:
+            print(f"\n🔎 {total} of {len(index)} papers match ({elapsed:.1f} ms), best {len(hits)}:")
+            for rank, hit in enumerate(hits, 1):
+                doi = f" — {hit['doi']}" if hit["doi"] else ""
+                print(f"{rank:>3}. {hit['score']:.3f}  {hit['title']}{doi} [{hit['source_file']}]")
+                print(f"       {hit['snippet']}")
+            results = pd.DataFrame(hits, columns=["source_file", "doi", "title", "score", "snippet"])
+        if args.output:
+            write_table(results, args.output)
+            print(f"📄 Saved to {args.output}")
+
+    elif args.command == "screen":
+        import time
+        from autoreviewx.core.screening import screen
+        try:
+            config = load_config(args.config)
+        except ConfigError as e:
+            print(f"❌ Config error: {e}")
+            return
+
+        df = read_table(args.input)
+        start = time.perf_counter()
+        screened = screen(df, config, batch_size=args.batch_size, margin=args.margin)
+        elapsed = time.perf_counter() - start
+
+        counts = screened["screen_suggestion"].value_counts()
+        print(f"✅ Screened {len(screened)} papers in {elapsed:.1f}s: "
+              f"{counts.get('include', 0)} include, {counts.get('review', 0)} review, "
+              f"{counts.get('exclude', 0)} exclude")
+        output_path = args.output or f"data/extracted/screened_{timestamp}{extension}"
+        write_table(screened, output_path)
+        print(f"📄 Saved to {output_path}")
+
+    elif args.command == "preflight":
+        from autoreviewx.core.preflight import inspect_pdf, write_report
+        reports = [inspect_pdf(path, **preflight_limits) for path in find_pdf_files(args.dir, recursive=args.recursive)]
+        skipped = [r for r in reports if r["status"] != "ok"]
+        for r in skipped:
+            print(f"🚧 {os.path.relpath(r['file'], args.dir)}: {r['reason']}")
+        output_path = args.output or f"data/extracted/preflight_{timestamp}.csv"
+        write_report(reports, output_path)
+        print(f"✅ {len(reports) - len(skipped)}/{len(reports)} PDF(s) ready for extraction")
+        print(f"📄 Saved to {output_path}")
+
+    elif args.command == "citations":
+        from autoreviewx.core.citations import CitationGraph
+
+        if not os.path.isdir(args.graph):
+            print(f"❌ No citation graph at {args.graph}: extract with --citations first")
+            return
+        graph = CitationGraph(args.graph)
+        cited = graph.ranked(in_corpus=True, top=args.top)
+        candidates = graph.ranked(in_corpus=False, top=args.top)
+        print(f"🕸️  {len(graph)} works, {len(graph.edges())} citations")
+
+        print("\n🏆 Most cited within the corpus:")
+        for rank, node in enumerate(cited, 1):
+            print(f"{rank:>3}. {node['citations']:>4}×  {node['title'] or node['doi']}")
+        print("\n❄️  Snowballing candidates (cited by the corpus, not extracted):")
+        for rank, node in enumerate(candidates, 1):
+            year = f" ({node['year']})" if node["year"] else ""
+            doi = f" — {node['doi']}" if node["doi"] else ""
+            print(f"{rank:>3}. {node['citations']:>4}×  {node['title']}{year}{doi}")
+
+        if args.output:
+            pd.DataFrame(candidates, columns=["citations", "title", "year", "doi", "key"]).to_csv(args.output,
+                                                                                                 index=False)
+            print(f"📄 Saved to {args.output}")
+
+    elif args.command == "dashboard":
+        import subprocess
+        import sys
+        if not os.path.exists(args.input):
+            print(f"❌ File not found: {args.input}")
+            return
+        app = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gui", "dashboard.py")
+        print(f"📊 Serving {args.input} on http://localhost:{args.port}")
+        subprocess.run([sys.executable, "-m", "streamlit", "run", app, "--server.port", str(args.port),
+                        "--", "--input", os.path.abspath(args.input)])
+
+    elif args.command == "enrich":
+        df = read_table(args.input)
+        enriched = apply_schema(enrich_frame(df, enricher))
+
+        output_path = args.output or f"data/extracted/enriched_{timestamp}{extension}"
+        write_table(enriched, output_path)
+        filled = int(enriched["enrichment_source"].notna().sum())
+        print(f"✅ Enriched {filled}/{len(enriched)} rows ({enricher.requests} request(s), "
+              f"{enricher.cache_hits} cached answer(s), {enricher.errors} error(s))")
+        print(f"📄 Saved to {output_path}")
+
+    elif args.command == "rescore":
+        from autoreviewx.core.scoring import rescore, parse_key_values
+        try:
+            thresholds = parse_key_values(args.threshold)
+            weights = parse_key_values(args.weight)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+
+        df = read_table(args.input)
+        try:
+            rescored = rescore(df, thresholds=thresholds, weights=weights, default_threshold=args.default_threshold)
+        except ConfigError as e:
+            print(f"❌ {e}")
+            return
 
+        output_path = args.output or f"data/extracted/rescored_{timestamp}{extension}"
+        write_table(apply_schema(rescored), output_path)
+        print(f"✅ Rescored {len(rescored)} rows")
+        print(f"📄 Saved to {output_path}")
 
     elif args.command == "validate-config":
         try:
@@ -307,30 +819,104 @@ def main():
         except ConfigError as e:
             print(f"❌ Config validation failed:\n{e}")
 
+    elif args.command == "extract-grobid-batch" and (args.sample or args.sample_fraction):
+        from autoreviewx.core.grobid_extractor import extract_pdf_files_with_grobid
+        from autoreviewx.core.sampling import StratifiedSampler, sample_until, stratum_of
+        if not 0 < args.confidence < 1 or not 0 < (args.sample_fraction or 1) <= 1 or (args.sample or 1) < 1:
+            print("❌ --sample must be positive, --sample-fraction and --confidence between 0 and 1")
+            return
+        pdf_files = collect_pdf_files(args.dir, recursive=args.recursive, shard=args.shard, shard_by=args.shard_by,
+                                      preflight=args.preflight, preflight_limits=preflight_limits,
+                                      quarantine_report=quarantine_report)
+        sampler = StratifiedSampler(pdf_files, [stratum_of(path, args.dir, args.stratify) for path in pdf_files],
+                                    seed=args.seed)
+        size = args.sample or max(1, round(args.sample_fraction * sampler.size))
+        print(f"🎲 Sampling {min(size, sampler.size)} of {sampler.size} PDF(s) "
+              f"across {len(sampler.population)} stratum/strata ({args.stratify})")
+
+        def extract(paths):
+            return extract_pdf_files_with_grobid(paths, args.dir, vector_index=vector_index,
+                                                 citation_graph=citation_graph, fallback=args.local_fallback,
+                                                 nlp_batch=args.nlp_batch, nlp_batch_size=args.nlp_batch_size,
+                                                 n_process=args.nlp_processes, selection=selection, enricher=enricher,
+                                                 text_index=text_index)
+
+        results, strata, report, failures = sample_until(sampler, extract, size, target_width=args.target_width,
+                                                         confidence=args.confidence, seed=args.seed)
+        df = to_frame(results, schema=selection.schema)
+        df["stratum"] = pd.Series(strata, index=df.index, dtype="category")
+        suffix = f"{timestamp}{shard_suffix(args.shard)}"
+        output_path = f"data/extracted/metadata_grobid_sample_{suffix}{extension}"
+        write_table(df, output_path)
+        print(f"📄 Saved sample metadata to {output_path}")
+        if failures:
+            failures_path = f"data/extracted/sample_failures_{suffix}.csv"
+            pd.DataFrame(failures).to_csv(failures_path, index=False)
+            print(f"⚠️  {len(failures)} sampled PDF(s) failed (left out of the estimates), listed in {failures_path}")
+        if len(report):
+            estimates_path = f"data/extracted/estimates_{suffix}.csv"
+            report.to_csv(estimates_path, index=False)
+            print(report.to_string(index=False))
+            print(f"📊 Saved corpus estimates ({args.confidence:.0%} intervals) to {estimates_path}")
+
     elif args.command == "extract-grobid-batch":
 
-        results = extract_batch_metadata_with_grobid(args.dir)
+        results = extract_batch_metadata_with_grobid(args.dir, recursive=args.recursive,
+                                                     shard=args.shard, shard_by=args.shard_by,
+                                                     vector_index=vector_index, citation_graph=citation_graph,
+                                                     preflight=args.preflight, preflight_limits=preflight_limits,
+                                                     quarantine_report=quarantine_report,
+                                                     fallback=args.local_fallback, nlp_batch=args.nlp_batch,
+                                                     nlp_batch_size=args.nlp_batch_size,
+                                                     n_process=args.nlp_processes, selection=selection,
+                                                     enricher=enricher, text_index=text_index)
 
         print(f"\n✅ Batch metadata extracted for {len(results)} files.")
 
+        df = to_frame(results, schema=selection.schema)
+        if enricher is not None:
+            filled = sum(1 for row in results if row.get("enrichment_source"))
+            print(f"🔎 Enriched {filled} row(s) ({enricher.requests} request(s), {enricher.cache_hits} cached)")
+
         os.makedirs("data/extracted", exist_ok=True)
-        output_path = f"data/extracted/metadata_grobid_enriched_{timestamp}.csv"
+        output_path = f"data/extracted/metadata_grobid_enriched_{timestamp}{shard_suffix(args.shard)}{extension}"
+        write_table(df, output_path)
+        print(f"📄 Saved batch metadata to {output_path}")
 
-        df = pd.DataFrame(results, columns=columns)
-        df.to_csv(output_path, index=False)
+    elif args.command == "extract-local-batch":
+        from autoreviewx.core.grobid_extractor import extract_batch_metadata_locally
+        if args.workers < 1 or args.chunk_size < 1:
+            print("❌ --workers and --chunk-size must be at least 1")
+            return
+        results = extract_batch_metadata_locally(args.dir, recursive=args.recursive, shard=args.shard,
+                                                 shard_by=args.shard_by, preflight=args.preflight,
+                                                 preflight_limits=preflight_limits,
+                                                 quarantine_report=quarantine_report, workers=args.workers,
+                                                 chunk_size=args.chunk_size, nlp_batch_size=args.nlp_batch_size,
+                                                 selection=selection, enricher=enricher, text_index=text_index)
+        print(f"\n✅ Metadata extracted locally for {len(results)} files.")
+        if enricher is not None:
+            filled = sum(1 for row in results if row.get("enrichment_source"))
+            print(f"🔎 Enriched {filled} row(s) ({enricher.requests} request(s), {enricher.cache_hits} cached)")
+
+        output_path = f"data/extracted/metadata_local_{timestamp}{shard_suffix(args.shard)}{extension}"
+        write_table(to_frame(results, schema=selection.schema), output_path)
         print(f"📄 Saved batch metadata to {output_path}")
 
     elif args.command == "extract-grobid-batch-percent":
-        pdf_files = [f for f in os.listdir(args.dir) if f.lower().endswith(".pdf")]
+        pdf_files = collect_pdf_files(args.dir, shard=args.shard, shard_by=args.shard_by, preflight=args.preflight,
+                                      preflight_limits=preflight_limits, quarantine_report=quarantine_report)
         total_files = len(pdf_files)
         results = []
 
         print(f"\n📦 Found {total_files} PDF(s) in: {args.dir}")
 
-        for i, file in enumerate(tqdm(pdf_files, desc="🔄 Extracting", unit="pdf"), 1):
-            pdf_path = os.path.join(args.dir, file)
+        for i, pdf_path in enumerate(tqdm(pdf_files, desc="🔄 Extracting", unit="pdf"), 1):
+            file = os.path.basename(pdf_path)
             try:
-                data = extract_metadata_with_grobid(pdf_path)
+                data = extract_metadata_with_grobid(pdf_path, vector_index=vector_index, citation_graph=citation_graph,
+                                                    fallback=args.local_fallback, selection=selection,
+                                                    text_index=text_index)
                 results.append(data)
             except Exception as e:
                 print(f"\n❌ Failed to process {file}: {e}")
@@ -340,17 +926,30 @@ def main():
             print(f"✅ {i}/{total_files} processed ({percent:.1f}%) → {file}")
 
         os.makedirs("data/extracted", exist_ok=True)
-        output_path = f"data/extracted/metadata_grobid_enriched_{timestamp}.csv"
-
-        df = pd.DataFrame(results, columns=columns)
-        df.to_csv(output_path, index=False)
+        output_path = f"data/extracted/metadata_grobid_enriched_{timestamp}{shard_suffix(args.shard)}{extension}"
+        write_table(to_frame(results, schema=selection.schema), output_path)
         print(f"\n📄 Saved batch metadata to {output_path}")
 
+    elif args.command == "merge":
+        from autoreviewx.core.sharding import merge_results
+        output_path = args.output or f"data/extracted/merged_{timestamp}.csv"
+        try:
+            stats = merge_results(args.input, output_path, preferred_columns=export_columns())
+        except (ImportError, ValueError) as e:
+            print(f"❌ {e}")
+            return
+        print(f"✅ Merged {len(args.input)} file(s): {stats['rows']} rows, {stats['duplicates']} duplicate(s) dropped")
+        print(f"📄 Saved to {output_path}")
+
     elif args.command == "extract-intelligent":
         text = extract_text_from_pdf(args.pdf)
         lines = text.split("\n")
         title, title_source = extract_title_candidates(lines)
-        semantic = enrich_metadata(text)
+        clusterer = None
+        if args.cluster_model:
+            from autoreviewx.core.clustering import TopicClusterer
+            clusterer = TopicClusterer.load(args.cluster_model)
+        semantic = enrich_metadata(text, clusterer=clusterer)
 
         metadata = {
             "title": title,
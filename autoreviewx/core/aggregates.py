@@ -0,0 +1,107 @@
+# autoreviewx/core/aggregates.py
+import numpy as np
+import pandas as pd
+
+from autoreviewx.core.schema import read_table, table_columns
+
+# Facets offered as filters; multi-valued ones hold "; "-joined lists (as written by the extractors)
+FACETS = ["year", "methodology", "countries"]
+MULTI_VALUED = {"countries"}
+MISSING = "unknown"
+DETAIL_COLUMNS = ["title", "authors", "year", "journal", "doi", "methodology", "countries", "source_file"]
+
+
+def framework_of(column: str) -> str:
+    """``casp_ethics_pass`` -> ``casp``."""
+    return column.split("_", 1)[0]
+
+
+class ReviewIndex:
+    """
+    Filter index over an extraction table, built once per file.
+
+    Only the facet, pass-flag and score columns are loaded. Single-valued facets
+    become integer codes, multi-valued ones a row list per value, and pass flags
+    boolean arrays. A filter is then a handful of vectorized mask operations and
+    every aggregate a ``bincount`` or masked mean, independent of the file format.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        df = df.reset_index(drop=True)
+        self.size = len(df)
+        self.values = {}        # facet -> list of values
+        self.codes = {}         # single-valued facet -> int32 code per row
+        self.members = {}       # multi-valued facet -> value -> row indices
+        for facet in FACETS:
+            if facet not in df.columns:
+                continue
+            column = df[facet].astype("string").str.strip().replace("", pd.NA)
+            if facet in MULTI_VALUED:
+                exploded = column.fillna(MISSING).str.split(";").explode().str.strip()
+                pairs = pd.DataFrame({"row": exploded.index, "value": exploded.to_numpy()})
+                pairs = pairs[pairs["value"] != ""].drop_duplicates()
+                codes, uniques = pd.factorize(pairs["value"])
+                order = np.lexsort((pairs["row"].to_numpy(), codes))
+                split = np.cumsum(np.bincount(codes, minlength=len(uniques)))[:-1]
+                rows = np.split(pairs["row"].to_numpy()[order].astype(np.int64), split)
+                self.members[facet] = dict(zip(uniques, rows))
+                self.values[facet] = sorted(uniques, key=lambda v: (-len(self.members[facet][v]), v))
+            else:
+                categorical = pd.Categorical(column.fillna(MISSING))
+                self.codes[facet] = categorical.codes.astype(np.int32)
+                self.values[facet] = list(categorical.categories)
+        self.passes = {c: df[c].fillna(False).to_numpy(dtype=bool) for c in df.columns if c.endswith("_pass")}
+        self.scores = {c: pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=np.float32)
+                       for c in df.columns if c.startswith("score_")}
+
+    @classmethod
+    def from_table(cls, path: str) -> "ReviewIndex":
+        columns = table_columns(path)
+        wanted = [c for c in columns if c in FACETS or c.endswith("_pass") or c.startswith("score_")]
+        return cls(read_table(path, columns=wanted))
+
+    def counts(self, facet: str, mask: np.ndarray = None) -> pd.Series:
+        """Papers per value of ``facet`` (within ``mask``)."""
+        if facet in self.codes:
+            codes = self.codes[facet] if mask is None else self.codes[facet][mask]
+            return pd.Series(np.bincount(codes, minlength=len(self.values[facet])), index=self.values[facet])
+        members = self.members.get(facet, {})
+        counts = {v: len(rows) if mask is None else int(mask[rows].sum()) for v, rows in members.items()}
+        return pd.Series(counts, dtype=int).reindex(self.values.get(facet, []))
+
+    def mask(self, filters: dict = None, required_passes: list = None) -> np.ndarray:
+        """
+        Rows matching every filter.
+
+        ``filters`` maps a facet to accepted values (OR within a facet, AND across
+        facets); every column of ``required_passes`` must be True.
+        """
+        mask = np.ones(self.size, dtype=bool)
+        for facet, accepted in (filters or {}).items():
+            if not accepted or facet not in self.values:
+                continue
+            if facet in self.codes:
+                wanted = [i for i, v in enumerate(self.values[facet]) if v in set(accepted)]
+                mask &= np.isin(self.codes[facet], wanted)
+            else:
+                selected = np.zeros(self.size, dtype=bool)
+                for value in accepted:
+                    selected[self.members[facet].get(value, [])] = True
+                mask &= selected
+        for column in required_passes or []:
+            mask &= self.passes[column]
+        return mask
+
+    def summary(self, mask: np.ndarray) -> dict:
+        """Aggregates of the selected rows: counts per facet, pass rates and mean scores."""
+        selected = int(mask.sum())
+        pass_rates = pd.Series({c: values[mask].mean() if selected else np.nan for c, values in self.passes.items()},
+                               dtype=float)
+        scores = pd.Series({c: np.nanmean(values[mask]) if selected and not np.isnan(values[mask]).all() else np.nan
+                            for c, values in self.scores.items()}, dtype=float)
+        return {
+            "papers": selected,
+            "facets": {facet: self.counts(facet, mask) for facet in self.values},
+            "pass_rates": pass_rates,
+            "scores": scores,
+        }
@@ -0,0 +1,97 @@
+# autoreviewx/core/budget.py
+import signal
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds per document and stage (see ``grobid_extractor.run_extraction``); None means unlimited
+DEFAULT_BUDGETS = {
+    "frameworks": 60.0,
+    "semantic": 10.0,
+    "samples": 5.0,
+    "pico": 5.0,
+    "goal": 5.0,
+}
+
+
+class StageTimeout(Exception):
+    """Raised inside a stage that went over its time budget."""
+    pass
+
+
+def can_interrupt() -> bool:
+    """Budgets are enforced with SIGALRM, which only the main thread receives (POSIX)."""
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+
+@contextmanager
+def time_limit(seconds: float):
+    """
+    Raise ``StageTimeout`` in the block after ``seconds`` of wall-clock time.
+
+    Python's regex engine checks for signals while matching, so runaway
+    backtracking is interrupted too. Outside the main thread (or without
+    SIGALRM) the block runs unbounded; callers record the overrun afterwards.
+    """
+    if not seconds or seconds <= 0 or not can_interrupt():
+        yield
+        return
+
+    def expire(signum, frame):
+        raise StageTimeout(f"over the {seconds:g}s budget")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class StageBudget:
+    """
+    Per-document stage runner: each named stage gets its own wall-clock budget.
+
+    A stage that goes over is cancelled (when ``time_limit`` can interrupt it)
+    and its ``default`` used instead; either way it is listed in ``exceeded``
+    so that the row can record it.
+    """
+
+    def __init__(self, budgets: dict = None):
+        self.budgets = dict(DEFAULT_BUDGETS if budgets is None else budgets)
+        self.exceeded = []
+        self.timings = {}
+
+    def run(self, stage: str, func, *args, default=None, **kwargs):
+        limit = self.budgets.get(stage)
+        start = time.perf_counter()
+        try:
+            with time_limit(limit):
+                result = func(*args, **kwargs)
+        except StageTimeout:
+            self.exceeded.append(stage)
+            result = default() if callable(default) else default
+        else:
+            if limit and time.perf_counter() - start > limit:
+                self.exceeded.append(stage)  # could not be interrupted: keep the result, record the overrun
+        self.timings[stage] = time.perf_counter() - start
+        return result
+
+    @property
+    def summary(self) -> str:
+        """``"; "``-joined stages that went over budget (the ``stage_timeouts`` column)."""
+        return "; ".join(self.exceeded)
+
+
+_default_budgets = None
+
+
+def get_default_budgets() -> dict:
+    """Budgets set by the CLI (``--stage-budget``), else ``DEFAULT_BUDGETS``."""
+    return DEFAULT_BUDGETS if _default_budgets is None else _default_budgets
+
+
+def set_default_budgets(budgets: dict):
+    global _default_budgets
+    _default_budgets = budgets
@@ -0,0 +1,168 @@
+# autoreviewx/core/citations.py
+import csv
+import hashlib
+import os
+import re
+import threading
+
+import numpy as np
+
+DEFAULT_GRAPH_DIR = "data/citations"
+NODES_FILE = "nodes.csv"
+EDGES_FILE = "edges.i32"
+CORPUS_FILE = "corpus.txt"
+NODE_COLUMNS = ["id", "key", "doi", "title", "year"]
+
+
+def normalize_doi(doi: str) -> str:
+    doi = (doi or "").strip().lower()
+    return re.sub(r"^(https?://(dx\.)?doi\.org/|doi:\s*)", "", doi)
+
+
+def normalize_title(title: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", (title or "").lower()).strip()
+
+
+def reference_key(doi: str = "", title: str = "") -> str:
+    """Corpus-wide identity of a work: its DOI, else a hash of its normalized title."""
+    doi = normalize_doi(doi)
+    if doi:
+        return f"doi:{doi}"
+    title = normalize_title(title)
+    if len(title.split()) >= 3 and title != "unknown title":
+        return "title:" + hashlib.sha1(title.encode("utf-8")).hexdigest()[:16]
+    return ""
+
+
+def parse_references(soup) -> list:
+    """References from the TEI ``<listBibl>`` (GROBID ``biblStruct`` entries)."""
+    references = []
+    for list_bibl in soup.find_all("listBibl"):
+        for bibl in list_bibl.find_all("biblStruct", recursive=False):
+            title_tag = None
+            analytic = bibl.find("analytic")
+            if analytic:
+                title_tag = analytic.find("title")
+            if title_tag is None:
+                monogr = bibl.find("monogr")
+                title_tag = monogr.find("title") if monogr else None
+            doi_tag = bibl.find("idno", {"type": "DOI"})
+            date_tag = bibl.find("date")
+            year = ""
+            if date_tag:
+                match = re.search(r"\b(1[89]\d\d|20\d\d)\b", date_tag.get("when", "") or date_tag.text or "")
+                year = match.group(1) if match else ""
+            title = title_tag.text.strip() if title_tag else ""
+            doi = doi_tag.text.strip() if doi_tag else ""
+            key = reference_key(doi, title)
+            if key:
+                references.append({"key": key, "doi": normalize_doi(doi), "title": title, "year": year})
+    return references
+
+
+class CitationGraph:
+    """
+    Corpus citation graph written incrementally to disk.
+
+    ``nodes.csv`` lists every distinct work (corpus papers and references),
+    ``edges.i32`` holds (citing, cited) node-id pairs as raw int32 and
+    ``corpus.txt`` the ids of the papers that were actually extracted. Only the
+    key -> id map is kept in memory; TEI documents are never retained.
+    """
+
+    def __init__(self, path: str = DEFAULT_GRAPH_DIR):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        self._ids = {}
+        nodes_path = os.path.join(path, NODES_FILE)
+        if os.path.exists(nodes_path):
+            with open(nodes_path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    self._ids[row["key"]] = int(row["id"])
+        else:
+            with open(nodes_path, "w", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerow(NODE_COLUMNS)
+        self._corpus = set()
+        corpus_path = os.path.join(path, CORPUS_FILE)
+        if os.path.exists(corpus_path):
+            with open(corpus_path, encoding="utf-8") as f:
+                self._corpus = {int(line) for line in f if line.strip()}
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _node(self, key: str, doi: str, title: str, year: str, writer) -> int:
+        node_id = self._ids.get(key)
+        if node_id is None:
+            node_id = len(self._ids)
+            self._ids[key] = node_id
+            writer.writerow([node_id, key, doi, title, year])
+        return node_id
+
+    def add_document(self, doi: str, title: str, year: str, references: list) -> int:
+        """Record an extracted paper and its references; returns the number of new edges."""
+        key = reference_key(doi, title)
+        if not key:
+            return 0
+        with self._lock, \
+                open(os.path.join(self.path, NODES_FILE), "a", newline="", encoding="utf-8") as nodes_file:
+            writer = csv.writer(nodes_file)
+            source = self._node(key, normalize_doi(doi), title, year, writer)
+            if source in self._corpus:
+                return 0  # already recorded (rerun)
+            targets = []
+            for ref in references:
+                target = self._node(ref["key"], ref["doi"], ref["title"], ref["year"], writer)
+                if target != source and target not in targets:
+                    targets.append(target)
+            if targets:
+                edges = np.empty((len(targets), 2), dtype=np.int32)
+                edges[:, 0] = source
+                edges[:, 1] = targets
+                with open(os.path.join(self.path, EDGES_FILE), "ab") as f:
+                    f.write(edges.tobytes())
+            with open(os.path.join(self.path, CORPUS_FILE), "a", encoding="utf-8") as f:
+                f.write(f"{source}\n")
+            self._corpus.add(source)
+        return len(targets)
+
+    def edges(self) -> np.ndarray:
+        path = os.path.join(self.path, EDGES_FILE)
+        if not os.path.exists(path):
+            return np.zeros((0, 2), dtype=np.int32)
+        return np.fromfile(path, dtype=np.int32).reshape(-1, 2)
+
+    def to_csr(self):
+        """Sparse (n_nodes x n_nodes) adjacency matrix, row = citing work."""
+        from scipy.sparse import csr_matrix
+        edges = self.edges()
+        n = len(self._ids)
+        return csr_matrix((np.ones(len(edges), dtype=np.int32), (edges[:, 0], edges[:, 1])), shape=(n, n))
+
+    def nodes(self) -> list:
+        with open(os.path.join(self.path, NODES_FILE), newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+
+    def citation_counts(self) -> np.ndarray:
+        """In-corpus citation count of every node (citing papers are always corpus papers)."""
+        return np.bincount(self.edges()[:, 1], minlength=len(self._ids))
+
+    def ranked(self, in_corpus: bool, top: int = 20) -> list:
+        """
+        Most-cited nodes with their counts.
+
+        ``in_corpus=True`` ranks extracted papers; ``False`` gives backward
+        snowballing candidates: works cited by the corpus but not yet in it.
+        """
+        counts = self.citation_counts()
+        mask = np.zeros(len(counts), dtype=bool)
+        if self._corpus:
+            mask[list(self._corpus)] = True
+        if not in_corpus:
+            mask = ~mask
+        candidates = np.flatnonzero(mask & (counts > 0))
+        order = candidates[np.argsort(-counts[candidates], kind="stable")][:top]
+        wanted = set(order.tolist())
+        rows = {int(r["id"]): r for r in self.nodes() if int(r["id"]) in wanted}
+        return [{**rows[i], "citations": int(counts[i])} for i in order]
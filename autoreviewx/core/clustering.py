@@ -0,0 +1,125 @@
+# autoreviewx/core/clustering.py
+import os
+from collections import Counter
+
+import joblib
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from sklearn.utils import murmurhash3_32
+
+DEFAULT_MODEL_PATH = "data/clusters/topic_model.joblib"
+# "body" is not an extraction column: `cluster --text-index` adds it from the full-text index
+TEXT_COLUMNS = ["title", "abstract", "keywords", "body"]
+
+
+def document_text(record: dict) -> str:
+    """Text used for clustering: title, abstract, keywords and body text when available."""
+    parts = []
+    for column in TEXT_COLUMNS:
+        value = record.get(column)
+        if isinstance(value, str) and value.strip():
+            parts.append(value)
+    return " ".join(parts)
+
+
+class TopicClusterer:
+    """
+    Incremental topic clustering over hashed TF-IDF features.
+
+    Memory is bounded by ``n_features`` and ``n_clusters``, not by the corpus:
+    the hashing vectorizer keeps no vocabulary, document frequencies are a
+    fixed-size array updated batch by batch, and MiniBatchKMeans learns with
+    ``partial_fit``. New papers can therefore be added without refitting.
+    """
+
+    def __init__(self, n_clusters: int = 8, n_features: int = 2 ** 18, top_terms: int = 500,
+                 random_state: int = 0):
+        self.n_clusters = n_clusters
+        self.n_features = n_features
+        self.top_terms = top_terms
+        self.vectorizer = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None,
+                                            stop_words="english", ngram_range=(1, 2),
+                                            token_pattern=r"(?u)\b[a-zA-Z][a-zA-Z\-]+\b")
+        self.kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state, n_init=3)
+        self.doc_freq = np.zeros(n_features, dtype=np.float64)
+        self.n_docs = 0
+        self.term_counts = [Counter() for _ in range(n_clusters)]
+        self._buffer = []  # texts seen before there are enough samples to initialize k-means
+
+    @property
+    def fitted(self) -> bool:
+        return hasattr(self.kmeans, "cluster_centers_")
+
+    def _idf(self) -> np.ndarray:
+        return np.log((1 + self.n_docs) / (1 + self.doc_freq)) + 1
+
+    def _features(self, texts: list):
+        counts = self.vectorizer.transform(texts)
+        counts.data = 1 + np.log(counts.data)  # sublinear tf
+        return normalize(counts.multiply(self._idf()).tocsr())
+
+    def partial_fit(self, texts: list):
+        """Update document frequencies, centroids and cluster terms with a batch of texts."""
+        texts = [t for t in texts if t and t.strip()]
+        if not texts:
+            return self
+        counts = self.vectorizer.transform(texts)
+        self.doc_freq += np.bincount(counts.indices, minlength=self.n_features)
+        self.n_docs += len(texts)
+
+        if not self.fitted:
+            self._buffer.extend(texts)
+            if len(self._buffer) < self.n_clusters:
+                return self
+            texts, self._buffer = self._buffer, []
+
+        features = self._features(texts)
+        self.kmeans.partial_fit(features)
+        self._update_terms(texts, self.kmeans.predict(features))
+        return self
+
+    def _term_index(self, term: str) -> int:
+        # Same bucket as HashingVectorizer (signed murmurhash3, absolute value)
+        return abs(murmurhash3_32(term, seed=0)) % self.n_features
+
+    def _update_terms(self, texts: list, labels: np.ndarray):
+        analyzer = self.vectorizer.build_analyzer()
+        for text, label in zip(texts, labels):
+            self.term_counts[label].update(set(analyzer(text)))
+        # Keep the per-cluster counters bounded
+        for i, counter in enumerate(self.term_counts):
+            if len(counter) > 4 * self.top_terms:
+                self.term_counts[i] = Counter(dict(counter.most_common(self.top_terms)))
+
+    def predict(self, texts: list) -> np.ndarray:
+        if not self.fitted:
+            raise ValueError("Clusterer is not fitted yet: call partial_fit first")
+        return self.kmeans.predict(self._features([t or "" for t in texts]))
+
+    def cluster_labels(self, n_terms: int = 3) -> list:
+        """Readable label per cluster: its most distinctive terms (cluster frequency x IDF)."""
+        idf = self._idf()
+        labels = []
+        for counter in self.term_counts:
+            scored = [(count * idf[self._term_index(term)], term)
+                      for term, count in counter.most_common(self.top_terms)]
+            terms = [term for _, term in sorted(scored, reverse=True)]
+            # Drop unigrams already covered by a selected bigram
+            chosen = []
+            for term in terms:
+                if not any(term in c.split() or c in term.split() for c in chosen):
+                    chosen.append(term)
+                if len(chosen) == n_terms:
+                    break
+            labels.append("; ".join(chosen) or "unlabelled")
+        return labels
+
+    def save(self, path: str = DEFAULT_MODEL_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path: str = DEFAULT_MODEL_PATH) -> "TopicClusterer":
+        return joblib.load(path)
@@ -0,0 +1,172 @@
+# autoreviewx/core/doc_cache.py
+import hashlib
+import json
+import os
+import threading
+import zipfile
+
+import numpy as np
+import spacy
+from spacy.attrs import ORTH
+from spacy.pipeline import Sentencizer
+
+from autoreviewx.core.nlp import DEFAULT_MODEL, document_vectors, get_nlp, tokenize_indexed
+
+DEFAULT_CACHE_DIR = "data/cache/nlp"
+# Bump when the stored artefacts change shape or meaning
+CACHE_FORMAT = 2
+
+
+class DocCache:
+    """
+    On-disk cache of the expensive per-document NLP artefacts.
+
+    For each text it stores the document vector, computed from the tokenizer
+    alone like ``document_vectors``. With ``sentences`` it also stores the
+    sentence boundaries of the rule-based sentencizer (as character offsets)
+    and one vector per sentence. The key hashes the full text, the spaCy and
+    model versions and the analysis settings, but not the framework targets,
+    keyword lists or thresholds: changing those reruns only the vector math on
+    top of the cached arrays.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_DIR, model: str = DEFAULT_MODEL, sentences: bool = False):
+        self.path = path
+        self.model = model
+        self.sentences = sentences
+        self._nlp = None
+        self._settings_key = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            self._nlp = get_nlp(self.model)
+        return self._nlp
+
+    @property
+    def settings(self) -> dict:
+        """Everything besides the text that changes the artefacts."""
+        nlp = self.nlp
+        return {
+            "format": CACHE_FORMAT,
+            "spacy": spacy.__version__,
+            "model": f"{nlp.meta.get('lang', '')}_{nlp.meta.get('name', self.model)}",
+            "model_version": nlp.meta.get("version", ""),
+            "vectors": list(nlp.vocab.vectors.shape),
+            "vectors_dtype": str(nlp.vocab.vectors.data.dtype),
+            "sentences": "sentencizer" if self.sentences else None,
+        }
+
+    def key(self, text: str) -> str:
+        if self._settings_key is None:
+            self._settings_key = json.dumps(self.settings, sort_keys=True).encode("utf-8")
+        h = hashlib.sha256(self._settings_key)
+        h.update(b"\0")
+        h.update(text.encode("utf-8", "surrogatepass"))
+        return h.hexdigest()
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], f"{key}.npz")
+
+    def get(self, text: str):
+        """Cached artefacts of ``text``, or None."""
+        path = self._file(self.key(text))
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                return {name: data[name] for name in data.files}
+        except (OSError, ValueError, EOFError, zipfile.BadZipFile):
+            return None  # damaged entry: recompute
+
+    def _put(self, text: str, analysis: dict):
+        path = self._file(self.key(text))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, **analysis)
+        os.replace(tmp, path)
+
+    def _analyze_doc(self, doc) -> dict:
+        table = self.nlp.vocab.vectors
+        width = table.shape[1]
+        rows = table.find(keys=doc.to_array([ORTH]).ravel()) if len(doc) and width else np.zeros(0, dtype=int)
+        token_vectors = np.zeros((len(doc), width), dtype=np.float32)
+        known = rows >= 0
+        token_vectors[known] = np.asarray(table.data)[rows[known]]
+        analysis = {"vector": token_vectors.mean(axis=0) if len(doc) else np.zeros(width, dtype=np.float32)}
+        if self.sentences:
+            if len(doc):
+                doc = Sentencizer()(doc)
+            spans = list(doc.sents) if len(doc) else []
+            starts = np.array([s.start for s in spans], dtype=np.int64)
+            counts = np.array([len(s) for s in spans], dtype=np.float32)
+            bounds = [[s.start_char, s.end_char] for s in spans]
+            analysis["sentences"] = np.array(bounds, dtype=np.int32).reshape(-1, 2)
+            analysis["sentence_vectors"] = (np.add.reduceat(token_vectors, starts, axis=0) / counts[:, None]
+                                            if len(spans) else np.zeros((0, width), dtype=np.float32))
+        return analysis
+
+    def analyze_many(self, texts: list, batch_size: int = 16, n_process: int = 1) -> list:
+        """
+        Artefacts for every text: cached ones are loaded, the others computed and stored.
+
+        Missing texts are tokenized in one pass (``tokenize_indexed``), over
+        ``n_process`` worker processes when greater than 1.
+        """
+        results = [self.get(text) for text in texts]
+        missing = [i for i, r in enumerate(results) if r is None]
+        with self._lock:
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+        if missing:
+            docs = tokenize_indexed(self.nlp, [texts[i] for i in missing], batch_size=batch_size,
+                                    n_process=n_process)
+            for j, doc in docs:
+                i = missing[j]
+                results[i] = self._analyze_doc(doc)
+                self._put(texts[i], results[i])
+        return results
+
+    def analyze(self, text: str) -> dict:
+        return self.analyze_many([text])[0]
+
+
+def cosine(a: np.ndarray, b: np.ndarray) -> float:
+    """``Doc.similarity`` on stored vectors (0.0 when either is empty)."""
+    norm = np.linalg.norm(a) * np.linalg.norm(b)
+    return float(np.dot(a, b) / norm) if norm else 0.0
+
+
+_default_cache = None
+
+
+def get_default_cache():
+    """Process-wide cache set by the CLI (``--nlp-cache``); None when caching is off."""
+    return _default_cache
+
+
+def set_default_cache(cache: DocCache):
+    global _default_cache
+    _default_cache = cache
+
+
+def text_vector(text: str, model: str = DEFAULT_MODEL) -> np.ndarray:
+    """Document vector of ``text``, from the default cache when one is set."""
+    cache = get_default_cache()
+    if cache is not None and cache.model == model:
+        return cache.analyze(text)["vector"]
+    return document_vectors([text], model=model)[0]
+
+
+def text_vectors(texts: list, model: str = DEFAULT_MODEL, batch_size: int = 16, n_process: int = 1) -> np.ndarray:
+    """Document vectors of many texts in one batched spaCy pass, through the default cache when one is set."""
+    cache = get_default_cache()
+    if cache is not None and cache.model == model:
+        analyses = cache.analyze_many(texts, batch_size=batch_size, n_process=n_process)
+        width = cache.nlp.vocab.vectors.shape[1]
+        return np.array([a["vector"] for a in analyses], dtype=np.float32).reshape(len(texts), width)
+    return document_vectors(texts, model=model, batch_size=batch_size, n_process=n_process)
@@ -1,16 +1,12 @@
 # enhanced_extraction.py (corrigé)
 
 import re
-import spacy
-from collections import Counter
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.feature_extraction.text import TfidfVectorizer
-import numpy as np
 
-# ✅ Load larger spaCy model for better similarity (has vectors)
-nlp = spacy.load("en_core_web_md")  # Assure-toi que ce modèle est installé
+from autoreviewx.core.budget import StageBudget, get_default_budgets
+from autoreviewx.core.doc_cache import cosine, text_vector
+from autoreviewx.core.nlp import document_vectors, get_nlp
 
-# Clusters manuels
+# Clusters manuels (repli quand aucun modèle `autoreviewx cluster` n'est fourni)
 CLUSTERS = {
     "multimodal_sensing": ["eye tracking", "EEG", "biosignal", "sensor"],
     "LLMs": ["gpt", "bert", "transformer", "llm", "language model"],
@@ -18,12 +14,13 @@ CLUSTERS = {
 }
 
 
-def find_keywords_scored(text, keywords):
-    doc = nlp(text)
+def find_keywords_scored(text, keywords, doc_vector=None):
+    # Same cosine as doc.similarity, on the (cached) document vector
+    if doc_vector is None:
+        doc_vector = text_vector(text)
     results = []
-    for kw in keywords:
-        kw_vec = nlp(kw)
-        sim = doc.similarity(kw_vec)
+    for kw, kw_vec in zip(keywords, document_vectors(keywords)):
+        sim = cosine(doc_vector, kw_vec)
         if sim > 0.75:
             results.append(kw)
     return {k: 1.0 for k in results}
@@ -36,13 +33,19 @@ def assign_cluster_from_keywords(keywords):
     return "; ".join(sorted(assigned)) or "unclustered"
 
 
+# Goal statements sit in the abstract or introduction: only this many leading characters are searched
+GOAL_WINDOW = 20000
+
+
 def detect_goal(text):
+    # Within one sentence and with bounded gaps: no unbounded .*? backtracking on long OCR lines
     patterns = [
-        r"(this|the) (paper|study|work).*?(aims|seeks|attempts) to ([^.\\n]+)",
-        r"we (propose|present|develop) ([^.\\n]+)",
-        r"our (goal|objective).*?is to ([^.\\n]+)",
-        r"the purpose of this (paper|study).*?is to ([^.\\n]+)"
+        r"\b(this|the) (paper|study|work)\b[^.\n]{0,200}?\b(aims|seeks|attempts) to ([^.\n]{1,300})",
+        r"\bwe (propose|present|develop) ([^.\n]{1,300})",
+        r"\bour (goal|objective)\b[^.\n]{0,200}?\bis to ([^.\n]{1,300})",
+        r"\bthe purpose of this (paper|study)\b[^.\n]{0,200}?\bis to ([^.\n]{1,300})"
     ]
+    text = text[:GOAL_WINDOW]
     for pattern in patterns:
         match = re.search(pattern, text, re.IGNORECASE)
         if match:
@@ -50,14 +53,17 @@ def detect_goal(text):
     return "not detected"
 
 
-def detect_field(text):
+def detect_field(text, doc_vector=None):
     fields = ["education", "health", "engineering", "linguistics", "psychology", "robotics"]
-    doc = nlp(text.lower())
-    field_scores = [(f, doc.similarity(nlp(f))) for f in fields]
+    if doc_vector is None:
+        doc_vector = text_vector(text.lower())
+    field_scores = [(f, cosine(doc_vector, v)) for f, v in zip(fields, document_vectors(fields))]
     return max(field_scores, key=lambda x: x[1])[0] if field_scores else "unknown"
 
 
 def extract_title_candidates(lines):
+    # ✅ Modèle spaCy partagé avec les frameworks, chargé au premier appel (après --shared-vectors)
+    nlp = get_nlp()
     joined = [l.strip() for l in lines[:150] if len(l.strip().split()) >= 5]
     for i, line in enumerate(joined):
         if any(x in line.lower() for x in ["abstract", "introduction", "citations", "conference paper"]):
@@ -67,7 +73,7 @@ def extract_title_candidates(lines):
             return line.strip(), "fallback_body"
     return "UNKNOWN TITLE", "unknown"
 
-def enrich_metadata(text):
+def enrich_metadata(text, clusterer=None):
     lower_text = text.lower()
 
     biological_terms = ["genome", "dna", "rna", "biomarker", "proteomics"]
@@ -75,15 +81,21 @@ def enrich_metadata(text):
     model_terms = ["gpt", "bert", "transformer", "cnn", "lstm"]
     tool_terms = ["tensorflow", "pytorch", "moodle", "opencv", "excel"]
 
-    bio_scores = find_keywords_scored(lower_text, biological_terms)
-    physio_scores = find_keywords_scored(lower_text, physio_terms)
-    model_scores = find_keywords_scored(lower_text, model_terms)
-    tool_scores = find_keywords_scored(lower_text, tool_terms)
+    # One (cached) vector for the whole text instead of a full spaCy pass per keyword list
+    doc_vector = text_vector(lower_text)
+    bio_scores = find_keywords_scored(lower_text, biological_terms, doc_vector)
+    physio_scores = find_keywords_scored(lower_text, physio_terms, doc_vector)
+    model_scores = find_keywords_scored(lower_text, model_terms, doc_vector)
+    tool_scores = find_keywords_scored(lower_text, tool_terms, doc_vector)
 
     all_keywords = list(bio_scores.keys() | physio_scores.keys() | model_scores.keys() | tool_scores.keys())
-    clusters = assign_cluster_from_keywords(all_keywords)
-    goal = detect_goal(text)
-    field = detect_field(text)
+    if clusterer is not None and clusterer.fitted:
+        clusters = clusterer.cluster_labels()[clusterer.predict([text])[0]]
+    else:
+        clusters = assign_cluster_from_keywords(all_keywords)
+    budget = StageBudget(get_default_budgets())
+    goal = budget.run("goal", detect_goal, text, default="not detected")
+    field = detect_field(text, doc_vector)
 
     return {
         "biological_keywords": "; ".join(bio_scores.keys()),
@@ -93,4 +105,5 @@ def enrich_metadata(text):
         "clusters": clusters,
         "research_goal": goal,
         "field": field,
+        **({"stage_timeouts": budget.summary} if budget.exceeded else {}),
     }
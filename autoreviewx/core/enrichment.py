@@ -0,0 +1,307 @@
+# autoreviewx/core/enrichment.py
+import asyncio
+import difflib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+import requests
+
+from autoreviewx.core.citations import normalize_doi, normalize_title
+
+OPENALEX_URL = "https://api.openalex.org"
+CROSSREF_URL = "https://api.crossref.org"
+SOURCES = ("openalex", "crossref")
+DEFAULT_ENRICHMENT_CACHE = "data/cache/enrichment.sqlite"
+
+# Requests per second: OpenAlex's documented limit and a polite share of Crossref's public pool
+DEFAULT_RATES = {"openalex": 10.0, "crossref": 5.0}
+# DOIs ORed into one query (OpenAlex accepts at most 50 values per filter)
+DOI_BATCH = {"openalex": 50, "crossref": 20}
+ENRICHED_FIELDS = ("doi", "year", "journal")
+# Minimum similarity of normalized titles to accept a title-search hit
+TITLE_MATCH = 0.9
+TITLE_CANDIDATES = 5
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` requests per second with bursts of up to ``burst``."""
+
+    def __init__(self, rate: float, burst: float = None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = None
+
+    async def acquire(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()  # bound to the running loop
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class EnrichmentCache:
+    """
+    Persistent (source, key) -> work cache in SQLite.
+
+    Keys are ``doi:<doi>`` or ``title:<normalized title>``. Works that a source
+    does not know are stored as ``NULL`` so reruns skip them too; only failed
+    requests are retried. Access is serialized, so the extraction stage
+    threads can share one cache.
+    """
+
+    def __init__(self, path: str = DEFAULT_ENRICHMENT_CACHE):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS works (source TEXT NOT NULL, key TEXT NOT NULL, "
+                           "work TEXT, fetched_at REAL NOT NULL, PRIMARY KEY (source, key))")
+        self._conn.commit()
+
+    def get_many(self, source: str, keys: list) -> dict:
+        """key -> work (None when the source has no match) for the cached ``keys``."""
+        found = {}
+        keys = list(keys)
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, work FROM works WHERE source = ? AND key IN ({','.join('?' * len(chunk))})",
+                    [source, *chunk]).fetchall()
+                for key, work in rows:
+                    found[key] = json.loads(work) if work is not None else None
+        return found
+
+    def put_many(self, source: str, works: dict):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO works (source, key, work, fetched_at) VALUES (?, ?, ?, ?)",
+                [(source, key, json.dumps(work) if work is not None else None, now) for key, work in works.items()])
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM works").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+
+def lookup_key(doi: str = "", title: str = "") -> str:
+    """``doi:<doi>``, else ``title:<normalized title>`` (at least three words), else ""."""
+    doi = normalize_doi(doi)
+    if doi:
+        return f"doi:{doi}"
+    title = normalize_title(title)
+    if len(title.split()) >= 3 and title != "unknown title":
+        return f"title:{title}"
+    return ""
+
+
+def _openalex_work(item: dict) -> dict:
+    source = ((item.get("primary_location") or {}).get("source") or {})
+    return {
+        "doi": normalize_doi(item.get("doi")),
+        "title": item.get("title") or item.get("display_name") or "",
+        "year": str(item["publication_year"]) if item.get("publication_year") else "",
+        "journal": source.get("display_name") or "",
+    }
+
+
+def _crossref_work(item: dict) -> dict:
+    parts = ((item.get("issued") or item.get("published") or {}).get("date-parts") or [[None]])[0]
+    return {
+        "doi": normalize_doi(item.get("DOI")),
+        "title": (item.get("title") or [""])[0],
+        "year": str(parts[0]) if parts and parts[0] else "",
+        "journal": (item.get("container-title") or [""])[0],
+    }
+
+
+def best_title_match(title: str, works: list):
+    """The candidate whose normalized title is closest to ``title``, if at least ``TITLE_MATCH`` similar."""
+    best, best_ratio = None, TITLE_MATCH
+    for work in works:
+        ratio = difflib.SequenceMatcher(None, title, normalize_title(work["title"])).ratio()
+        if ratio >= best_ratio:
+            best, best_ratio = work, ratio
+    return best
+
+
+class Enricher:
+    """
+    Bibliographic lookups against OpenAlex and Crossref, cached on disk.
+
+    DOIs are grouped into bulk filter queries (``DOI_BATCH`` per request);
+    papers without a DOI are searched by title and only accepted on a close
+    title match. Requests run concurrently under one token bucket per source;
+    a paper is only asked from the next source when the previous one had no
+    match. Everything answered is cached, so reruns make no requests.
+    """
+
+    def __init__(self, cache: EnrichmentCache = None, sources=SOURCES, rates: dict = None, mailto: str = None,
+                 concurrency: int = 4, timeout: float = 30, offline: bool = False, urls: dict = None):
+        unknown = set(sources) - set(SOURCES)
+        if unknown:
+            raise ValueError(f"Unknown enrichment source(s): {', '.join(sorted(unknown))} (use {', '.join(SOURCES)})")
+        self.cache = cache if cache is not None else EnrichmentCache()
+        self.sources = list(sources)
+        self.rates = {**DEFAULT_RATES, **(rates or {})}
+        self.mailto = mailto
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.offline = offline
+        self.urls = {"openalex": OPENALEX_URL, "crossref": CROSSREF_URL, **(urls or {})}
+        self._session = requests.Session()  # keep-alive across the concurrent lookups
+        # Stats
+        self.requests = 0
+        self.errors = 0
+        self.cache_hits = 0
+
+    def _get(self, source: str, path: str, params: dict) -> dict:
+        if self.mailto:
+            params = {**params, "mailto": self.mailto}  # polite pool of both APIs
+        response = self._session.get(f"{self.urls[source].rstrip('/')}{path}", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    async def _fetch(self, source: str, path: str, params: dict, bucket: TokenBucket, slots: asyncio.Semaphore):
+        """JSON answer, or None when the request failed (not cached: retried next run)."""
+        async with slots:
+            await bucket.acquire()
+            self.requests += 1
+            try:
+                return await asyncio.to_thread(self._get, source, path, params)
+            except (requests.RequestException, ValueError) as e:
+                self.errors += 1
+                print(f"⚠️ {source} lookup failed: {e}")
+                return None
+
+    async def _query_dois(self, source: str, dois: list, bucket, slots) -> dict:
+        if source == "openalex":
+            answer = await self._fetch(source, "/works", {"filter": "doi:" + "|".join(dois),
+                                                          "per-page": len(dois)}, bucket, slots)
+            items = [_openalex_work(item) for item in (answer or {}).get("results", [])]
+        else:
+            answer = await self._fetch(source, "/works", {"filter": ",".join(f"doi:{doi}" for doi in dois),
+                                                          "rows": len(dois)}, bucket, slots)
+            items = [_crossref_work(item) for item in ((answer or {}).get("message") or {}).get("items", [])]
+        if answer is None:
+            return {}
+        by_doi = {work["doi"]: work for work in items}
+        return {f"doi:{doi}": by_doi.get(doi) for doi in dois}
+
+    async def _query_title(self, source: str, title: str, bucket, slots) -> dict:
+        if source == "openalex":
+            answer = await self._fetch(source, "/works", {"filter": f"title.search:{title}",
+                                                          "per-page": TITLE_CANDIDATES}, bucket, slots)
+            items = [_openalex_work(item) for item in (answer or {}).get("results", [])]
+        else:
+            answer = await self._fetch(source, "/works", {"query.bibliographic": title,
+                                                          "rows": TITLE_CANDIDATES}, bucket, slots)
+            items = [_crossref_work(item) for item in ((answer or {}).get("message") or {}).get("items", [])]
+        if answer is None:
+            return {}
+        return {f"title:{title}": best_title_match(title, items)}
+
+    async def _lookup_source(self, source: str, keys: set) -> dict:
+        found = self.cache.get_many(source, keys)
+        self.cache_hits += len(found)
+        missing = sorted(keys - set(found))
+        if not missing or self.offline:
+            return found
+
+        bucket = TokenBucket(self.rates[source])
+        slots = asyncio.Semaphore(self.concurrency)
+        dois = [key[4:] for key in missing if key.startswith("doi:")]
+        size = DOI_BATCH[source]
+        tasks = [self._query_dois(source, dois[start:start + size], bucket, slots)
+                 for start in range(0, len(dois), size)]
+        tasks += [self._query_title(source, key[6:], bucket, slots) for key in missing if key.startswith("title:")]
+        for answered in await asyncio.gather(*tasks):
+            self.cache.put_many(source, answered)
+            found.update(answered)
+        return found
+
+    async def _lookup(self, keys: set) -> dict:
+        works = {}
+        for source in self.sources:
+            pending = {key for key in keys if key not in works}
+            if not pending:
+                break
+            for key, work in (await self._lookup_source(source, pending)).items():
+                if work is not None:
+                    works[key] = {**work, "source": source}
+        return works
+
+    def lookup(self, keys) -> dict:
+        """key -> work (``doi``, ``title``, ``year``, ``journal``, ``source``) for the keys some source knows."""
+        keys = {key for key in keys if key}
+        if not keys:
+            return {}
+        return asyncio.run(self._lookup(keys))
+
+
+def _blank(value) -> bool:
+    return value is None or value is pd.NA or (isinstance(value, float) and value != value) or not str(value).strip()
+
+
+def fill_gaps(records: list, enricher: Enricher) -> list:
+    """
+    Per record (dicts with ``title``, ``doi``, ``year``, ``journal``), the values found for its gaps.
+
+    Only records with a missing field are looked up, in one ``Enricher.lookup``;
+    present values are never replaced. A non-empty update also carries the
+    ``enrichment_source`` that filled it.
+    """
+    keys = []
+    for record in records:
+        values = {column: "" if _blank(record.get(column)) else str(record[column])
+                  for column in (*ENRICHED_FIELDS, "title")}
+        gap = any(not values[column] for column in ENRICHED_FIELDS)
+        keys.append(lookup_key(values["doi"], values["title"]) if gap else "")
+    works = enricher.lookup(keys)
+
+    updates = []
+    for record, key in zip(records, keys):
+        work = works.get(key)
+        update = {}
+        if work is not None:
+            update = {column: work[column] for column in ENRICHED_FIELDS if work[column] and _blank(record.get(column))}
+        if update:
+            update["enrichment_source"] = work["source"]
+        updates.append(update)
+    return updates
+
+
+def enrich_frame(df: pd.DataFrame, enricher: Enricher) -> pd.DataFrame:
+    """
+    Fill missing ``doi``, ``year`` and ``journal`` values of a table from OpenAlex/Crossref.
+
+    Extracted values are never overwritten; ``enrichment_source`` records which
+    source filled a row.
+    """
+    df = df.copy()
+    for column in (*ENRICHED_FIELDS, "title", "enrichment_source"):
+        if column not in df.columns:
+            df[column] = pd.NA
+        df[column] = df[column].astype("string")  # categories would reject new values
+
+    records = df[[*ENRICHED_FIELDS, "title"]].to_dict("records")
+    for index, update in zip(df.index, fill_gaps(records, enricher)):
+        for column, value in update.items():
+            df.at[index, column] = value
+    return df
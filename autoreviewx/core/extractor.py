@@ -1,36 +1,131 @@
 import fitz  # PyMuPDF
 import os
+import re
 
+from autoreviewx.core.nlp import get_nlp
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    """Extract all text from a PDF file."""
+# Small model: only its named entities are used (author fallback)
+NER_MODEL = "en_core_web_sm"
+
+
+def find_pdf_files(folder_path: str, recursive: bool = False) -> list:
+    """List PDF files in a folder (optionally with sub-folders), sorted by path."""
+    if not recursive:
+        return sorted(
+            os.path.join(folder_path, f) for f in os.listdir(folder_path)
+            if f.lower().endswith(".pdf") and os.path.isfile(os.path.join(folder_path, f))
+        )
+    found = []
+    for root, dirs, files in os.walk(folder_path):
+        dirs.sort()
+        found.extend(os.path.join(root, f) for f in files if f.lower().endswith(".pdf"))
+    return sorted(found)
+
+
+def extract_text_from_pdf(pdf_path: str, blocks: bool = False) -> str:
+    """
+    Extract all text from a PDF file.
+
+    With ``blocks``, text blocks (paragraphs, headings) are separated by a blank
+    line, so a heading stands alone (see ``split_text_sections``).
+    """
     if not os.path.exists(pdf_path):
         raise FileNotFoundError(f"File not found: {pdf_path}")
 
     text = ""
     doc = fitz.open(pdf_path)
     for page in doc:
-        text += page.get_text()
+        if blocks:
+            # (x0, y0, x1, y1, text, block_no, block_type): type 0 is text, 1 an image
+            text += "".join(block[4].strip() + "\n\n" for block in page.get_text("blocks") if block[6] == 0)
+        else:
+            text += page.get_text()
     doc.close()
     return text
 
 
-def extract_metadata_from_text(text: str) -> dict:
-    """Basic metadata extraction from full text."""
-    lines = [line.strip() for line in text.split("\n") if line.strip()]
+def extract_year_from_text(text: str) -> str:
+    match = re.search(r"(20[0-2][0-9])", text)
+    return match.group(1) if match else ""
 
-    metadata = {
-        "title": lines[0] if lines else "",
-        "authors": lines[1] if len(lines) > 1 else "",
-        "abstract": "",
-        "year": "",
-        "keywords": []
-    }
 
-    # Optional: crude extraction of abstract
+def extract_doi(text: str) -> str:
+    match = re.search(r'(10\.\d{4,9}/[-._;()/:A-Z0-9]+)', text, re.IGNORECASE)
+    return match.group(1) if match else ""
+
+
+def extract_authors(lines: list) -> str:
+    stopwords = ["license", "open access", "copyright", "rights", "university", "school", "learning", "department"]
+    best_candidate = ""
+    max_count = 0
+
+    for line in lines[:50]:  # Analyse les 50 premières lignes
+        lowered = line.lower()
+        if any(word in lowered for word in stopwords):
+            continue
+
+        # Extraire les "Prénom Nom" avec majuscules
+        names = re.findall(r"\b[A-Z][a-z]+ [A-Z][a-z]+(?:\b|,)", line)
+        if len(names) > max_count:
+            max_count = len(names)
+            best_candidate = line
+
+    # Nettoyage des noms
+    author_list = [a.strip(" ,;") for a in re.split(r"\||,| and ", best_candidate) if len(a.strip()) > 3]
+    return "; ".join(author_list)
+
+
+def extract_authors_with_ner(text: str) -> str:
+    # Prendre seulement le début du texte (généralement là où les auteurs apparaissent)
+    header_text = "\n".join(text.split("\n")[:100])
+
+    # Nettoyer les lignes inutiles (licence, éditeurs, etc.)
+    filtered_lines = []
+    stopwords = ["license", "journal", "publisher", "open access", "rights", "doi", "abstract", "©"]
+    for line in header_text.split("\n"):
+        if any(bad in line.lower() for bad in stopwords):
+            continue
+        filtered_lines.append(line.strip())
+
+    clean_text = " ".join(filtered_lines)
+
+    doc = get_nlp(NER_MODEL)(clean_text)
+    people = [ent.text for ent in doc.ents if ent.label_ == "PERSON"]
+    unique_people = list(set([p.strip() for p in people if len(p.strip()) > 5]))
+
+    return "; ".join(unique_people[:8])
+
+
+def extract_metadata_from_text(text: str, source_file: str = "") -> dict:
+    """Bibliographic metadata from the plain text of a PDF (no GROBID needed)."""
+    lines = [line.strip() for line in text.split("\n") if line.strip()]
+    title_candidates = sorted(lines[:10], key=len, reverse=True)
+    title = title_candidates[0] if title_candidates else ""
+
+    abstract = ""
     for i, line in enumerate(lines):
         if "abstract" in line.lower():
-            metadata["abstract"] = " ".join(lines[i + 1:i + 6])  # simple heuristic
+            abstract = " ".join(lines[i + 1:i + 6])
             break
 
-    return metadata
+    keywords = []
+    for line in lines:
+        lowered = line.lower()
+        if "keywords" in lowered or "index terms" in lowered:
+            keyword_line = re.split(r":|—", line, maxsplit=1)[-1]
+            keywords = [kw.strip().strip('.') for kw in keyword_line.split(",")]
+            break
+
+    # Heuristique d’auteurs
+    authors = extract_authors(lines)
+    if not authors or len(authors.split()) < 2:
+        authors = extract_authors_with_ner(text)
+    return {
+        "title": title,
+        "authors": authors,
+        "abstract": abstract,
+        "year": extract_year_from_text(text),
+        "keywords": "; ".join(keywords),
+        "doi": extract_doi(text),
+        "source_file": os.path.basename(source_file)
+    }
@@ -0,0 +1,329 @@
+# autoreviewx/core/frameworks.py
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+from autoreviewx.core.config import ConfigError
+from autoreviewx.core.nlp import DEFAULT_MODEL, document_vectors
+from autoreviewx.core.scoring import DEFAULT_THRESHOLD
+from autoreviewx.core.sections import SECTION_TYPES
+from autoreviewx.core.shared_vectors import shared_phrase_matrix
+
+DEFAULT_FRAMEWORKS_PATH = "frameworks.yaml"
+RULE_MODES = ("any", "count")
+# Abstract scores at least this far from the threshold are final (see ``FrameworkRegistry.escalated``)
+DEFAULT_CASCADE_MARGIN = 0.1
+
+# Frameworks registered from code (plugins), merged over the YAML definitions
+_PLUGINS = {}
+
+
+def validate_framework(name: str, definition: dict):
+    if not isinstance(definition, dict):
+        raise ConfigError(f"Framework '{name}' must be a mapping")
+    for section in ("semantic", "rules"):
+        entries = definition.get(section, {})
+        if not isinstance(entries, dict):
+            raise ConfigError(f"Framework '{name}': '{section}' must map dimensions to lists")
+        for dim, items in entries.items():
+            if not isinstance(items, list) or not items:
+                raise ConfigError(f"Framework '{name}': '{section}.{dim}' must be a non-empty list")
+    if not definition.get("semantic") and not definition.get("rules"):
+        raise ConfigError(f"Framework '{name}' defines neither 'semantic' nor 'rules'")
+    sections = definition.get("sections", {})
+    if not isinstance(sections, dict):
+        raise ConfigError(f"Framework '{name}': 'sections' must map dimensions to lists of section types")
+    known_dims = set(definition.get("semantic", {})) | set(definition.get("rules", {}))
+    for dim, types in sections.items():
+        if dim not in known_dims:
+            raise ConfigError(f"Framework '{name}': 'sections.{dim}' is not a semantic or rule dimension")
+        if not isinstance(types, list) or not types or set(types) - set(SECTION_TYPES):
+            raise ConfigError(f"Framework '{name}': 'sections.{dim}' must be a non-empty list of {SECTION_TYPES}")
+    if definition.get("rule_mode", "any") not in RULE_MODES:
+        raise ConfigError(f"Framework '{name}': rule_mode must be one of {RULE_MODES}")
+    for dim, patterns in definition.get("rules", {}).items():
+        for pattern in patterns:
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise ConfigError(f"Framework '{name}': invalid pattern for '{dim}': {pattern} ({e})")
+    return True
+
+
+def _resolve_path(path: str) -> Path:
+    candidate = Path(path)
+    if candidate.exists() or candidate.is_absolute():
+        return candidate
+    # Fall back to the project root (next to config.yaml) when run from elsewhere
+    return Path(__file__).resolve().parents[2] / path
+
+
+def load_frameworks(path: str = DEFAULT_FRAMEWORKS_PATH) -> dict:
+    """
+    Load and validate framework definitions from YAML.
+
+    Args:
+        path (str): Path to the frameworks YAML file.
+
+    Returns:
+        dict: Framework name -> definition.
+
+    Raises:
+        ConfigError: If the file is missing or a definition is invalid.
+    """
+    resolved = _resolve_path(path)
+    if not os.path.exists(resolved):
+        raise ConfigError(f"Frameworks file not found: {path}")
+
+    with open(resolved, "r", encoding="utf-8") as file:
+        try:
+            frameworks = yaml.safe_load(file) or {}
+        except yaml.YAMLError as e:
+            raise ConfigError(f"YAML parsing error: {e}")
+
+    for name, definition in frameworks.items():
+        validate_framework(name, definition)
+    return frameworks
+
+
+def register_framework(name: str, definition: dict):
+    """Register (or override) a framework from code; picked up by the next ``get_registry()``."""
+    validate_framework(name, definition)
+    _PLUGINS[name] = definition
+    get_registry.cache_clear()
+
+
+class FrameworkRegistry:
+    """
+    All quality frameworks compiled into shared structures.
+
+    Target phrases of every framework are stacked into one normalized matrix, so a
+    document is vectorized once and scored against every dimension with a single
+    matrix product. Rule patterns are deduplicated and combined into one scanner.
+
+    Dimensions listed under a framework's ``sections`` are scored only against
+    those sections of the paper when they are available: one vector and one
+    scan per distinct group of sections, not per dimension.
+    """
+
+    def __init__(self, frameworks: dict, model: str = DEFAULT_MODEL):
+        self.frameworks = frameworks
+        self.model = model
+        self._compile_rules()
+        self._compile_semantic_layout()
+        self._phrase_matrix = None
+        # dimension -> section types it is scored against (all text when absent)
+        self._dim_sections = {dim: tuple(t for t in SECTION_TYPES if t in types)
+                              for definition in frameworks.values()
+                              for dim, types in definition.get("sections", {}).items()}
+        self._subsets = {}
+
+    def select(self, names) -> "FrameworkRegistry":
+        """
+        Registry of only the ``names`` frameworks, compiled once and reused.
+
+        Its scanner and phrase matrix only hold those frameworks, so documents
+        are not scanned for the rules of frameworks nobody asked for.
+        """
+        key = tuple(name for name in self.frameworks if name in set(names))
+        unknown = set(names) - set(self.frameworks)
+        if unknown:
+            raise KeyError(f"Unknown framework(s): {', '.join(sorted(unknown))}")
+        if len(key) == len(self.frameworks):
+            return self
+        if key not in self._subsets:
+            self._subsets[key] = FrameworkRegistry({name: self.frameworks[name] for name in key}, model=self.model)
+        return self._subsets[key]
+
+    def _compile_rules(self):
+        self._rule_dims = []        # (framework, dimension)
+        pattern_index = {}          # pattern -> index in self._patterns
+        self._patterns = []
+        self._pattern_dims = []     # pattern index -> indices in self._rule_dims
+        for name, definition in self.frameworks.items():
+            for dim, patterns in definition.get("rules", {}).items():
+                dim_index = len(self._rule_dims)
+                self._rule_dims.append((name, dim))
+                for pattern in patterns:
+                    if pattern not in pattern_index:
+                        pattern_index[pattern] = len(self._patterns)
+                        self._patterns.append(re.compile(pattern, re.IGNORECASE))
+                        self._pattern_dims.append([])
+                    self._pattern_dims[pattern_index[pattern]].append(dim_index)
+
+        alternatives = "|".join(f"(?P<r{i}>{p.pattern})" for i, p in enumerate(self._patterns))
+        # Zero-width lookahead: every start position is tried, matches may overlap
+        self._scanner = re.compile(f"(?=(?:{alternatives}))", re.IGNORECASE) if self._patterns else None
+
+    def _compile_semantic_layout(self):
+        self._semantic_dims = []    # (framework, dimension, threshold)
+        self._phrases = []
+        starts = []
+        for name, definition in self.frameworks.items():
+            threshold = float(definition.get("threshold", DEFAULT_THRESHOLD))
+            for dim, targets in definition.get("semantic", {}).items():
+                starts.append(len(self._phrases))
+                self._phrases.extend(targets)
+                self._semantic_dims.append((name, dim, threshold))
+        self._starts = np.array(starts, dtype=np.intp)
+        self._thresholds = np.array([t for _, _, t in self._semantic_dims], dtype=np.float32)
+
+    @property
+    def phrase_matrix(self) -> np.ndarray:
+        """Row-normalized float32 matrix of all target phrases (built on first use)."""
+        if self._phrase_matrix is None:
+            self._phrase_matrix = shared_phrase_matrix(self._phrases, self.model, self._build_phrase_matrix)
+        return self._phrase_matrix
+
+    def _build_phrase_matrix(self) -> np.ndarray:
+        matrix = document_vectors(self._phrases, self.model)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+    def vectorize(self, text: str) -> np.ndarray:
+        return document_vectors([text], self.model)[0]
+
+    def similarities(self, vector: np.ndarray) -> np.ndarray:
+        """Best cosine similarity per semantic dimension (same value as ``doc.similarity``)."""
+        if not self._phrases:
+            return np.zeros(0, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return np.zeros(len(self._semantic_dims), dtype=np.float32)
+        sims = self.phrase_matrix @ (vector / norm).astype(np.float32)
+        return np.maximum(np.maximum.reduceat(sims, self._starts), 0.0)
+
+    def matched_patterns(self, text: str) -> set:
+        """Indices of the rule patterns found in ``text``, from a single scan."""
+        found = set()
+        if self._scanner is None:
+            return found
+        total = len(self._patterns)
+        for match in self._scanner.finditer(text):
+            first = int(match.lastgroup[1:])
+            found.add(first)
+            # Only the first alternative is reported at a position; check the later ones there
+            for j in range(first + 1, total):
+                if j not in found and self._patterns[j].match(text, match.start()):
+                    found.add(j)
+            if len(found) == total:
+                break
+        return found
+
+    def escalated(self, abstract_vector: np.ndarray, margin: float = DEFAULT_CASCADE_MARGIN) -> np.ndarray:
+        """
+        Mask of the semantic dimensions the abstract cannot decide.
+
+        A dimension whose abstract similarity is at least ``margin`` above or
+        below its threshold is a clear pass or fail; the others (and every
+        dimension of a paper without an abstract) go on to the full text.
+        """
+        if abstract_vector is None or not np.any(abstract_vector):
+            return np.ones(len(self._semantic_dims), dtype=bool)
+        return np.abs(self.similarities(abstract_vector) - self._thresholds) < margin
+
+    def needs_text(self, sections: dict, mask: np.ndarray = None) -> bool:
+        """Whether a semantic dimension (of ``mask``) is scored against the whole text in this paper."""
+        return any(self._scope(dim, sections) is None
+                   for i, (_, dim, _) in enumerate(self._semantic_dims) if mask is None or mask[i])
+
+    def _scope(self, dim: str, sections: dict):
+        """Sections ``dim`` is scored against in this paper, or None for the whole text."""
+        if not sections or dim not in self._dim_sections:
+            return None
+        found = tuple(t for t in self._dim_sections[dim] if sections.get(t, "").strip())
+        return found or None  # none of them detected: fall back to the whole text
+
+    def section_texts(self, sections: dict, mask: np.ndarray = None) -> dict:
+        """Text of every group of sections that semantic dimensions (of ``mask``) are scored against in this paper."""
+        scopes = {self._scope(dim, sections) for i, (_, dim, _) in enumerate(self._semantic_dims)
+                  if mask is None or mask[i]} - {None}
+        return {scope: " ".join(sections[t] for t in scope) for scope in sorted(scopes)}
+
+    def evaluate(self, text: str, frameworks: list = None, semantic: bool = True, rules: bool = True,
+                 vector: np.ndarray = None, sections: dict = None, section_vectors: dict = None,
+                 abstract_vector: np.ndarray = None, margin: float = DEFAULT_CASCADE_MARGIN) -> dict:
+        """
+        Evaluate a document against the selected frameworks in one pass.
+
+        Args:
+            text (str): Document text.
+            frameworks (list): Framework names to report (default: all).
+            semantic (bool): Report ``<dim>_score`` / ``<dim>_pass`` similarity columns.
+            rules (bool): Report rule-based ``<dim>`` columns.
+            vector (np.ndarray): Precomputed document vector, if already available.
+            sections (dict): Section type -> text (see ``sections.split_sections``),
+                used for dimensions with a ``sections`` scope.
+            section_vectors (dict): Precomputed vectors of ``section_texts(sections)``.
+            abstract_vector (np.ndarray): Abstract vector; when given, semantic dimensions
+                are scored on the abstract first and only those within ``margin`` of their
+                threshold are scored on the text or sections (``escalated``).
+            margin (float): Width of the uncertain band around thresholds.
+
+        Returns:
+            dict: Column name -> value; ``<dim>_tier`` tells whether the abstract
+            or the full text produced a similarity score.
+        """
+        selected = set(frameworks) if frameworks else set(self.frameworks)
+        unknown = selected - set(self.frameworks)
+        if unknown:
+            raise KeyError(f"Unknown framework(s): {', '.join(sorted(unknown))}")
+        results = {}
+
+        def scoped_text(scope):
+            return text if scope is None else " ".join(sections[t] for t in scope)
+
+        if semantic and any(name in selected for name, _, _ in self._semantic_dims):
+            escalated = np.ones(len(self._semantic_dims), dtype=bool)
+            if abstract_vector is not None:
+                escalated = self.escalated(abstract_vector, margin)
+            for i, (name, _, _) in enumerate(self._semantic_dims):
+                escalated[i] &= name in selected
+            scopes = [self._scope(dim, sections) for _, dim, _ in self._semantic_dims]
+            groups = sorted({scope for scope, todo in zip(scopes, escalated) if todo and scope is not None})
+            best = {"abstract": self.similarities(abstract_vector)} if abstract_vector is not None else {}
+            if any(todo and scope is None for scope, todo in zip(scopes, escalated)):
+                best[None] = self.similarities(self.vectorize(text) if vector is None else vector)
+            vectors = dict(section_vectors or {})
+            todo = [g for g in groups if g not in vectors]
+            if todo:
+                # One batch for every group of sections in use
+                vectors.update(zip(todo, document_vectors([scoped_text(g) for g in todo], self.model)))
+            best.update({g: self.similarities(vectors[g]) for g in groups})
+            for i, ((name, dim, threshold), scope) in enumerate(zip(self._semantic_dims, scopes)):
+                if name in selected:
+                    score = best[scope][i] if escalated[i] else best["abstract"][i]
+                    results[f"{dim}_score"] = round(float(score), 3)
+                    results[f"{dim}_pass"] = bool(score >= threshold)
+                    results[f"{dim}_tier"] = "fulltext" if escalated[i] else "abstract"
+
+        if rules and any(name in selected for name, _ in self._rule_dims):
+            scopes = [self._scope(dim, sections) for _, dim in self._rule_dims]
+            matched = {scope: self.matched_patterns(scoped_text(scope)) for scope in set(scopes)}
+            counts = [0] * len(self._rule_dims)
+            for scope, found in matched.items():
+                for p in found:
+                    for dim_index in self._pattern_dims[p]:
+                        if scopes[dim_index] == scope:
+                            counts[dim_index] += 1
+            for (name, dim), count in zip(self._rule_dims, counts):
+                if name not in selected:
+                    continue
+                definition = self.frameworks[name]
+                if definition.get("rule_mode", "any") == "count":
+                    results[dim] = min(int(definition.get("rule_cap", count)), count)
+                else:
+                    results[dim] = count > 0
+
+        return results
+
+
+@lru_cache(maxsize=None)
+def get_registry(path: str = DEFAULT_FRAMEWORKS_PATH, model: str = DEFAULT_MODEL) -> FrameworkRegistry:
+    """Compile the framework registry once per process."""
+    frameworks = {**load_frameworks(path), **_PLUGINS}
+    return FrameworkRegistry(frameworks, model=model)
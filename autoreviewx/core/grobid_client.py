@@ -0,0 +1,311 @@
+# autoreviewx/core/grobid_client.py
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+
+import requests
+
+DEFAULT_GROBID_URL = "http://localhost:8070"
+FULLTEXT_PATH = "/api/processFulltextDocument"
+HEALTH_PATH = "/api/isalive"
+
+# Comma-separated list of GROBID base URLs, used when no endpoints are given explicitly
+GROBID_URLS_ENV = "AUTOREVIEWX_GROBID_URLS"
+
+
+class GrobidError(Exception):
+    """Raised when no GROBID endpoint could process a document."""
+    pass
+
+
+class GrobidEndpoint:
+    """One GROBID server with its own adaptive concurrency limit and failure state."""
+
+    def __init__(self, url: str, max_concurrency: int):
+        self.url = url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.limit = max_concurrency
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.disabled_until = 0.0
+        self._successes = 0
+        # Stats
+        self.completed = 0
+        self.failed = 0
+        self.throttled = 0
+
+    @property
+    def available(self) -> bool:
+        return self.disabled_until == 0.0 and self.outstanding < self.limit
+
+    def __repr__(self):
+        return (f"GrobidEndpoint({self.url}, outstanding={self.outstanding}, limit={self.limit}, "
+                f"failures={self.consecutive_failures})")
+
+
+class GrobidPool:
+    """
+    Client-side load balancer over several GROBID endpoints.
+
+    - Least-outstanding-requests: each request goes to the healthy endpoint with
+      the fewest requests in flight.
+    - Circuit breaker: after ``failure_threshold`` consecutive errors or timeouts an
+      endpoint is taken out of rotation for ``cooldown`` seconds, then only comes
+      back once ``/api/isalive`` answers.
+    - Adaptive concurrency (AIMD): a 503 halves the endpoint's in-flight limit,
+      successes grow it back by one up to ``max_concurrency``. Once the limit is
+      down to one, further 429/503 replies count toward the circuit breaker.
+    - Deadline: ``deadline`` seconds bound a whole document, retries included.
+    - Hedging: once a document takes longer than the ``hedge_percentile`` of the
+      observed latencies, a duplicate request goes to another endpoint and the
+      first answer wins.
+    """
+
+    def __init__(self, urls: list = None, max_concurrency: int = 4, timeout: float = 120.0,
+                 failure_threshold: int = 3, cooldown: float = 30.0, max_attempts: int = None,
+                 health_timeout: float = 5.0, deadline: float = None, hedge_percentile: float = None,
+                 hedge_min_samples: int = 20):
+        urls = urls or default_grobid_urls()
+        self.endpoints = [GrobidEndpoint(url, max_concurrency) for url in urls]
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.health_timeout = health_timeout
+        self.max_attempts = max_attempts or 2 * len(self.endpoints) + 1
+        self.deadline = deadline
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedged = 0
+        self._latencies = deque(maxlen=500)
+        self._executor = None
+        self._cond = threading.Condition()
+        self._session = requests.Session()
+
+    @property
+    def capacity(self) -> int:
+        """Total number of requests the pool accepts in flight."""
+        return sum(e.max_concurrency for e in self.endpoints)
+
+    def is_alive(self, endpoint: GrobidEndpoint) -> bool:
+        try:
+            response = self._session.get(endpoint.url + HEALTH_PATH, timeout=self.health_timeout)
+            return response.status_code == 200
+        except requests.RequestException:
+            return False
+
+    def check_health(self) -> list:
+        """Probe every endpoint now; dead ones are taken out of rotation. Returns the healthy URLs."""
+        healthy = []
+        for endpoint in self.endpoints:
+            alive = self.is_alive(endpoint)
+            with self._cond:
+                if alive:
+                    endpoint.disabled_until = 0.0
+                    endpoint.consecutive_failures = 0
+                    healthy.append(endpoint.url)
+                else:
+                    endpoint.disabled_until = time.monotonic() + self.cooldown
+            if not alive:
+                print(f"⚠️  GROBID endpoint out of rotation: {endpoint.url}")
+        with self._cond:
+            self._cond.notify_all()
+        return healthy
+
+    def _probe_expired(self):
+        # Half-open: endpoints whose cooldown has elapsed come back only if healthy
+        now = time.monotonic()
+        with self._cond:
+            expired = [e for e in self.endpoints if 0.0 < e.disabled_until <= now]
+            for e in expired:
+                e.disabled_until = now + self.cooldown  # keep other threads off while probing
+        for endpoint in expired:
+            alive = self.is_alive(endpoint)
+            with self._cond:
+                if alive:
+                    endpoint.disabled_until = 0.0
+                    endpoint.consecutive_failures = 0
+                    self._cond.notify_all()
+
+    def acquire(self, exclude=(), wait: float = None) -> GrobidEndpoint:
+        """Reserve a slot on the least-loaded healthy endpoint, preferably not in ``exclude``; waits if all are busy."""
+        deadline = time.monotonic() + (self.timeout if wait is None else wait)
+        while True:
+            self._probe_expired()
+            with self._cond:
+                candidates = [e for e in self.endpoints if e.available and e not in exclude]
+                if not candidates:
+                    candidates = [e for e in self.endpoints if e.available]
+                if candidates:
+                    endpoint = min(candidates, key=lambda e: (e.outstanding / e.limit, e.outstanding))
+                    endpoint.outstanding += 1
+                    return endpoint
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise GrobidError("No GROBID endpoint available")
+                self._cond.wait(timeout=min(remaining, 1.0))
+
+    def release(self, endpoint: GrobidEndpoint, outcome: str):
+        """Return a slot; ``outcome`` is ``"ok"``, ``"rejected"``, ``"throttled"`` (503) or ``"failed"``."""
+        with self._cond:
+            endpoint.outstanding -= 1
+            if outcome == "rejected":
+                endpoint.consecutive_failures = 0
+            elif outcome == "ok":
+                endpoint.completed += 1
+                endpoint.consecutive_failures = 0
+                endpoint._successes += 1
+                if endpoint.limit < endpoint.max_concurrency and endpoint._successes >= endpoint.limit:
+                    endpoint.limit += 1
+                    endpoint._successes = 0
+            elif outcome == "throttled":
+                endpoint.throttled += 1
+                endpoint._successes = 0
+                if endpoint.limit > 1:
+                    endpoint.limit //= 2
+                else:
+                    # Still throttled at one request in flight: count it toward the circuit breaker
+                    self._count_failure(endpoint)
+            else:
+                endpoint.failed += 1
+                self._count_failure(endpoint)
+            self._cond.notify_all()
+
+    def _count_failure(self, endpoint: GrobidEndpoint):
+        endpoint.consecutive_failures += 1
+        if endpoint.consecutive_failures >= self.failure_threshold:
+            endpoint.disabled_until = time.monotonic() + self.cooldown
+            print(f"⚠️  GROBID endpoint out of rotation after {endpoint.consecutive_failures} "
+                  f"failures: {endpoint.url}")
+
+    def hedge_delay(self):
+        """Seconds after which a document is hedged, or None (hedging off, one endpoint or too few samples)."""
+        if self.hedge_percentile is None or len(self.endpoints) < 2:
+            return None
+        latencies = sorted(self._latencies)
+        if len(latencies) < self.hedge_min_samples:
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * self.hedge_percentile / 100))]
+
+    def process_fulltext(self, pdf_path: str, timeout: float = None, deadline: float = None) -> str:
+        """
+        Send a PDF to ``processFulltextDocument`` and return the TEI XML.
+
+        Connection errors, timeouts and 503 replies are retried on the next
+        least-loaded endpoint; a document rejected with a 4xx/500 is not retried.
+        ``deadline`` (default: the pool's) bounds the whole call in seconds.
+
+        Raises:
+            GrobidError: If every attempt failed or the deadline passed.
+        """
+        # Read once up front: a local I/O error must not count against an endpoint
+        with open(pdf_path, "rb") as file:
+            payload = file.read()
+        filename = os.path.basename(pdf_path)
+        deadline = self.deadline if deadline is None else deadline
+        end = time.monotonic() + deadline if deadline else None
+
+        delay = self.hedge_delay()
+        if delay is None:
+            return self._send(payload, filename, timeout, end)
+        return self._send_hedged(payload, filename, timeout, end, delay)
+
+    def _send_hedged(self, payload: bytes, filename: str, timeout: float, end: float, delay: float) -> str:
+        with self._cond:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2 * self.capacity, thread_name_prefix="grobid-hedge")
+        tried = []
+        primary = self._executor.submit(self._send, payload, filename, timeout, end, tried=tried)
+        try:
+            return primary.result(timeout=delay if end is None else min(delay, max(0.0, end - time.monotonic())))
+        except FutureTimeout:
+            pass
+        if end is not None and time.monotonic() >= end:
+            raise GrobidError("GROBID deadline exceeded")
+
+        # Slow document: race a duplicate on another endpoint, keep the first answer
+        with self._cond:
+            self.hedged += 1
+        pending = {primary, self._executor.submit(self._send, payload, filename, timeout, end, avoid=tried)}
+        error = None
+        while pending:
+            remaining = None if end is None else max(0.0, end - time.monotonic())
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                raise GrobidError("GROBID deadline exceeded")
+            for future in done:
+                try:
+                    return future.result()
+                except GrobidError as e:
+                    error = e
+        raise error
+
+    def _send(self, payload: bytes, filename: str, timeout: float, end: float, tried: list = None,
+              avoid: list = ()) -> str:
+        last_error = "no attempt made"
+        previous = None
+        for attempt in range(self.max_attempts):
+            remaining = None if end is None else end - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                last_error = "deadline exceeded"
+                break
+            endpoint = self.acquire(exclude=[previous, *avoid], wait=remaining)
+            if tried is not None:
+                tried.append(endpoint)
+            outcome = "failed"
+            started = time.monotonic()
+            try:
+                request_timeout = timeout or self.timeout
+                if remaining is not None:
+                    request_timeout = min(request_timeout, remaining)
+                response = self._session.post(endpoint.url + FULLTEXT_PATH, files={"input": (filename, payload)},
+                                              timeout=request_timeout)
+                if response.status_code == 200:
+                    outcome = "ok"
+                    self._latencies.append(time.monotonic() - started)
+                    return response.text
+                last_error = f"status {response.status_code} from {endpoint.url}"
+                if response.status_code in (429, 503):
+                    outcome = "throttled"
+                elif 400 <= response.status_code <= 500:
+                    # The document was rejected (bad input): the endpoint itself is fine
+                    outcome = "rejected"
+                    break
+            except requests.Timeout as e:
+                last_error = f"{type(e).__name__} from {endpoint.url}"
+                if remaining is not None and remaining < (timeout or self.timeout):
+                    # Cut short by the document's deadline: not the endpoint's fault
+                    outcome = "rejected"
+            except requests.RequestException as e:
+                last_error = f"{type(e).__name__} from {endpoint.url}"
+            finally:
+                self.release(endpoint, outcome)
+            if outcome == "throttled":
+                time.sleep(min(0.1 * 2 ** attempt, 2.0))
+            previous = endpoint
+        raise GrobidError(f"GROBID extraction failed with {last_error}")
+
+
+def default_grobid_urls() -> list:
+    urls = [u.strip() for u in os.environ.get(GROBID_URLS_ENV, "").split(",") if u.strip()]
+    return urls or [DEFAULT_GROBID_URL]
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_pool() -> GrobidPool:
+    """Process-wide pool, built from ``AUTOREVIEWX_GROBID_URLS`` unless ``set_default_pool`` was called."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = GrobidPool()
+        return _default_pool
+
+
+def set_default_pool(pool: GrobidPool):
+    global _default_pool
+    with _default_pool_lock:
+        _default_pool = pool
@@ -1,16 +1,25 @@
 # autoreviewx/core/grobid_extractor.py
-import requests
 from bs4 import BeautifulSoup
 import os
 import re
-
-from autoreviewx.core.tapupas import evaluate_tapupas
-from autoreviewx.core.casp import evaluate_casp_semantic
-from autoreviewx.core.kitchenham import evaluate_kitchenham
-from autoreviewx.core.kitchenham import evaluate_kitchenham_semantic
-from autoreviewx.core.kitchenham import evaluate_kitchenham_all
-from autoreviewx.core.prisma import evaluate_prisma_semantic, prisma_global_score
-from autoreviewx.core.prisma import evaluate_prisma
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from autoreviewx.core.budget import StageBudget, get_default_budgets
+from autoreviewx.core.citations import CitationGraph, parse_references
+from autoreviewx.core.doc_cache import text_vector, text_vectors
+from autoreviewx.core.enrichment import fill_gaps
+from autoreviewx.core.extractor import extract_metadata_from_text, extract_text_from_pdf, find_pdf_files
+from autoreviewx.core.frameworks import get_registry
+from autoreviewx.core.nlp import document_vectors
+from autoreviewx.core.grobid_client import GrobidError, GrobidPool, get_default_pool
+from autoreviewx.core.preflight import triage, write_report
+from autoreviewx.core.schema import export_schema, framework_fields
+from autoreviewx.core.scoring import PICO_COMPONENTS, global_scores
+from autoreviewx.core.sections import split_sections, split_text_sections
+from autoreviewx.core.sharding import document_key, select_shard
+from autoreviewx.core.stages import Stage, StageGraph
+from autoreviewx.core.text_index import TextIndex
+from autoreviewx.core.vector_index import VectorIndex
 
 
 
@@ -76,55 +85,412 @@ def extract_title_from_soup(soup):
 
     return title, title_source
 
-def evaluate_casp(text: str) -> dict:
-    dimensions = {
-        "casp_clear_aim": bool(re.search(r"\b(aim|purpose) of this (study|research)\b", text.lower())),
-        "casp_methodology": "qualitative" in text.lower(),
-        "casp_recruitment": "participants were" in text.lower() or "we recruited" in text.lower(),
-        "casp_ethics": "ethics approval" in text.lower() or "informed consent" in text.lower(),
-        "casp_analysis": re.search(r"(thematic analysis|content analysis|grounded theory)", text.lower()) is not None,
-        "casp_results_stated": "results show" in text.lower() or "findings indicate" in text.lower(),
-        "casp_value": "implications" in text.lower() or "contribution to knowledge" in text.lower()
-    }
-    return dimensions
-
-def casp_global_score(metadata):
-    keys = [k for k in metadata if k.startswith("casp_") and k.endswith("_pass")]
-    return round(sum(metadata[k] for k in keys) / len(keys), 2) if keys else None
 
-def kitchenham_global_score(metadata):
-    keys = [k for k in metadata if k.startswith("kitch_") and k.endswith("_pass")]
-    return round(sum(metadata[k] for k in keys) / len(keys), 2) if keys else None
-
-def tapupas_score(metadata):
-    tap_keys = ["transparency", "accuracy", "purposivity", "utility", "propriety", "accessibility", "specificity"]
-    scores = [metadata.get(k, 0) for k in tap_keys]
-    return round(sum(scores) / (2 * len(tap_keys)), 2) if scores else None
+HEADER_COLUMNS = ["title", "abstract", "authors", "doi", "source_file", "year", "journal", "keywords",
+                  "abstract_length", "title_source", "references_count", "extraction_source"]
+SEMANTIC_COLUMNS = ["data_used", "models_used", "tools_used", "target_education_level", "countries", "methodology",
+                    "biological_data", "physiological_data"]
+SAMPLE_COLUMNS = ["participants", "participants_count"]
+# --fields groups -> stages whose columns they stand for
+FIELD_GROUPS = {
+    "header": ["header"],
+    "semantic": ["semantic"],
+    "samples": ["samples"],
+    "pico": ["pico", "pico_score"],
+    "frameworks": ["frameworks", "framework_scores"],
+    "scores": ["framework_scores", "pico_score"],
+}
+# Stages whose per-document dicts make up a row, in merge order (enrichment fills header gaps)
+ROW_STAGES = ["header", "semantic", "samples", "pico", "frameworks", "framework_scores", "pico_score", "enrichment"]
+
+
+class FieldSelection:
+    """
+    Columns an extraction produces and the frameworks it scores.
+
+    ``fields`` are export columns or groups of ``FIELD_GROUPS``; only the stages
+    producing them run (see ``run_extraction``). ``frameworks`` restricts
+    scoring to those frameworks. ``source_file`` and ``stage_timeouts`` are
+    always part of a row. Without arguments every column is produced.
+    ``cascade`` turns on abstract-first framework scoring with that margin
+    (see ``FrameworkRegistry.escalated``).
+    """
+
+    def __init__(self, fields: list = None, frameworks: list = None, cascade: float = None):
+        if cascade is not None and cascade < 0:
+            raise ValueError("The cascade margin must be positive")
+        self.cascade = cascade
+        base = get_registry()
+        try:
+            self.registry = base.select(frameworks) if frameworks else base
+        except KeyError as e:
+            raise ValueError(e.args[0]) from None
+        self.full = not fields and not frameworks
+        self.producers = self._producers()
+
+        if fields:
+            wanted, unknown = {"source_file"}, []
+            for field in fields:
+                if field in FIELD_GROUPS:
+                    wanted.update(c for c, stage in self.producers.items() if stage in FIELD_GROUPS[field])
+                elif field in self.producers or field == "stage_timeouts":
+                    wanted.add(field)
+                else:
+                    unknown.append(field)
+            if unknown:
+                raise ValueError(f"Unknown field(s): {', '.join(unknown)} (use export columns of the selected "
+                                 f"frameworks or {', '.join(FIELD_GROUPS)})")
+        else:
+            wanted = set(self.producers)
+        wanted.add("stage_timeouts")
+        self.columns = [column for column in export_schema() if column in wanted]
+        self.stages = {self.producers[column] for column in self.columns if column in self.producers}
+
+    def _producers(self) -> dict:
+        """Column -> stage computing it."""
+        producers = {column: "header" for column in HEADER_COLUMNS}
+        producers.update({column: "semantic" for column in SEMANTIC_COLUMNS})
+        producers.update({column: "samples" for column in SAMPLE_COLUMNS})
+        producers.update({column: "pico" for column in PICO_COMPONENTS})
+        producers["score_pico"] = "pico_score"
+        for name, definition in self.registry.frameworks.items():
+            for column, _ in framework_fields({name: definition}):
+                producers[column] = "framework_scores" if column == definition.get("score_column") else "frameworks"
+        producers["enrichment_source"] = "enrichment"
+        return producers
+
+    @property
+    def schema(self):
+        """Export schema of the selected columns (None: the full schema)."""
+        if self.full:
+            return None
+        return {column: dtype for column, dtype in export_schema().items() if column in self.columns}
+
+
+def header_fields(parsed: dict) -> dict:
+    """Bibliographic columns of a parsed paper (no NLP)."""
+    references = parsed["references"]
+    return {
+        "title": parsed["title"],
+        "abstract": parsed["abstract"],
+        "authors": "; ".join(parsed["authors"]),
+        "doi": parsed["doi"],
+        "source_file": parsed["source_file"],
+        "year": parsed["year"],
+        "journal": parsed["journal"],
+        "keywords": "; ".join(parsed["keywords"]),
+        "abstract_length": len(parsed["abstract"].split()),
+        "title_source": parsed["title_source"],
+        "references_count": len(references) if references is not None else None,
+        "extraction_source": parsed["extraction_source"],
+    }
 
-def pico_score(metadata):
-    keys = ["population", "intervention", "comparison", "outcome"]
-    present = sum(bool(metadata.get(k)) for k in keys)
-    return round(present / len(keys), 2)
 
-def extract_metadata_with_grobid(pdf_path: str) -> dict:
-    url = "http://localhost:8070/api/processFulltextDocument"
+def run_extraction(parsed: list, selection: FieldSelection = None, vector_index: VectorIndex = None,
+                   citation_graph: CitationGraph = None, enricher=None, batch_size: int = 16,
+                   n_process: int = 1, text_index: TextIndex = None) -> list:
+    """
+    Extraction rows of parsed papers (``parse_tei`` or ``parse_local``), one per paper.
+
+    Extraction is a graph of stages (header, document and section vectors,
+    frameworks, semantic, samples, pico, global scores, enrichment, index,
+    full-text index and citation writes) run by ``StageGraph``: only the stages needed for the
+    ``selection`` columns run, each once for all papers, so vectors come from
+    batched spaCy passes. Network and disk stages overlap with the NLP ones.
+    With ``selection.cascade``, frameworks are scored on the abstracts first
+    and the text and section vectors are only computed for the papers (and
+    section groups) that some uncertain dimension still needs.
+    Every content stage of a paper runs under its time budget. A paper whose
+    analysis fails gets an ``{"error": ...}`` row.
+    """
+    selection = selection or FieldSelection()
+    registry = selection.registry
+    budgets = [StageBudget(get_default_budgets()) for _ in parsed]
+    failures = {}
+
+    def each(func, *columns):
+        # One call per paper; a paper that fails is reported and skipped by later stages
+        results = []
+        for i, args in enumerate(zip(*columns)):
+            if i in failures:
+                results.append(None)
+                continue
+            try:
+                results.append(func(i, *args))
+            except Exception as e:
+                print(f"❌ Failed to process {parsed[i]['source_file']}: {e}")
+                failures[i] = str(e)
+                results.append(None)
+        return results
+
+    def budgeted(stage, func):
+        return lambda docs: each(lambda i, doc: budgets[i].run(stage, func, doc["fulltext"], default=dict), docs)
+
+    def doc_vectors(docs):
+        try:
+            return list(text_vectors([doc["fulltext"] for doc in docs], registry.model, batch_size=batch_size,
+                                     n_process=n_process))  # cached on disk with --nlp-cache
+        except Exception as e:
+            print(f"⚠️  Batched NLP failed ({e}), analyzing documents one by one")
+            return each(lambda i, doc: text_vector(doc["fulltext"], registry.model), docs)
+
+    def abstract_vectors(docs):
+        # Abstracts are short: one batch for every paper that has one (the others go straight to full text)
+        vectors = [None] * len(docs)
+        abstracts = [(i, doc["abstract"]) for i, doc in enumerate(docs) if doc["abstract"].strip()]
+        if abstracts:
+            try:
+                batch = document_vectors([text for _, text in abstracts], registry.model, n_process=n_process)
+            except Exception as e:
+                print(f"⚠️  Batched abstract NLP failed ({e}), scoring on full text")
+                return vectors
+            for (i, _), vector in zip(abstracts, batch):
+                vectors[i] = vector
+        return vectors
+
+    def escalated_vectors(docs, masks):
+        # Whole-text vectors of the papers where an uncertain dimension is scored on the whole text
+        vectors = [None] * len(docs)
+        needed = [i for i, doc in enumerate(docs) if registry.needs_text(doc["sections"], masks[i])]
+        if needed:
+            try:
+                batch = text_vectors([docs[i]["fulltext"] for i in needed], registry.model, batch_size=batch_size,
+                                     n_process=n_process)
+            except Exception as e:
+                print(f"⚠️  Batched NLP failed ({e}), left to each paper")
+                return vectors
+            for i, vector in zip(needed, batch):
+                vectors[i] = vector
+        return vectors
+
+    def section_vectors(docs, masks=None):
+        # Section groups scored by the selected frameworks (uncertain dimensions only in a cascade),
+        # in one batch for every paper
+        groups = [(i, scope, text) for i, doc in enumerate(docs)
+                  for scope, text in registry.section_texts(doc["sections"], masks[i] if masks else None).items()]
+        vectors = [{} for _ in docs]
+        if groups:
+            try:
+                batch = document_vectors([text for _, _, text in groups], registry.model, n_process=n_process)
+            except Exception as e:
+                print(f"⚠️  Batched section NLP failed ({e}), left to each paper")
+                return vectors
+            for (i, scope, _), vector in zip(groups, batch):
+                vectors[i][scope] = vector
+        return vectors
+
+    def frameworks(docs, vectors, scoped_vectors, abstracts=None):
+        return each(lambda i, doc, vector, scoped, abstract: budgets[i].run(
+            "frameworks", registry.evaluate, doc["fulltext"], vector=vector, sections=doc["sections"],
+            section_vectors=scoped, abstract_vector=abstract, margin=selection.cascade, default=dict),
+            docs, vectors, scoped_vectors, abstracts or [None] * len(docs))
+
+    if selection.cascade is None:
+        framework_inputs = ["parsed", "doc_vectors", "section_vectors"]
+    else:
+        framework_inputs = ["parsed", "escalated_vectors", "escalated_section_vectors", "abstract_vectors"]
 
-    with open(pdf_path, 'rb') as file:
-        files = {'input': file}
-        response = requests.post(url, files=files)
+    def document_keys(docs):
+        # Papers are indexed by PDF content: `a/paper.pdf` and `b/paper.pdf` are two papers
+        keys = []
+        for doc in docs:
+            try:
+                keys.append(document_key(doc["source_path"]))
+            except (KeyError, OSError):
+                keys.append("file:" + doc["source_file"])
+        return keys
+
+    def index(headers, vectors, keys):
+        for header, vector, key in zip(headers, vectors, keys):
+            if header is not None and vector is not None:
+                vector_index.add(vector, {"title": header["title"], "doi": header["doi"],
+                                          "source_file": header["source_file"], "key": key})
+
+    def cite(docs):
+        # 🔹 Graphe de citations (écrit au fil de l'eau, le TEI n'est pas conservé)
+        for doc in docs:
+            if doc["references"] is not None:
+                citation_graph.add_document(doc["doi"], doc["title"], doc["year"], doc["references"])
+
+    graph = StageGraph([
+        Stage("header", lambda docs: each(lambda i, doc: header_fields(doc), docs), ["parsed"]),
+        Stage("doc_vectors", doc_vectors, ["parsed"]),
+        Stage("section_vectors", section_vectors, ["parsed"]),
+        # 🔹 Cascade: abstract first, full text only for the dimensions it leaves uncertain
+        Stage("abstract_vectors", abstract_vectors, ["parsed"]),
+        Stage("escalation", lambda vectors: [registry.escalated(vector, selection.cascade) for vector in vectors],
+              ["abstract_vectors"]),
+        Stage("escalated_vectors", escalated_vectors, ["parsed", "escalation"]),
+        Stage("escalated_section_vectors", section_vectors, ["parsed", "escalation"]),
+        # 🔹 Frameworks sélectionnés (CASP, Kitchenham, PRISMA, TAPUPAS) en une passe
+        Stage("frameworks", frameworks, framework_inputs),
+        # 🔹 Analyse sémantique
+        Stage("semantic", budgeted("semantic", extract_semantic_content), ["parsed"]),
+        Stage("samples", budgeted("samples", extract_samples), ["parsed"]),
+        Stage("pico", budgeted("pico", extract_pico), ["parsed"]),
+        # ✅ Global scores (same computation as the `rescore` command)
+        Stage("framework_scores", lambda results: each(lambda i, row: global_scores(row), results), ["frameworks"]),
+        Stage("pico_score", lambda results: each(lambda i, row: global_scores(row), results), ["pico"]),
+        Stage("enrichment", lambda headers: fill_gaps([h or {} for h in headers], enricher), ["header"], io=True),
+        # 🔹 Vecteur du document pour les requêtes "related papers"
+        Stage("document_keys", document_keys, ["parsed"], io=True),
+        Stage("indexed", index, ["header", "doc_vectors", "document_keys"], io=True),
+        Stage("cited", cite, ["parsed"], io=True),
+        # 🔹 Texte intégral pour `search` (titre, résumé, corps)
+        Stage("text_indexed", lambda docs, keys: text_index.add_many(
+            [{**doc, "body": doc["fulltext"], "key": key} for doc, key in zip(docs, keys)]),
+              ["parsed", "document_keys"], io=True),
+    ])
+    targets = set(selection.stages) - {"enrichment"}
+    if enricher is not None and "header" in targets:
+        targets.add("enrichment")
+    if vector_index is not None:
+        targets.add("indexed")
+    if citation_graph is not None:
+        targets.add("cited")
+    if text_index is not None:
+        targets.add("text_indexed")
+    values = graph.run({"parsed": parsed}, targets)
+
+    rows = []
+    for i, doc in enumerate(parsed):
+        if i in failures:
+            rows.append({"error": failures[i], "source_file": doc["source_file"]})
+            continue
+        row = {}
+        for stage in ROW_STAGES:
+            if stage in values and values[stage][i]:
+                row.update(values[stage][i])
+        if not selection.full:
+            row = {column: value for column, value in row.items() if column in selection.columns}
+        row["stage_timeouts"] = budgets[i].summary
+        if budgets[i].exceeded:
+            print(f"⏱️  {doc['source_file']}: over budget, skipped {row['stage_timeouts']}")
+        rows.append(row)
+    return rows
+
+
+def parse_local(pdf_path: str) -> dict:
+    """
+    Same fields as ``parse_tei`` from the PyMuPDF text layer.
+
+    Header fields come from ``extract_metadata_from_text`` heuristics and sections
+    from numbered or standalone heading lines (``split_text_sections``, on the
+    text read block by block); there are no references, and rows are tagged
+    ``extraction_source = "local"``.
+    """
+    text = extract_text_from_pdf(pdf_path, blocks=True)
+    header = extract_metadata_from_text(text, pdf_path)
+    sections = split_text_sections(text)
+    return {
+        "title": header["title"],
+        "title_source": "local",
+        "abstract": header["abstract"] or sections.get("abstract", ""),
+        "authors": [name for name in header["authors"].split("; ") if name],
+        "doi": header["doi"],
+        "source_file": header["source_file"],
+        "source_path": pdf_path,
+        "year": header["year"],
+        "journal": "",
+        "keywords": [keyword for keyword in header["keywords"].split("; ") if keyword],
+        "fulltext": text,
+        "sections": sections,
+        "references": None,
+        "extraction_source": "local",
+    }
 
-    if response.status_code != 200:
-        return {"error": f"GROBID extraction failed with status {response.status_code}"}
 
-    soup = BeautifulSoup(response.text, 'xml')
+def extract_metadata_locally(pdf_path: str, vector_index: VectorIndex = None,
+                             selection: FieldSelection = None, text_index: TextIndex = None) -> dict:
+    """Same row as ``extract_metadata_with_grobid`` from the PyMuPDF text layer (see ``parse_local``)."""
+    return run_extraction([parse_local(pdf_path)], selection, vector_index=vector_index, text_index=text_index)[0]
+
+
+# Selection and text index of the worker processes of ``extract_batch_metadata_locally`` (set once per process)
+_worker_selection = None
+_worker_text_index = None
+
+
+def _init_local_worker(selection, text_index_path):
+    global _worker_selection, _worker_text_index
+    _worker_selection = selection
+    _worker_text_index = TextIndex(text_index_path) if text_index_path else None
+
+
+def _extract_local_chunk(pdf_files: list, batch_size: int = 16, selection: FieldSelection = None,
+                         text_index: TextIndex = None) -> list:
+    """``parse_local`` and ``run_extraction`` rows of some PDFs, in order (None for unreadable files)."""
+    rows, parsed = [None] * len(pdf_files), []
+    for i, pdf_path in enumerate(pdf_files):
+        try:
+            parsed.append((i, parse_local(pdf_path)))
+        except Exception as e:
+            print(f"❌ Failed to read {os.path.basename(pdf_path)}: {e}")
+    analyzed = run_extraction([item for _, item in parsed], selection or _worker_selection, batch_size=batch_size,
+                              text_index=text_index if text_index is not None else _worker_text_index)
+    for (i, _), row in zip(parsed, analyzed):
+        rows[i] = row
+    return rows
+
+
+def extract_batch_metadata_locally(folder_path: str, recursive: bool = False, shard=None, shard_by: str = "path",
+                                   preflight: bool = False, preflight_limits: dict = None,
+                                   quarantine_report: str = None, workers: int = 1, chunk_size: int = 16,
+                                   nlp_batch_size: int = 16, selection: FieldSelection = None,
+                                   enricher=None, text_index: TextIndex = None) -> list:
+    """
+    Extract and score every PDF of a folder without GROBID.
+
+    Chunks of ``chunk_size`` PDFs go through ``parse_local`` and the whole
+    ``run_extraction`` pipeline in ``workers`` processes, each with its own
+    spaCy pipeline (``--shared-vectors`` memory-maps the word vectors once for
+    all of them, and each opens ``text_index`` on its own connection); rows
+    have the GROBID batch schema, in PDF order. Missing DOI/year/journal are
+    then filled by ``enricher`` in this process.
+    """
+    pdf_files = collect_pdf_files(folder_path, recursive=recursive, shard=shard, shard_by=shard_by,
+                                  preflight=preflight, preflight_limits=preflight_limits,
+                                  quarantine_report=quarantine_report)
+    selection = selection or FieldSelection()
+    chunks = [pdf_files[i:i + chunk_size] for i in range(0, len(pdf_files), chunk_size)]
+    executor = None
+    if workers > 1 and len(chunks) > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_local_worker,
+                                       initargs=(selection, text_index.path if text_index is not None else None))
+        chunk_rows = executor.map(_extract_local_chunk, chunks, [nlp_batch_size] * len(chunks))
+    else:
+        chunk_rows = (_extract_local_chunk(chunk, nlp_batch_size, selection, text_index) for chunk in chunks)
+
+    results, done = [], 0
+    try:
+        for chunk, rows in zip(chunks, chunk_rows):
+            done += len(chunk)
+            rows = [row for row in rows if row is not None]
+            if enricher is not None and "header" in selection.stages:
+                papers = [row for row in rows if "error" not in row]
+                for row, update in zip(papers, fill_gaps(papers, enricher)):
+                    row.update({column: value for column, value in update.items()
+                                if selection.full or column in selection.columns})
+            results.extend(rows)
+            print(f"✅ {done}/{len(pdf_files)} PDF(s) processed")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return results
+
+
+def parse_tei(tei: str, pdf_path: str) -> dict:
+    """Bibliographic fields, body text, sections and references of a GROBID TEI document (no NLP)."""
+    soup = BeautifulSoup(tei, 'xml')
 
 
     # 🔹 Titre via fonction unifiée
     #title = extract_title_from_soup(soup)
     title, title_source = extract_title_from_soup(soup)
 
-    # 🔹 DOI
-    doi_tag = soup.find('idno', {'type': 'DOI'})
+    # 🔹 DOI (from the header only: references carry their own DOIs)
+    header = soup.find('teiHeader') or soup
+    doi_tag = header.find('idno', {'type': 'DOI'})
     doi = doi_tag.text.strip() if doi_tag else ""
 
     # 🔹 Auteurs
@@ -147,18 +513,6 @@ def extract_metadata_with_grobid(pdf_path: str) -> dict:
     # 🔹 Texte complet pour NLP
     fulltext_node = soup.find('body')
     fulltext = fulltext_node.get_text(separator=" ") if fulltext_node else ""
-    sample_info = extract_samples(fulltext)
-
-    casp_info = evaluate_casp(fulltext)
-    casp_semantic = evaluate_casp_semantic(fulltext)
-    kitchenham_info = evaluate_kitchenham_all(fulltext)
-    prisma_info = evaluate_prisma_semantic(fulltext)
-
-    # ✅ Normalize the _pass fields to match expected column names
-    for key in list(casp_semantic.keys()):
-        if key.endswith("_pass"):
-            base = key.replace("_pass", "")
-            casp_semantic[base] = casp_semantic.pop(key)
 
     # 🔹 Année (simple heuristique sur <imprint> ou le corps)
     year_tag = soup.find('date')
@@ -179,52 +533,69 @@ def extract_metadata_with_grobid(pdf_path: str) -> dict:
         for term in kw.find_all('term'):
             keywords.append(term.text.strip())
 
-    # 🔹 Analyse sémantique
-    semantic_info = extract_semantic_content(fulltext)
-    sample_info = extract_samples(fulltext)
-    pico_info = extract_pico(fulltext)
-
     return {
         "title": title,
+        "title_source": title_source,
         "abstract": abstract_text,
-        "authors": "; ".join(authors),
+        "authors": authors,
         "doi": doi,
         "source_file": os.path.basename(pdf_path),
-        **semantic_info,
-        **sample_info,
-        **pico_info,
-       # **evaluate_casp_semantic(fulltext),
-        **casp_info,
-        **casp_semantic,
-        **kitchenham_info,
-        **evaluate_prisma(fulltext),
-        **prisma_info,
-        "score_prisma": prisma_global_score(prisma_info),
+        "source_path": pdf_path,
         "year": year,
         "journal": journal,
-        "keywords": "; ".join(keywords),
-        "abstract_length": len(abstract_text.split()),
-        "title_source": title_source,
-        **evaluate_tapupas(fulltext),
+        "keywords": keywords,
+        "fulltext": fulltext,
+        # 🔹 Sections (<div>/<head>) : chaque dimension est évaluée sur les siennes
+        "sections": split_sections(soup),
+        # 🔹 Références (<listBibl>), parsées dans la même passe
+        "references": parse_references(soup),
+        "extraction_source": "grobid",
     }
 
-    # ✅ Add global scores
-    metadata["score_tapupas"] = tapupas_score(metadata)
-    metadata["score_casp"] = casp_global_score(metadata)
-    metadata["score_kitchenham"] = kitchenham_global_score(metadata)
-    metadata["score_pico"] = pico_score(metadata)
 
-    return metadata
+
+
+def _grobid_failure(pdf_path: str, error: GrobidError, fallback: bool) -> dict:
+    """Document GROBID could not process: parsed from its text layer with ``fallback``, else an error row."""
+    if not fallback:
+        return {"error": str(error)}
+    print(f"↩️  {os.path.basename(pdf_path)}: {error}, falling back to local extraction")
+    try:
+        return parse_local(pdf_path)
+    except Exception as local_error:
+        return {"error": f"{error}; local extraction failed: {local_error}"}
+
+
+def extract_metadata_with_grobid(pdf_path: str, pool: GrobidPool = None, vector_index: VectorIndex = None,
+                                 citation_graph: CitationGraph = None, fallback: bool = False,
+                                 selection: FieldSelection = None, enricher=None, text_index: TextIndex = None) -> dict:
+    """
+    Metadata, content analysis and framework scores of one PDF through GROBID.
+
+    Only the ``selection`` columns are computed (default: all). When GROBID
+    fails or misses the pool's deadline, the row is an ``{"error": ...}`` one,
+    or with ``fallback`` the row of ``extract_metadata_locally``.
+    """
+    pool = pool or get_default_pool()
+    try:
+        parsed = parse_tei(pool.process_fulltext(pdf_path), pdf_path)
+    except GrobidError as e:
+        parsed = _grobid_failure(pdf_path, e, fallback)
+        if "error" in parsed:
+            return parsed
+    return run_extraction([parsed], selection, vector_index=vector_index, citation_graph=citation_graph,
+                          enricher=enricher, text_index=text_index)[0]
 
 
 def extract_samples(text: str) -> dict:
     lower_text = text.lower()
 
     # Look for patterns with a number followed by participant terms
+    # Bounded repetitions only: linear time even on long runs of OCR whitespace or digits
     patterns = [
-        r"\b(?:n\s*=\s*|N\s*=\s*)(\d+)",                     # n = 30
-        r"\b(\d+)\s+(participants|students|subjects|learners|respondents|teachers)\b",  # 30 participants
-        r"\ba total of (\d+)\s+(participants|students|subjects|respondents)\b",         # a total of 15 students
+        r"\b(?:n\s{0,3}=\s{0,3}|N\s{0,3}=\s{0,3})(\d{1,6})\b",                              # n = 30
+        r"\b(\d{1,6})\s{1,3}(participants|students|subjects|learners|respondents|teachers)\b",  # 30 participants
+        r"\ba total of (\d{1,6})\s{1,3}(participants|students|subjects|respondents)\b",         # a total of 15 students
     ]
 
     matches = []
@@ -317,15 +688,90 @@ def extract_semantic_content(text: str) -> dict:
         "physiological_data": find_keywords(physiological_keywords),
     }
 
-def extract_batch_metadata_with_grobid(folder_path: str) -> list:
-    results = []
-    for filename in os.listdir(folder_path):
-        if filename.lower().endswith(".pdf"):
-            pdf_path = os.path.join(folder_path, filename)
+def collect_pdf_files(folder_path: str, recursive: bool = False, shard=None, shard_by: str = "path",
+                      preflight: bool = False, preflight_limits: dict = None, quarantine_report: str = None) -> list:
+    """PDFs of a folder to extract: this worker's ``shard`` of them, minus those ``preflight`` triage skips."""
+    pdf_files = select_shard(find_pdf_files(folder_path, recursive=recursive), shard, folder_path, shard_by)
+    if preflight:
+        pdf_files, skipped = triage(pdf_files, **(preflight_limits or {}))
+        print(f"🛫 Pre-flight: {len(pdf_files)} PDF(s) to extract, {len(skipped)} skipped")
+        if skipped and quarantine_report:
+            write_report(skipped, quarantine_report)
+            print(f"🚧 Skipped files listed in {quarantine_report}")
+    return pdf_files
+
+
+def extract_pdf_files_with_grobid(pdf_files: list, folder_path: str, pool: GrobidPool = None,
+                                  vector_index: VectorIndex = None, citation_graph: CitationGraph = None,
+                                  fallback: bool = False, nlp_batch: int = 64, nlp_batch_size: int = 16,
+                                  n_process: int = 1, selection: FieldSelection = None, enricher=None,
+                                  text_index: TextIndex = None) -> list:
+    """
+    Extract the given PDFs through GROBID.
+
+    PDFs are fetched and parsed concurrently, then analyzed ``nlp_batch``
+    papers at a time by ``run_extraction``: one length-bucketed ``nlp.pipe``
+    per chunk (``nlp_batch_size`` docs per spaCy batch, ``n_process`` worker
+    processes), only for the ``selection`` columns. Returns one row per PDF,
+    in order, with None for the PDFs that failed.
+    """
+    pool = pool or get_default_pool()
+
+    def fetch(pdf_path):
+        # GROBID and TEI parsing (I/O bound, one thread per pool slot); NLP is left to the batch stage
+        filename = os.path.relpath(pdf_path, folder_path)
+        try:
+            print(f"🔍 Processing {filename}...")
             try:
-                print(f"🔍 Processing {filename}...")
-                data = extract_metadata_with_grobid(pdf_path)
-                results.append(data)
-            except Exception as e:
-                print(f"❌ Failed to process {filename}: {e}")
-    return results
\ No newline at end of file
+                tei = pool.process_fulltext(pdf_path)
+            except GrobidError as e:
+                return _grobid_failure(pdf_path, e, fallback)
+            return parse_tei(tei, pdf_path)
+        except Exception as e:
+            print(f"❌ Failed to process {filename}: {e}")
+            return None
+
+    def finish(fetched):
+        parsed = [(i, item) for i, item in enumerate(fetched) if item is not None and "fulltext" in item]
+        rows = list(fetched)
+        analyzed = run_extraction([item for _, item in parsed], selection, vector_index=vector_index,
+                                  citation_graph=citation_graph, enricher=enricher, batch_size=nlp_batch_size,
+                                  n_process=n_process, text_index=text_index)
+        for (i, _), row in zip(parsed, analyzed):
+            rows[i] = row
+        return rows
+
+    # Keep every endpoint busy (one worker per slot the pool accepts) while spaCy works on the
+    # previous chunk: chunk k+1 is fetched during the NLP stage of chunk k.
+    chunks = [pdf_files[i:i + nlp_batch] for i in range(0, len(pdf_files), nlp_batch)]
+    results = []
+    with ThreadPoolExecutor(max_workers=pool.capacity) as executor:
+        pending = [executor.submit(fetch, path) for path in chunks[0]] if chunks else []
+        for k in range(len(chunks)):
+            fetched = [future.result() for future in pending]
+            pending = [executor.submit(fetch, path) for path in chunks[k + 1]] if k + 1 < len(chunks) else []
+            results.extend(finish(fetched))
+    if pool.hedged:
+        print(f"🏁 {pool.hedged} slow document(s) hedged on a second GROBID endpoint")
+    return results
+
+
+def extract_batch_metadata_with_grobid(folder_path: str, recursive: bool = False, pool: GrobidPool = None,
+                                       shard=None, shard_by: str = "path", vector_index: VectorIndex = None,
+                                       citation_graph: CitationGraph = None, preflight: bool = False,
+                                       preflight_limits: dict = None, quarantine_report: str = None,
+                                       fallback: bool = False, nlp_batch: int = 64, nlp_batch_size: int = 16,
+                                       n_process: int = 1, selection: FieldSelection = None, enricher=None,
+                                       text_index: TextIndex = None) -> list:
+    """
+    Extract every PDF of a folder through GROBID (see ``collect_pdf_files`` and
+    ``extract_pdf_files_with_grobid``). Rows come back in PDF order.
+    """
+    pdf_files = collect_pdf_files(folder_path, recursive=recursive, shard=shard, shard_by=shard_by,
+                                  preflight=preflight, preflight_limits=preflight_limits,
+                                  quarantine_report=quarantine_report)
+    rows = extract_pdf_files_with_grobid(pdf_files, folder_path, pool=pool, vector_index=vector_index,
+                                         citation_graph=citation_graph, fallback=fallback, nlp_batch=nlp_batch,
+                                         nlp_batch_size=nlp_batch_size, n_process=n_process, selection=selection,
+                                         enricher=enricher, text_index=text_index)
+    return [row for row in rows if row is not None]
@@ -0,0 +1,104 @@
+# autoreviewx/core/nlp.py
+from functools import lru_cache
+
+import numpy as np
+import spacy
+
+from autoreviewx.core.shared_vectors import load_model, shared_prefix
+
+# Medium model: has word vectors for similarity scoring
+DEFAULT_MODEL = "en_core_web_md"
+
+
+@lru_cache(maxsize=None)
+def get_nlp(model: str = DEFAULT_MODEL):
+    """
+    Load a spaCy model once per process and share it between modules.
+
+    With ``enable_shared_vectors`` the word vectors are memory-mapped from one
+    exported table instead of being loaded into every process.
+    """
+    prefix = shared_prefix(model)
+    return load_model(model, prefix) if prefix else spacy.load(model)
+
+
+def by_length(texts: list) -> list:
+    """Indices of ``texts`` from shortest to longest: batches of similar lengths for ``nlp.pipe``."""
+    return sorted(range(len(texts)), key=lambda i: len(texts[i]))
+
+
+def pipe_indexed(nlp, texts: list, batch_size: int = 32, n_process: int = 1, disable: list = ()):
+    """
+    ``nlp.pipe`` over length-bucketed batches, yielding ``(index, doc)`` in completion order.
+
+    With ``n_process > 1`` the batches are spread over worker processes; the
+    index maps every doc back to its text.
+    """
+    order = by_length(texts)
+    docs = nlp.pipe(((texts[i], i) for i in order), as_tuples=True, batch_size=batch_size,
+                    n_process=n_process if len(texts) > 1 else 1, disable=list(disable))
+    for doc, i in docs:
+        yield i, doc
+
+
+def tokenize_indexed(nlp, texts: list, batch_size: int = 64, n_process: int = 1):
+    """
+    Tokenizer-only docs of ``texts`` as ``(index, doc)``, in completion order.
+
+    With ``n_process > 1`` length-bucketed batches are tokenized in worker
+    processes; texts over ``nlp.max_length`` (which ``nlp.pipe`` rejects) are
+    always tokenized here.
+    """
+    if n_process <= 1:
+        yield from enumerate(nlp.tokenizer.pipe(texts))
+        return
+    short = [i for i, text in enumerate(texts) if len(text) <= nlp.max_length]
+    for j, doc in pipe_indexed(nlp, [texts[i] for i in short], batch_size=batch_size, n_process=n_process,
+                               disable=nlp.pipe_names):
+        yield short[j], doc
+    long = [i for i, text in enumerate(texts) if len(text) > nlp.max_length]
+    yield from zip(long, nlp.tokenizer.pipe([texts[i] for i in long]))
+
+
+def document_vectors(texts: list, model: str = DEFAULT_MODEL, batch_size: int = 64, n_process: int = 1) -> np.ndarray:
+    """
+    Return one float32 row per text: the mean of its token vectors (spaCy ``Doc.vector``).
+
+    Only the tokenizer runs: static word vectors do not depend on the tagger,
+    parser or NER, so ``doc.similarity`` gives the same result on these docs.
+    ``n_process > 1`` tokenizes length-bucketed batches in worker processes.
+    """
+    nlp = get_nlp(model)
+    width = nlp.vocab.vectors.shape[1]
+    vectors = np.zeros((len(texts), width), dtype=np.float32)
+    for i, doc in tokenize_indexed(nlp, texts, batch_size=batch_size, n_process=n_process):
+        if len(doc):
+            vectors[i] = doc.vector
+    return vectors
+
+
+def bag_of_words_vectors(texts: list, model: str = DEFAULT_MODEL) -> np.ndarray:
+    """
+    Summed word vectors of each text, for bulk work (thousands of abstracts).
+
+    Texts become one sparse word-count matrix that is multiplied by the model's
+    vector table, instead of building a spaCy ``Doc`` per text. Words are split
+    with a regex and punctuation is ignored, so the direction is close to, not
+    identical to, ``Doc.vector``; use ``document_vectors`` where exact parity
+    with ``doc.similarity`` matters.
+    """
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    nlp = get_nlp(model)
+    table = nlp.vocab.vectors
+    result = np.zeros((len(texts), table.shape[1]), dtype=np.float32)
+    counter = CountVectorizer(lowercase=False, token_pattern=r"(?u)\b\w[\w'\-]*\b", dtype=np.float32)
+    try:
+        counts = counter.fit_transform([t or "" for t in texts])
+    except ValueError:  # no words at all
+        return result
+    rows = np.array([table.key2row.get(nlp.vocab.strings[w], -1) for w in counter.get_feature_names_out()])
+    known = rows >= 0
+    if known.any():
+        result[:] = counts[:, known] @ np.asarray(table.data)[rows[known]]
+    return result
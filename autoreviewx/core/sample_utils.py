@@ -7,7 +7,8 @@ def extract_samples(text: str) -> dict:
     Try to extract number of participants or sample size from full text.
     """
     participants = ""
-    matches = re.findall(r"(?:\b[Nn]\s*=?\s*|participants\s*=\s*|sample size\s*[:=]?\s*)(\d{2,5})", text)
+    matches = re.findall(
+        r"(?:\b[Nn]\s{0,3}=?\s{0,3}|participants\s{0,3}=\s{0,3}|sample size\s{0,3}[:=]?\s{0,3})(\d{2,5})", text)
     if matches:
         participants = max(matches, key=len)  # largest number found (heuristic)
 
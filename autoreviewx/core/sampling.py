@@ -0,0 +1,224 @@
+# autoreviewx/core/sampling.py
+import math
+import os
+import re
+
+import fitz  # PyMuPDF
+import numpy as np
+import pandas as pd
+
+from autoreviewx.core.extractor import extract_year_from_text
+from autoreviewx.core.schema import apply_schema
+from autoreviewx.core.scoring import PICO_COMPONENTS, TAPUPAS_DIMENSIONS
+
+STRATIFY_BY = ("folder", "year", "none")
+DEFAULT_BOOTSTRAP = 1000
+ESTIMATE_COLUMNS = ["metric", "statistic", "estimate", "ci_low", "ci_high", "width", "n"]
+
+
+def pdf_year(path: str) -> str:
+    """Publication year guessed without GROBID: PDF creation date, else the first page text ("" if none)."""
+    try:
+        with fitz.open(path) as doc:
+            match = re.match(r"(?:D:)?((?:19|20)\d\d)", doc.metadata.get("creationDate") or "")
+            if match:
+                return match.group(1)
+            return extract_year_from_text(doc[0].get_text()) if doc.page_count else ""
+    except Exception:
+        return ""
+
+
+def stratum_of(path: str, root: str, by: str = "folder") -> str:
+    """Stratum label of a PDF: its folder relative to ``root``, its year, or one stratum for all."""
+    if by == "folder":
+        return os.path.dirname(os.path.relpath(path, root)).replace(os.sep, "/") or "."
+    if by == "year":
+        return pdf_year(path) or "unknown"
+    if by == "none":
+        return "all"
+    raise ValueError(f"stratify must be one of {STRATIFY_BY}")
+
+
+class StratifiedSampler:
+    """
+    Stratified random sample of a corpus, drawn without replacement in rounds.
+
+    Every stratum is shuffled once (``seed``); each ``draw`` takes the next
+    papers of the strata in proportion to their size, at least two per
+    stratum while they last so that every stratum has a variance estimate.
+    """
+
+    def __init__(self, paths: list, strata: list, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.population = {}
+        self._queues = {}
+        for path, stratum in zip(paths, strata):
+            self._queues.setdefault(stratum, []).append(path)
+        for stratum, members in self._queues.items():
+            self.population[stratum] = len(members)
+            self._queues[stratum] = [members[i] for i in rng.permutation(len(members))]
+        self.drawn = {stratum: 0 for stratum in self._queues}
+
+    @property
+    def size(self) -> int:
+        return sum(self.population.values())
+
+    @property
+    def remaining(self) -> int:
+        return self.size - sum(self.drawn.values())
+
+    def draw(self, n: int) -> list:
+        """Next ``(path, stratum)`` pairs, about ``n`` of them (fewer once the corpus is exhausted)."""
+        n = min(n, self.remaining)
+        if n <= 0:
+            return []
+        target = sum(self.drawn.values()) + n
+        # Proportional allocation of the cumulative sample, then top-ups to reach ``target``
+        wanted = {stratum: min(size, max(min(2, size), math.floor(target * size / self.size)))
+                  for stratum, size in self.population.items()}
+        shortfall = target - sum(max(wanted[s], self.drawn[s]) for s in wanted)
+        for stratum in sorted(wanted, key=lambda s: self.population[s] - wanted[s], reverse=True):
+            if shortfall <= 0:
+                break
+            extra = min(shortfall, self.population[stratum] - wanted[stratum])
+            wanted[stratum] += extra
+            shortfall -= extra
+        batch = []
+        for stratum, queue in self._queues.items():
+            take = max(0, wanted[stratum] - self.drawn[stratum])
+            batch += [(path, stratum) for path in queue[self.drawn[stratum]:self.drawn[stratum] + take]]
+            self.drawn[stratum] += take
+        return batch
+
+
+def metric_matrix(rows: pd.DataFrame) -> tuple:
+    """
+    Per-paper values of the corpus statistics plotted by ``generate_graphs``.
+
+    Pass flags (rates), similarity and global scores (means), TAPUPAS
+    dimensions (means on 0-2) and PICO completeness, from typed columns
+    (see ``schema.apply_schema``). Missing values are NaN.
+    Returns ``(matrix, [(metric, statistic), ...])``.
+    """
+    columns, metrics = [], []
+    for column in rows.columns:
+        if column.endswith("_pass"):
+            metrics.append((column, "pass rate"))
+        elif column.endswith("_score") or column.startswith("score_") or column in TAPUPAS_DIMENSIONS:
+            metrics.append((column, "mean"))
+        else:
+            continue
+        columns.append(rows[column].astype("Float64").to_numpy(dtype=float, na_value=np.nan))
+    for component in PICO_COMPONENTS:
+        if component in rows.columns:
+            present = rows[component].astype("string").str.strip().fillna("").ne("")
+            columns.append(present.to_numpy(dtype=float))
+            metrics.append((component, "completeness"))
+    matrix = np.column_stack(columns) if columns else np.empty((len(rows), 0))
+    return matrix, metrics
+
+
+def stratified_bootstrap(values: np.ndarray, strata: list, population: dict, n_boot: int = DEFAULT_BOOTSTRAP,
+                         confidence: float = 0.95, seed: int = 0) -> tuple:
+    """
+    Stratified estimates of column means and their percentile bootstrap intervals.
+
+    Each stratum is resampled on its own (multinomial weights, so memory stays
+    ``n_boot x stratum size``) and weighted by its share of the population;
+    deviations are shrunk by the finite-population correction, so a stratum
+    that was processed entirely contributes no uncertainty. NaN values are
+    left out of their metric. Returns ``(estimate, low, high)`` arrays.
+    """
+    rng = np.random.default_rng(seed)
+    strata = np.asarray(strata)
+    sampled = list(dict.fromkeys(strata.tolist()))
+    total = sum(population[s] for s in sampled)
+    metrics = values.shape[1]
+    est_sum, est_weight = np.zeros(metrics), np.zeros(metrics)
+    boot_sum, boot_weight = np.zeros((n_boot, metrics)), np.zeros((n_boot, metrics))
+
+    for stratum in sampled:
+        block = values[strata == stratum]
+        n = len(block)
+        weight = population[stratum] / total
+        present = ~np.isnan(block)
+        filled = np.where(present, block, 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = filled.sum(axis=0) / present.sum(axis=0)
+            counts = rng.multinomial(n, np.full(n, 1.0 / n), size=n_boot).astype(float)
+            boot = (counts @ filled) / (counts @ present)
+        fpc = math.sqrt(max(0.0, 1.0 - n / population[stratum]))
+        boot = mean + fpc * (boot - mean)
+        known = ~np.isnan(mean)
+        est_sum[known] += weight * mean[known]
+        est_weight[known] += weight
+        boot_known = ~np.isnan(boot)
+        boot_sum[boot_known] += (weight * boot)[boot_known]
+        boot_weight += weight * boot_known
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        estimate = est_sum / est_weight
+        boots = boot_sum / boot_weight
+    alpha = (1.0 - confidence) / 2
+    low, high = np.full(metrics, np.nan), np.full(metrics, np.nan)
+    for j in range(metrics):
+        column = boots[:, j][~np.isnan(boots[:, j])]
+        if len(column):
+            low[j], high[j] = np.quantile(column, [alpha, 1 - alpha])
+    return estimate, low, high
+
+
+def estimate_corpus(rows: pd.DataFrame, strata: list, population: dict, confidence: float = 0.95,
+                    n_boot: int = DEFAULT_BOOTSTRAP, seed: int = 0) -> pd.DataFrame:
+    """Corpus-level estimates with bootstrap intervals from a stratified sample of extraction rows."""
+    values, metrics = metric_matrix(rows)
+    if not metrics or not len(rows):
+        return pd.DataFrame(columns=ESTIMATE_COLUMNS)
+    estimate, low, high = stratified_bootstrap(values, strata, population, n_boot=n_boot, confidence=confidence,
+                                               seed=seed)
+    report = pd.DataFrame({
+        "metric": [metric for metric, _ in metrics],
+        "statistic": [statistic for _, statistic in metrics],
+        "estimate": np.round(estimate, 4),
+        "ci_low": np.round(low, 4),
+        "ci_high": np.round(high, 4),
+        "width": np.round(high - low, 4),
+        "n": (~np.isnan(values)).sum(axis=0),
+    })
+    return report
+
+
+def sample_until(sampler: StratifiedSampler, extract, size: int, target_width: float = None,
+                 confidence: float = 0.95, seed: int = 0) -> tuple:
+    """
+    Extract a stratified sample and estimate the corpus statistics.
+
+    ``extract(paths)`` returns one row (dict, or None when it failed) per path.
+    With ``target_width``, rounds of ``size`` more papers are added until every
+    interval is at most that wide or the corpus is exhausted. Failed papers
+    (None or an ``{"error": ...}`` row) are left out of the sample, so they do
+    not count toward a stratum's ``n``, and are returned apart.
+    Returns ``(rows, strata, report, failures)``, failures as
+    ``{"path", "stratum", "error"}`` dicts.
+    """
+    rows, strata, failures = [], [], []
+    batch = sampler.draw(size)
+    report = pd.DataFrame(columns=ESTIMATE_COLUMNS)
+    while batch:
+        extracted = extract([path for path, _ in batch])
+        for (path, stratum), row in zip(batch, extracted):
+            if row is None or row.get("error"):
+                failures.append({"path": path, "stratum": stratum,
+                                 "error": row["error"] if row is not None else "no result"})
+                continue
+            rows.append(row)
+            strata.append(stratum)
+        report = estimate_corpus(apply_schema(pd.DataFrame(rows)), strata, sampler.population,
+                                 confidence=confidence, seed=seed)
+        widest = report["width"].max() if len(report) else float("nan")
+        failed = f", {len(failures)} failed" if failures else ""
+        print(f"📊 Sample of {len(rows)}/{sampler.size} paper(s){failed}: widest {confidence:.0%} interval {widest:.3f}")
+        if target_width is None or (not np.isnan(widest) and widest <= target_width):
+            break
+        batch = sampler.draw(size)
+    return rows, strata, report, failures
@@ -0,0 +1,203 @@
+# autoreviewx/core/schema.py
+import os
+
+import numpy as np
+import pandas as pd
+
+from autoreviewx.core.frameworks import DEFAULT_FRAMEWORKS_PATH, get_registry
+from autoreviewx.core.scoring import PICO_COMPONENTS
+
+# Column types:
+#   string   : free text
+#   category : low-cardinality text (dictionary-encoded in Parquet/Arrow)
+#   boolean  : nullable bool (pass flags, heuristic rules)
+#   float32  : similarity and global scores
+#   Int8/Int32 : nullable integers (counts)
+METADATA_FIELDS = [
+    ("title", "string"),
+    ("authors", "string"),
+    ("doi", "string"),
+    ("year", "category"),
+    ("journal", "category"),
+    ("keywords", "string"),
+    ("abstract", "string"),
+    ("abstract_length", "Int32"),
+    ("title_source", "category"),
+    ("extraction_source", "category"),
+    ("enrichment_source", "category"),
+    ("stage_timeouts", "string"),
+    ("data_used", "string"),
+    ("models_used", "string"),
+    ("tools_used", "string"),
+    ("target_education_level", "string"),
+    ("countries", "string"),
+    ("methodology", "category"),
+    ("biological_data", "string"),
+    ("physiological_data", "string"),
+    ("participants", "string"),
+    ("participants_count", "Int32"),
+    *[(component, "string") for component in PICO_COMPONENTS],
+    ("score_pico", "float32"),
+    ("references_count", "Int32"),
+]
+TRAILING_FIELDS = [("source_file", "string")]
+
+FORMATS = {".csv": "csv", ".parquet": "parquet", ".feather": "feather", ".arrow": "feather"}
+TRUE_VALUES = {"true", "1", "1.0", "yes"}
+FALSE_VALUES = {"false", "0", "0.0", "no"}
+
+
+def framework_fields(frameworks: dict) -> list:
+    """Columns produced by ``FrameworkRegistry.evaluate`` plus each framework's global score."""
+    fields = []
+    for definition in frameworks.values():
+        rule_type = "Int8" if definition.get("rule_mode", "any") == "count" else "boolean"
+        fields += [(dim, rule_type) for dim in definition.get("rules", {})]
+        for dim in definition.get("semantic", {}):
+            fields += [(f"{dim}_score", "float32"), (f"{dim}_pass", "boolean"), (f"{dim}_tier", "category")]
+        if definition.get("score_column"):
+            fields.append((definition["score_column"], "float32"))
+    return fields
+
+
+def export_schema(path: str = DEFAULT_FRAMEWORKS_PATH) -> dict:
+    """
+    Ordered column -> dtype mapping of an extraction row.
+
+    Framework columns are derived from the registry (``frameworks.yaml`` and
+    registered plugins), so the export always matches what
+    ``extract_metadata_with_grobid`` returns.
+    """
+    return dict(METADATA_FIELDS + framework_fields(get_registry(path).frameworks) + TRAILING_FIELDS)
+
+
+def export_columns(path: str = DEFAULT_FRAMEWORKS_PATH) -> list:
+    return list(export_schema(path))
+
+
+def _to_bool(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_bool_dtype(series):
+        return series.astype("boolean")
+    text = series.astype("string").str.strip().str.lower()
+    result = pd.Series(pd.NA, index=series.index, dtype="boolean")
+    result[text.isin(TRUE_VALUES).fillna(False)] = True
+    result[text.isin(FALSE_VALUES).fillna(False)] = False
+    return result
+
+
+def apply_schema(df: pd.DataFrame, schema: dict = None) -> pd.DataFrame:
+    """Cast known columns to their schema types; empty or unparseable values become missing."""
+    schema = export_schema() if schema is None else schema
+    df = df.copy()
+    for column, dtype in schema.items():
+        if column not in df.columns:
+            continue
+        values = df[column]
+        if pd.api.types.is_float_dtype(values) and dtype in ("string", "category"):
+            # e.g. years read back from CSV as 2021.0 because of missing values
+            values = values.astype("Int64") if (values.dropna() % 1 == 0).all() else values
+        if dtype == "boolean":
+            df[column] = _to_bool(values)
+        elif dtype == "float32":
+            df[column] = pd.to_numeric(values, errors="coerce").astype(np.float32)
+        elif dtype.startswith("Int"):
+            df[column] = pd.to_numeric(values, errors="coerce").round().astype(dtype)
+        elif dtype == "category":
+            df[column] = values.astype("string").replace("", pd.NA).astype("category")
+        else:
+            # Empty strings are missing values, as they are once read back from CSV
+            df[column] = values.astype("string").replace("", pd.NA)
+    return df
+
+
+def to_frame(rows: list, schema: dict = None, extra: bool = True) -> pd.DataFrame:
+    """
+    Typed DataFrame of extraction rows, with every schema column in schema order.
+
+    Keys outside the schema (e.g. ``error``) follow as extra columns unless
+    ``extra`` is False, which keeps the layout fixed for appends.
+    """
+    schema = export_schema() if schema is None else schema
+    columns = list(schema)
+    if extra:
+        known = set(columns)
+        for row in rows:
+            for key in row:
+                if key not in known:
+                    known.add(key)
+                    columns.append(key)
+    return apply_schema(pd.DataFrame(rows, columns=columns), schema)
+
+
+def table_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unsupported table format '{extension}': use one of {sorted(FORMATS)}")
+    return FORMATS[extension]
+
+
+def table_columns(path: str) -> list:
+    """Column names of a table without reading its rows."""
+    fmt = table_format(path)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        return pq.read_schema(path).names
+    if fmt == "feather":
+        import pyarrow.feather as feather
+        return feather.read_table(path, memory_map=True).column_names
+    return pd.read_csv(path, nrows=0).columns.tolist()
+
+
+def write_table(df: pd.DataFrame, path: str, append: bool = False):
+    """
+    Write a table as CSV, Parquet or Arrow/Feather depending on the extension.
+
+    Parquet and Feather keep the column types (Zstandard-compressed, categories
+    dictionary-encoded). Appending is only supported for CSV.
+    """
+    fmt = table_format(path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if fmt == "csv":
+        exists = append and os.path.exists(path)
+        df.to_csv(path, mode="a" if exists else "w", header=not exists, index=False)
+        return
+    if append:
+        raise ValueError(f"Cannot append to {fmt} files: use a .csv output")
+    try:
+        if fmt == "parquet":
+            df.to_parquet(path, index=False, compression="zstd")
+        else:
+            df.reset_index(drop=True).to_feather(path, compression="zstd")
+    except ImportError as e:
+        raise ImportError(f"{fmt} export needs pyarrow: pip install pyarrow ({e})")
+
+
+def read_table(path: str, columns: list = None, schema: dict = None) -> pd.DataFrame:
+    """
+    Load a table written by ``write_table``; only ``columns`` are read when given.
+
+    CSV columns are cast to the schema types so every format loads the same way.
+    """
+    fmt = table_format(path)
+    if fmt == "parquet":
+        return pd.read_parquet(path, columns=columns)
+    if fmt == "feather":
+        return pd.read_feather(path, columns=columns)
+    usecols = (lambda c: c in columns) if columns is not None else None
+    return apply_schema(pd.read_csv(path, usecols=usecols, low_memory=False), schema)
+
+
+def iter_table(path: str, chunksize: int = 2048):
+    """Yield a table in DataFrame chunks without loading it whole (CSV and Parquet)."""
+    fmt = table_format(path)
+    if fmt == "csv":
+        for chunk in pd.read_csv(path, chunksize=chunksize, low_memory=False):
+            yield apply_schema(chunk)
+    elif fmt == "parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        df = read_table(path)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
@@ -0,0 +1,140 @@
+# autoreviewx/core/scoring.py
+import re
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_THRESHOLD = 0.75
+
+TAPUPAS_DIMENSIONS = ["transparency", "accuracy", "purposivity", "utility", "propriety", "accessibility", "specificity"]
+PICO_COMPONENTS = ["population", "intervention", "comparison", "outcome"]
+
+
+def framework_scoring() -> list:
+    """
+    How each framework with a ``score_column`` is scored, from ``frameworks.yaml`` and registered plugins.
+
+    Returns:
+        list: ``(name, score_column, prefixes, threshold, rule_dims)`` per framework. ``prefixes``
+        are the column prefixes of its similarity dimensions (``kitch`` for
+        ``kitch_limitations``), ``threshold`` its YAML pass threshold and
+        ``rule_dims`` its rule dimensions (scored when it has no similarity ones).
+    """
+    from autoreviewx.core.frameworks import get_registry  # frameworks imports this module
+
+    scoring = []
+    for name, definition in get_registry().frameworks.items():
+        if not definition.get("score_column"):
+            continue
+        prefixes = sorted({dim.split("_")[0] for dim in definition.get("semantic", {})})
+        threshold = float(definition.get("threshold", DEFAULT_THRESHOLD))
+        scoring.append((name, definition["score_column"], prefixes, threshold, list(definition.get("rules", {}))))
+    return scoring
+
+
+def semantic_dimensions(columns, prefix: str) -> list:
+    """Return the dimensions (e.g. ``casp_ethics``) that have a stored ``*_score`` column."""
+    pattern = re.compile(rf"^({re.escape(prefix)}_.+)_score$")
+    return [m.group(1) for m in map(pattern.match, columns) if m]
+
+
+def _lookup(mapping: dict, dimension: str, prefix: str, default: float, framework: str = None) -> float:
+    # Most specific key wins: dimension, then column prefix (kitch), then framework name (kitchenham), then default
+    for key in (dimension, prefix, framework):
+        if key in mapping:
+            return float(mapping[key])
+    return float(default)
+
+
+def _weighted_mean(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    total = weights.sum()
+    if total <= 0:
+        return np.full(len(values), np.nan)
+    return (values * weights).sum(axis=1) / total
+
+
+def rescore(df: pd.DataFrame, thresholds: dict = None, weights: dict = None,
+            default_threshold: float = None) -> pd.DataFrame:
+    """
+    Recompute ``*_pass`` flags and global ``score_*`` columns from stored similarity scores.
+
+    Frameworks, their score columns and thresholds come from ``frameworks.yaml``
+    (and registered plugins); explicit thresholds override them.
+
+    Args:
+        df (pd.DataFrame): Extraction output containing raw ``*_score`` columns.
+        thresholds (dict): Pass thresholds keyed by dimension (``casp_ethics``), column prefix (``kitch``)
+            or framework name (``kitchenham``).
+        weights (dict): Weights for the global scores, keyed like ``thresholds``. Defaults to 1.
+        default_threshold (float): Threshold for dimensions without an explicit entry (None: the
+            framework's ``threshold`` in ``frameworks.yaml``).
+
+    Returns:
+        pd.DataFrame: A copy of ``df`` with updated pass flags and global scores.
+    """
+    thresholds = thresholds or {}
+    weights = weights or {}
+    out = df.copy()
+    updates = {}
+
+    for name, score_column, prefixes, threshold, rule_dims in framework_scoring():
+        if default_threshold is not None:
+            threshold = default_threshold
+        dims = [(d, prefix) for prefix in prefixes for d in semantic_dimensions(out.columns, prefix)]
+        if not dims:
+            rule_dims = [d for d in rule_dims if d in out.columns]
+            if rule_dims and name != "tapupas":  # TAPUPAS keeps its own scale (below)
+                # Rules only: weighted share of the rule dimensions found
+                found = out[rule_dims].apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy(dtype=np.float32)
+                rule_weights = np.array([_lookup(weights, d, name, 1.0) for d in rule_dims], dtype=np.float32)
+                updates[score_column] = np.round(_weighted_mean((found > 0).astype(np.float32), rule_weights), 2)
+            continue
+        scores = out[[f"{d}_score" for d, _ in dims]].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float32)
+        limits = np.array([_lookup(thresholds, d, prefix, threshold, name) for d, prefix in dims], dtype=np.float32)
+        dim_weights = np.array([_lookup(weights, d, prefix, 1.0, name) for d, prefix in dims], dtype=np.float32)
+
+        # NaN scores never pass (NaN >= x is False)
+        passed = scores >= limits
+        for j, (dim, _) in enumerate(dims):
+            updates[f"{dim}_pass"] = passed[:, j]
+
+        global_score = _weighted_mean(passed.astype(np.float32), dim_weights)
+        global_score[np.isnan(scores).all(axis=1)] = np.nan
+        updates[score_column] = np.round(global_score, 2)
+
+    tap_dims = [d for d in TAPUPAS_DIMENSIONS if d in out.columns]
+    if tap_dims:
+        values = out[tap_dims].apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy(dtype=np.float32)
+        tap_weights = np.array([_lookup(weights, d, "tapupas", 1.0) for d in tap_dims], dtype=np.float32)
+        # Same scale as the original formula: sum / (2 * n_dimensions)
+        updates["score_tapupas"] = np.round(_weighted_mean(values, tap_weights) / 2, 2)
+
+    pico_dims = [d for d in PICO_COMPONENTS if d in out.columns]
+    if pico_dims:
+        present = out[pico_dims].fillna("").astype(str).apply(lambda col: col.str.strip() != "").to_numpy()
+        pico_weights = np.array([_lookup(weights, d, "pico", 1.0) for d in pico_dims], dtype=np.float32)
+        updates["score_pico"] = np.round(_weighted_mean(present.astype(np.float32), pico_weights), 2)
+
+    for column, values in updates.items():
+        out[column] = values
+    return out
+
+
+def global_scores(metadata: dict, thresholds: dict = None, weights: dict = None) -> dict:
+    """Compute the global ``score_*`` values for a single extracted record."""
+    scored = rescore(pd.DataFrame([metadata]), thresholds=thresholds, weights=weights)
+    score_columns = [score_column for _, score_column, _, _, _ in framework_scoring()]
+    columns = [c for c in dict.fromkeys(score_columns + ["score_tapupas", "score_pico"]) if c in scored]
+    row = scored.iloc[0]
+    return {c: (None if pd.isna(row[c]) else float(row[c])) for c in columns}
+
+
+def parse_key_values(items: list) -> dict:
+    """Parse ``KEY=VALUE`` CLI arguments into a ``{key: float}`` mapping."""
+    parsed = {}
+    for item in items or []:
+        if "=" not in item:
+            raise ValueError(f"Expected KEY=VALUE, got: {item}")
+        key, value = item.split("=", 1)
+        parsed[key.strip()] = float(value)
+    return parsed
@@ -0,0 +1,168 @@
+# autoreviewx/core/screening.py
+import numpy as np
+import pandas as pd
+
+from autoreviewx.core.frameworks import get_registry
+from autoreviewx.core.nlp import DEFAULT_MODEL, bag_of_words_vectors
+from autoreviewx.core.schema import framework_fields
+from autoreviewx.core.scoring import PICO_COMPONENTS
+
+# Config lists used as extra inclusion signals: a paper should match at least one item of each
+TOPIC_GROUPS = ["tools_of_interest", "modalities", "learning_outcomes"]
+SCREEN_TEXT_COLUMNS = ["title", "abstract", "keywords"]
+SCREEN_COLUMNS = ["screen_include", "screen_exclude", "screen_score", "screen_suggestion",
+                  "screen_best_inclusion", "screen_best_exclusion"]
+
+
+def screening_criteria(config: dict) -> list:
+    """``(group, text)`` pairs for every criterion of the review protocol."""
+    criteria = []
+    for group in ["inclusion_criteria", "exclusion_criteria"] + TOPIC_GROUPS:
+        for text in config.get(group) or []:
+            if isinstance(text, str) and text.strip():
+                criteria.append((group, text.strip()))
+    return criteria
+
+
+def screening_text(record: dict) -> str:
+    return " ".join(str(record[c]) for c in SCREEN_TEXT_COLUMNS if isinstance(record.get(c), str))
+
+
+def _normalized(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def embed_texts(texts: list, model: str = DEFAULT_MODEL, batch_size: int = 5000) -> np.ndarray:
+    """L2-normalized document vectors, computed batch by batch."""
+    rows = [_normalized(bag_of_words_vectors(texts[i:i + batch_size], model=model))
+            for i in range(0, len(texts), batch_size)]
+    return np.vstack(rows) if rows else np.zeros((0, 0), dtype=np.float32)
+
+
+def paper_vectors(df: pd.DataFrame, model: str = DEFAULT_MODEL, batch_size: int = 5000) -> np.ndarray:
+    """Normalized vectors of the screening text of every row (reusable across configs)."""
+    return embed_texts([screening_text(r) for r in df.to_dict("records")], model=model, batch_size=batch_size)
+
+
+def screen(df: pd.DataFrame, config: dict, model: str = DEFAULT_MODEL, batch_size: int = 5000,
+           margin: float = 0.5, vectors: np.ndarray = None) -> pd.DataFrame:
+    """
+    Rank papers against the protocol criteria.
+
+    Criteria are embedded once and all papers in batches; a single matrix
+    product gives the (papers x criteria) cosine similarities. Raw word-vector
+    similarities are all high, so each criterion column is standardized over the
+    corpus (z-score): a paper is judged on how much more it matches a criterion
+    than the rest of the export does.
+
+    ``screen_include`` averages the inclusion criteria and the best item of each
+    topic group, ``screen_exclude`` is the best exclusion criterion. Their
+    difference ``screen_score`` orders the output; beyond ``±margin`` the paper
+    is suggested for inclusion or exclusion, otherwise for manual review.
+    ``vectors`` (from ``paper_vectors``, aligned with ``df``) skips embedding
+    the papers again.
+
+    Returns:
+        pd.DataFrame: ``df`` with the screening columns, best candidates first.
+    """
+    criteria = screening_criteria(config)
+    if not any(group == "inclusion_criteria" for group, _ in criteria):
+        raise ValueError("The config has no inclusion_criteria to screen against")
+    if df.empty:
+        return df.assign(**{column: [] for column in SCREEN_COLUMNS})
+    groups = np.array([group for group, _ in criteria])
+
+    criteria_vectors = embed_texts([text for _, text in criteria], model=model, batch_size=batch_size)
+    if vectors is None:
+        vectors = paper_vectors(df, model=model, batch_size=batch_size)
+    similarities = vectors @ criteria_vectors.T
+
+    std = similarities.std(axis=0)
+    z = (similarities - similarities.mean(axis=0)) / np.where(std == 0, 1, std)
+
+    include_parts = [z[:, groups == "inclusion_criteria"].mean(axis=1)]
+    include_parts += [z[:, groups == g].max(axis=1) for g in TOPIC_GROUPS if (groups == g).any()]
+    include = np.mean(include_parts, axis=0)
+    if (groups == "exclusion_criteria").any():
+        exclude = z[:, groups == "exclusion_criteria"].max(axis=1)
+    else:
+        exclude = np.zeros(len(df))
+    score = include - exclude
+
+    result = df.copy()
+    result["screen_include"] = include.round(3)
+    result["screen_exclude"] = exclude.round(3)
+    result["screen_score"] = score.round(3)
+    result["screen_suggestion"] = np.select([score >= margin, score <= -margin], ["include", "exclude"], "review")
+    texts = np.array([text for _, text in criteria], dtype=object)
+    for group, column in [("inclusion_criteria", "screen_best_inclusion"),
+                          ("exclusion_criteria", "screen_best_exclusion")]:
+        mask = groups == group
+        if mask.any():
+            result[column] = texts[mask][z[:, mask].argmax(axis=1)]
+    return result.sort_values("screen_score", ascending=False, kind="stable")
+
+
+def matched_exclusion(record: dict, config: dict) -> str:
+    """Exclusion criterion of ``config`` quoted verbatim in the record's title or abstract ("" if none)."""
+    text = " ".join(str(record.get(c) or "") for c in ("abstract", "title")).lower()
+    for criterion in config.get("exclusion_criteria") or []:
+        if isinstance(criterion, str) and criterion.strip() and criterion.lower() in text:
+            return criterion
+    return ""
+
+
+def framework_columns(name: str) -> list:
+    """
+    Export columns of the review framework a config names (``framework: PICO``, ``TAPUPAS``, ``CASP``...).
+
+    Raises:
+        ValueError: If ``name`` is neither PICO nor a framework of ``frameworks.yaml``.
+    """
+    key = name.strip().lower()
+    if key == "pico":
+        return [*PICO_COMPONENTS, "score_pico"]
+    frameworks = get_registry().frameworks
+    if key not in frameworks:
+        raise ValueError(f"Unknown review framework '{name}' (use PICO or one of: {', '.join(frameworks)})")
+    return [column for column, _ in framework_fields({key: frameworks[key]})]
+
+
+def protocol_view(df: pd.DataFrame, config: dict) -> pd.DataFrame:
+    """``df`` without the framework columns of the frameworks ``config`` does not use (all of them without one)."""
+    if not config.get("framework"):
+        return df
+    own = set(framework_columns(config["framework"]))
+    others = set(framework_columns("pico"))
+    for name in get_registry().frameworks:
+        others.update(framework_columns(name))
+    return df[[column for column in df.columns if column in own or column not in others]]
+
+
+def apply_protocols(df: pd.DataFrame, configs: list, screen_papers: bool = False, model: str = DEFAULT_MODEL,
+                    batch_size: int = 5000, margin: float = 0.5, views: bool = False) -> list:
+    """
+    One table per review protocol from papers extracted once.
+
+    Each config drops the papers matching one of its exclusion criteria
+    (``matched_exclusion``); with ``screen_papers`` the others are ranked
+    against its criteria (``screen``). With ``views``, each table keeps the
+    columns and scores of the config's ``framework`` only (``protocol_view``);
+    otherwise every column is kept. Paper vectors are computed once and
+    shared by every config, so N protocols cost one embedding pass.
+
+    Returns:
+        list: ``(table, excluded rows)`` per config, in order.
+    """
+    records = df.to_dict("records")
+    vectors = paper_vectors(df, model=model, batch_size=batch_size) if screen_papers and len(df) else None
+    tables = []
+    for config in configs:
+        excluded = np.array([bool(matched_exclusion(record, config)) for record in records], dtype=bool)
+        kept = df[~excluded] if len(df) else df
+        if screen_papers:
+            kept = screen(kept, config, model=model, batch_size=batch_size, margin=margin,
+                          vectors=vectors[~excluded] if vectors is not None else None)
+        tables.append((protocol_view(kept, config) if views else kept, df[excluded] if len(df) else df))
+    return tables
@@ -0,0 +1,116 @@
+# autoreviewx/core/sections.py
+import re
+
+# Section type -> words of the <head> that identify it. Checked in this order, so
+# "Experimental results" is results and "Discussion and limitations" limitations.
+SECTION_HEADS = {
+    "limitations": ["limitation", "threats to validity", "threat to validity"],
+    "ethics": ["ethic", "informed consent", "irb", "institutional review"],
+    "introduction": ["introduction", "background", "related work", "literature review", "motivation",
+                     "theoretical framework"],
+    "results": ["result", "finding", "evaluation", "outcome"],
+    "discussion": ["discussion", "implication", "future work", "lessons learned"],
+    "conclusion": ["conclusion", "concluding", "summary"],
+    "methods": ["method", "materials", "study design", "research design", "experiment", "participant",
+                "procedure", "data collection", "data analysis", "search strategy", "protocol", "setting",
+                "sample", "instrument", "measures"],
+}
+SECTION_TYPES = ["abstract", "introduction", "methods", "results", "discussion", "limitations", "ethics",
+                 "conclusion"]
+
+_NUMBERING = re.compile(r"^\s*(?:[IVXLC]+|\d+(?:\.\d+)*|[A-Z])[.)]?\s+")
+
+
+def classify_head(head: str):
+    """Section type of a heading ("3.1 Participants" -> "methods"), or None if unknown."""
+    text = _NUMBERING.sub("", head or "").strip().lower()
+    if not text:
+        return None
+    for section, words in SECTION_HEADS.items():
+        if any(word in text for word in words):
+            return section
+    return None
+
+
+def split_sections(soup) -> dict:
+    """
+    Text of a GROBID TEI document per section type.
+
+    Every ``<div>`` of ``<body>`` (and of ``<back>``, where GROBID puts ethics and
+    availability statements) is typed from its ``<head>``; divs with an unknown or
+    missing head continue the previous section, so sub-sections such as
+    "3.2 Apparatus" stay in methods. Text before the first recognized head is
+    left out. Returns section type -> text, only for sections found.
+    """
+    sections = {}
+    abstract = soup.find("abstract")
+    if abstract is not None:
+        sections["abstract"] = [abstract.get_text(separator=" ")]
+
+    for part in ("body", "back"):
+        node = soup.find(part)
+        if node is None:
+            continue
+        current = None
+        for div in node.find_all("div", recursive=True):
+            if div.find("div") is not None:
+                continue  # containers: their leaf divs are visited
+            head = div.find("head")
+            section = classify_head(head.get_text()) if head is not None else None
+            if part == "back":
+                current = section  # back matter: only explicitly headed statements
+            elif section is not None:
+                current = section
+            if current is None:
+                continue
+            sections.setdefault(current, []).append(div.get_text(separator=" "))
+    return {section: " ".join(texts) for section, texts in sections.items()}
+
+
+# Headings after which a PDF text layer holds no more body text
+END_HEADS = ("references", "bibliography", "acknowledgement", "acknowledgment", "appendix")
+# Heading line of a text layer: optionally numbered, capitalized, short and without a final period
+_TEXT_HEAD = re.compile(r"^(?:(?:[IVXLC]+|\d+(?:\.\d+)*|[A-Z])[.)]?\s+)?[A-Z][^.!?]{2,60}$")
+# "2 Methods", "3.1 Participants", "IV. Results", "B) Ethics" (not "A laptop was used")
+_NUMBERED_HEAD = re.compile(r"^(?:\d+(?:\.\d+)*\.?|[IVXLC]+\.|[A-Z][.)])\s+[A-Z]")
+MAX_HEAD_WORDS = 6
+
+
+def split_text_sections(text: str) -> dict:
+    """
+    Text of a PDF text layer (PyMuPDF) per section type, for papers without TEI.
+
+    A heading is a short capitalized line that is numbered ("2 Methods") or
+    stands alone between blank lines (its own text block, see
+    ``extract_text_from_pdf(blocks=True)``); body text wrapped into short
+    lines never is. Headings that ``classify_head`` recognizes start a
+    section; every other line, unknown headings included, continues the
+    current one, as in ``split_sections``. A line starting with "Abstract"
+    starts the abstract, and references, acknowledgements and appendices end
+    the body. Returns section type -> text, only for sections found.
+    """
+    sections = {}
+    current = None
+    lines = (text or "").splitlines()
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if not stripped:
+            continue
+        standalone = (i == 0 or not lines[i - 1].strip()) and (i + 1 == len(lines) or not lines[i + 1].strip())
+        words = len(stripped.split())
+        heading = ((standalone or _NUMBERED_HEAD.match(stripped)) and words <= MAX_HEAD_WORDS
+                   and _TEXT_HEAD.match(stripped))
+        lowered = _NUMBERING.sub("", stripped).lower()
+        if current is None and lowered.startswith("abstract") and "abstract" not in sections:
+            current = "abstract"
+            stripped = stripped[len("abstract"):].lstrip(" .:—-")
+        elif lowered.startswith(END_HEADS) and (heading or words <= 2):
+            break
+        elif heading:
+            section = classify_head(stripped)
+            if section is not None:
+                current = section
+                continue
+        if current is not None and stripped:
+            sections.setdefault(current, []).append(stripped)
+    return {section: " ".join(lines) for section, lines in sections.items()}
@@ -0,0 +1,153 @@
+# autoreviewx/core/sharding.py
+import hashlib
+import os
+import re
+
+import pandas as pd
+
+from autoreviewx.core.schema import iter_table, table_columns, table_format, write_table
+
+SHARD_BY = ("path", "content")
+
+
+def parse_shard(spec: str) -> tuple:
+    """
+    Parse an ``i/N`` shard spec (0-based index).
+
+    Raises:
+        ValueError: If the spec is malformed or out of range.
+    """
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", spec or "")
+    if not match:
+        raise ValueError(f"Invalid shard '{spec}': expected i/N, e.g. 0/4")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1:
+        raise ValueError(f"Invalid shard '{spec}': N must be at least 1")
+    if not 0 <= index < count:
+        raise ValueError(f"Invalid shard '{spec}': index must be in [0, {count - 1}]")
+    return index, count
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def document_key(path: str) -> str:
+    """Index key of a PDF: its content hash, so same-named files in different folders stay apart."""
+    return "sha1:" + file_digest(path)
+
+
+def shard_key(path: str, root: str, by: str = "path") -> str:
+    """
+    Stable key used to place a file on a shard.
+
+    ``path`` uses the POSIX path relative to the batch folder, so every machine
+    with the same layout agrees; ``content`` hashes the file bytes, so a file
+    keeps its shard even if it is renamed or moved.
+    """
+    if by == "content":
+        return file_digest(path)
+    if by == "path":
+        return os.path.relpath(path, root).replace(os.sep, "/")
+    raise ValueError(f"shard_by must be one of {SHARD_BY}")
+
+
+def shard_of(key: str, count: int) -> int:
+    digest = hashlib.sha1(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+
+def select_shard(paths: list, shard, root: str, by: str = "path") -> list:
+    """Keep the paths that belong to ``shard`` (an ``i/N`` string or ``(i, N)`` tuple)."""
+    if shard is None:
+        return list(paths)
+    index, count = parse_shard(shard) if isinstance(shard, str) else shard
+    return [p for p in paths if shard_of(shard_key(p, root, by), count) == index]
+
+
+def shard_suffix(shard) -> str:
+    """File-name suffix for a shard output, e.g. ``_shard0of4``."""
+    if shard is None:
+        return ""
+    index, count = parse_shard(shard) if isinstance(shard, str) else shard
+    return f"_shard{index}of{count}"
+
+
+def _text(value) -> str:
+    # Typed (Parquet/Feather) shards hold missing values as NaN/<NA>
+    return "" if value is None or value is pd.NA or (isinstance(value, float) and value != value) else str(value)
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", (text or "").lower()).strip()
+
+
+def record_key(row: dict) -> str:
+    """Deduplication key: DOI, else normalized title, else source file."""
+    doi = _text(row.get("doi")).strip().lower()
+    doi = re.sub(r"^(https?://(dx\.)?doi\.org/|doi:)", "", doi)
+    if doi:
+        return f"doi:{doi}"
+    title = _normalize(_text(row.get("title")))
+    if title and title != "unknown title":
+        return f"title:{title}"
+    return f"file:{_text(row.get('source_file'))}"
+
+
+def merged_columns(inputs: list, preferred: list = None) -> list:
+    """Union of the input headers: ``preferred`` columns first, then others in order of appearance."""
+    columns = list(preferred or [])
+    seen = set(columns)
+    for path in inputs:
+        for name in table_columns(path):
+            if name not in seen:
+                seen.add(name)
+                columns.append(name)
+    return columns
+
+
+def merge_results(inputs: list, output_path: str, preferred_columns: list = None) -> dict:
+    """
+    Stream shard outputs (CSV, Parquet or Feather) into one deduplicated table.
+
+    Shards are read chunk by chunk (``iter_table``); only a 16-byte digest per
+    unique record is kept in memory. The first occurrence of a record wins and
+    rows that only carry an ``error`` are dropped. The output format follows
+    the ``output_path`` extension: a CSV is appended chunk by chunk, Parquet
+    and Feather are written once from the kept rows.
+
+    Returns:
+        dict: ``{"rows": written, "duplicates": skipped}``
+    """
+    streamed = table_format(output_path) == "csv"
+    columns = merged_columns(inputs, preferred_columns)
+    seen = set()
+    kept = []
+    written = duplicates = 0
+    if streamed:
+        write_table(pd.DataFrame(columns=columns), output_path)
+    for path in inputs:
+        for chunk in iter_table(path):
+            keep = []
+            for row in chunk.to_dict("records"):
+                if _text(row.get("error")):
+                    keep.append(False)
+                    continue
+                digest = hashlib.md5(record_key(row).encode("utf-8")).digest()
+                keep.append(digest not in seen)
+                if digest in seen:
+                    duplicates += 1
+                seen.add(digest)
+            rows = chunk[keep].reindex(columns=columns)
+            written += len(rows)
+            if streamed:
+                write_table(rows, output_path, append=True)
+            else:
+                kept.append(rows)
+    if not streamed:
+        write_table(pd.concat(kept, ignore_index=True) if kept else pd.DataFrame(columns=columns), output_path)
+    return {"rows": written, "duplicates": duplicates}
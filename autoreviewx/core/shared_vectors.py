@@ -0,0 +1,139 @@
+# autoreviewx/core/shared_vectors.py
+import hashlib
+import json
+import os
+
+import numpy as np
+import spacy
+from spacy.vectors import Vectors
+
+DEFAULT_SHARED_DIR = "data/cache/vectors"
+# JSON {model: prefix} of the exported tables; inherited by worker processes, whatever the start method
+SHARED_VECTORS_ENV = "AUTOREVIEWX_SHARED_VECTORS"
+DTYPES = ("float32", "float16")
+
+
+def table_prefix(model: str, directory: str = DEFAULT_SHARED_DIR, dtype: str = "float32") -> str:
+    """``<directory>/<model>-<version>-<dtype>``: a new model version or dtype gets its own files."""
+    version = spacy.util.get_package_version(model) or "local"
+    name = os.path.basename(os.path.normpath(model))
+    return os.path.join(directory, f"{name}-{version}-{dtype}")
+
+
+def _save(path: str, array: np.ndarray):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+
+def load_vectors_only(model: str):
+    """``spacy.load`` of the tokenizer, vocabulary and vectors of ``model``: its components are not built."""
+    path = model if os.path.isdir(model) else spacy.util.get_package_path(model)
+    meta = spacy.util.get_model_meta(path)
+    return spacy.load(model, exclude=meta.get("components") or meta.get("pipeline") or [])
+
+
+def export_vectors(model: str, directory: str = DEFAULT_SHARED_DIR, dtype: str = "float32") -> str:
+    """
+    Write the word vectors of ``model`` as ``.npy`` files (once) and return their prefix.
+
+    ``<prefix>.data.npy`` holds the vector rows, ``<prefix>.keys.npy`` the
+    (key, row) pairs: several keys may share a row in pruned tables.
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f"Unsupported vector dtype '{dtype}': use one of {list(DTYPES)}")
+    prefix = table_prefix(model, directory, dtype)
+    if os.path.exists(f"{prefix}.data.npy"):
+        return prefix
+
+    table = load_vectors_only(model).vocab.vectors
+    if table.mode != "default":
+        raise ValueError(f"{model} has {table.mode} vectors, only default vector tables can be shared")
+    if not table.shape[0]:
+        raise ValueError(f"{model} has no word vectors")
+    pairs = np.array(list(table.key2row.items()), dtype=np.uint64).reshape(-1, 2)
+    os.makedirs(directory, exist_ok=True)
+    _save(f"{prefix}.keys.npy", pairs)
+    # Written last: its presence marks a complete export
+    _save(f"{prefix}.data.npy", np.asarray(table.data).astype(dtype))
+    return prefix
+
+
+def load_shared_vectors(vocab, prefix: str) -> Vectors:
+    """
+    Vector table of an export, memory-mapped read-only.
+
+    The rows stay in the page cache and are shared by every process mapping
+    the same file; only the key -> row lookup is built per process.
+    """
+    table = Vectors(strings=vocab.strings, data=np.load(f"{prefix}.data.npy", mmap_mode="r"))
+    for key, row in np.load(f"{prefix}.keys.npy"):
+        table.add(int(key), row=int(row))
+    return table
+
+
+def shared_prefix(model: str):
+    """Prefix of the shared table enabled for ``model`` in this process tree, or None."""
+    return json.loads(os.environ.get(SHARED_VECTORS_ENV) or "{}").get(model)
+
+
+def static_vector_pipes(nlp) -> list:
+    """
+    Components that read the vector table (``StaticVectors`` layers) or listen to one that does.
+
+    ``StaticVectors`` multiplies the table with BLIS, which only takes float32.
+    """
+    readers = [name for name, pipe in nlp.pipeline
+               if hasattr(pipe, "model") and any(node.name == "static_vectors" for node in pipe.model.walk())]
+    listeners = [name for name, pipe in nlp.pipeline if readers and name not in readers and hasattr(pipe, "model")
+                 and any(node.name == "tok2vec-listener" for node in pipe.model.walk())]
+    return readers + listeners
+
+
+def load_model(model: str, prefix: str):
+    """
+    ``spacy.load`` without the model's own vector table, using the shared one instead.
+
+    A float16 table only serves tokenizer-based vectorization: the components
+    of ``static_vector_pipes`` are disabled, as they cannot run on it.
+    """
+    nlp = spacy.load(model, exclude=["vectors"])
+    nlp.vocab.vectors = load_shared_vectors(nlp.vocab, prefix)
+    if nlp.vocab.vectors.data.dtype != np.float32:
+        for name in static_vector_pipes(nlp):
+            nlp.disable_pipe(name)
+    return nlp
+
+
+def enable_shared_vectors(model: str, directory: str = DEFAULT_SHARED_DIR, dtype: str = "float32") -> str:
+    """
+    Export the vectors of ``model`` if needed and make ``get_nlp`` map them, here and in child processes.
+
+    Call before models are loaded or worker pools started. Returns the table prefix.
+    """
+    from autoreviewx.core.nlp import get_nlp
+
+    prefix = export_vectors(model, directory, dtype)
+    enabled = json.loads(os.environ.get(SHARED_VECTORS_ENV) or "{}")
+    enabled[model] = prefix
+    os.environ[SHARED_VECTORS_ENV] = json.dumps(enabled)
+    get_nlp.cache_clear()
+    return prefix
+
+
+def shared_phrase_matrix(phrases: list, model: str, build) -> np.ndarray:
+    """
+    Target-phrase matrix stored next to the shared table and memory-mapped.
+
+    ``build()`` computes it the first time; other processes map the same file.
+    Without shared vectors for ``model`` this is just ``build()``.
+    """
+    prefix = shared_prefix(model)
+    if prefix is None:
+        return build()
+    digest = hashlib.sha1("\n".join(phrases).encode("utf-8")).hexdigest()[:16]
+    path = f"{prefix}.phrases-{digest}.npy"
+    if not os.path.exists(path):
+        _save(path, np.ascontiguousarray(build(), dtype=np.float32))
+    return np.load(path, mmap_mode="r")
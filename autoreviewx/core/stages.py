@@ -0,0 +1,90 @@
+# autoreviewx/core/stages.py
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class Stage:
+    """
+    One step of a pipeline.
+
+    ``func`` is called with the values named in ``inputs`` (positionally) and
+    returns the value of ``name``. ``io`` stages (network, disk) run on a
+    thread pool alongside the others; CPU stages run on the calling thread,
+    where their time budgets can interrupt them (see ``budget.time_limit``).
+    """
+
+    def __init__(self, name: str, func, inputs: tuple = (), io: bool = False):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.io = io
+
+    def __repr__(self):
+        return f"Stage({self.name} <- {', '.join(self.inputs) or '-'})"
+
+
+class StageGraph:
+    """Dependency graph of stages; ``run`` computes only what the requested values need."""
+
+    def __init__(self, stages: list):
+        self.stages = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Stage '{stage.name}' is declared twice")
+            self.stages[stage.name] = stage
+
+    def plan(self, targets, available=()) -> list:
+        """Stages needed for ``targets`` given the ``available`` values, dependencies first."""
+        available = set(available)
+        order, visiting = [], set()
+
+        def visit(name):
+            if name in available or any(stage.name == name for stage in order):
+                return
+            if name not in self.stages:
+                raise KeyError(f"No stage produces '{name}'")
+            if name in visiting:
+                raise ValueError(f"Stage '{name}' depends on itself")
+            visiting.add(name)
+            for dependency in self.stages[name].inputs:
+                visit(dependency)
+            visiting.discard(name)
+            order.append(self.stages[name])
+
+        for target in targets:
+            visit(target)
+        return order
+
+    def run(self, values: dict, targets, max_workers: int = 4) -> dict:
+        """
+        Run the stages needed for ``targets`` starting from ``values``; returns every value computed.
+
+        A stage starts as soon as its inputs exist: ``io`` stages are submitted
+        to a thread pool and overlap with the CPU stages, which run here in
+        plan order.
+        """
+        values = dict(values)
+        pending = self.plan(targets, values)
+        if not pending:
+            return values
+        executor = ThreadPoolExecutor(max_workers=max_workers) if any(stage.io for stage in pending) else None
+        running = {}
+        try:
+            while pending or running:
+                ready = [stage for stage in pending if all(name in values for name in stage.inputs)]
+                for stage in ready:
+                    if stage.io:
+                        pending.remove(stage)
+                        running[executor.submit(stage.func, *[values[name] for name in stage.inputs])] = stage
+                local = [stage for stage in ready if not stage.io]
+                if local:
+                    stage = local[0]
+                    pending.remove(stage)
+                    values[stage.name] = stage.func(*[values[name] for name in stage.inputs])
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    values[running.pop(future).name] = future.result()
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+        return values
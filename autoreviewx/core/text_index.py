@@ -0,0 +1,163 @@
+# autoreviewx/core/text_index.py
+import os
+import re
+import sqlite3
+import threading
+
+DEFAULT_TEXT_INDEX = "data/index/fulltext.sqlite"
+TEXT_FIELDS = ("title", "abstract", "body")
+# BM25 weight of a match per field: a term in the title says more than one in the body
+FIELD_WEIGHTS = {"title": 3.0, "abstract": 2.0, "body": 1.0}
+SNIPPET_TOKENS = 12
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def phrase_query(text: str) -> str:
+    """FTS5 phrase matching the words of ``text`` in order ("" when it has none)."""
+    words = _WORD.findall(text or "")
+    return '"' + " ".join(words) + '"' if words else ""
+
+
+def terms_query(text: str) -> str:
+    """FTS5 query matching every word of ``text``, in any order and place ("" when it has none)."""
+    return " ".join(f'"{word}"' for word in _WORD.findall(text or ""))
+
+
+class TextIndex:
+    """
+    On-disk inverted index of the corpus text (SQLite FTS5).
+
+    Title, abstract and body are indexed with term positions (porter stemming,
+    Unicode folding), so queries combine BM25 ranking, ``"phrases"``,
+    ``NEAR``, ``AND/OR/NOT`` and field filters (``title: chatbot``) in the
+    FTS5 query syntax. Papers are keyed by ``key`` (the PDF content hash
+    during extraction, see ``document_key``; ``source_file`` when absent):
+    indexing a paper again replaces it. Writes are serialized, so extraction threads can share
+    one index.
+    """
+
+    def __init__(self, path: str = DEFAULT_TEXT_INDEX):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        # Worker processes of a local batch write to the same file: wait for each other's commits
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=60)
+        try:
+            self._conn.executescript(
+                "CREATE TABLE IF NOT EXISTS papers (id INTEGER PRIMARY KEY, key TEXT NOT NULL UNIQUE, "
+                "source_file TEXT NOT NULL, doi TEXT, title TEXT);"
+                "CREATE INDEX IF NOT EXISTS papers_doi ON papers (lower(doi));"
+                "CREATE INDEX IF NOT EXISTS papers_file ON papers (source_file);"
+                "CREATE VIRTUAL TABLE IF NOT EXISTS text USING fts5(title, abstract, body, "
+                "tokenize = 'porter unicode61 remove_diacritics 2');")
+        except sqlite3.OperationalError as e:
+            raise RuntimeError(f"SQLite without FTS5 support cannot hold a text index ({e})") from None
+        if "key" not in {column[1] for column in self._conn.execute("PRAGMA table_info(papers)")}:
+            raise RuntimeError(f"Text index {path} keys papers by file name only: delete it and extract again")
+
+    def add_many(self, papers: list):
+        """
+        Index papers (dicts with ``source_file``, ``title``, ``abstract``, ``body``,
+        ``doi`` and optionally ``key``) in one commit.
+        """
+        with self._lock, self._conn:
+            for paper in papers:
+                key = paper.get("key") or paper["source_file"]
+                row = self._conn.execute("SELECT id FROM papers WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._conn.execute("DELETE FROM text WHERE rowid = ?", row)
+                    self._conn.execute("UPDATE papers SET source_file = ?, doi = ?, title = ? WHERE id = ?",
+                                       (paper["source_file"], paper.get("doi") or "", paper.get("title") or "",
+                                        row[0]))
+                    paper_id = row[0]
+                else:
+                    paper_id = self._conn.execute(
+                        "INSERT INTO papers (key, source_file, doi, title) VALUES (?, ?, ?, ?)",
+                        (key, paper["source_file"], paper.get("doi") or "", paper.get("title") or "")).lastrowid
+                self._conn.execute("INSERT INTO text (rowid, title, abstract, body) VALUES (?, ?, ?, ?)",
+                                   (paper_id, *[paper.get(field) or "" for field in TEXT_FIELDS]))
+
+    def add(self, source_file: str, title: str = "", abstract: str = "", body: str = "", doi: str = ""):
+        self.add_many([{"source_file": source_file, "title": title, "abstract": abstract, "body": body,
+                        "doi": doi}])
+
+    @staticmethod
+    def _scoped(query: str, fields) -> str:
+        if not fields or set(fields) == set(TEXT_FIELDS):
+            return query
+        unknown = set(fields) - set(TEXT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))} (use {', '.join(TEXT_FIELDS)})")
+        return "{" + " ".join(fields) + "} : (" + query + ")"
+
+    def search(self, query: str, k: int = 10, fields=None) -> list:
+        """
+        Best ``k`` papers for an FTS5 ``query`` (restricted to ``fields``), by BM25.
+
+        Returns:
+            list: Dicts with ``source_file``, ``doi``, ``title``, ``score`` (higher is
+            better) and a ``snippet`` around the matches.
+
+        Raises:
+            ValueError: If the query is not valid FTS5 syntax.
+        """
+        weights = ", ".join(str(FIELD_WEIGHTS[field]) for field in TEXT_FIELDS)
+        try:
+            rows = self._conn.execute(
+                f"SELECT p.source_file, p.doi, p.title, -bm25(text, {weights}) AS score, "
+                f"snippet(text, -1, '[', ']', '…', {SNIPPET_TOKENS}) "
+                "FROM text JOIN papers p ON p.id = text.rowid WHERE text MATCH ? ORDER BY score DESC LIMIT ?",
+                (self._scoped(query, fields), k)).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid query {query!r}: {e}") from None
+        return [{"source_file": source_file, "doi": doi, "title": title, "score": round(score, 4),
+                 "snippet": " ".join(snippet.split())} for source_file, doi, title, score, snippet in rows]
+
+    def count(self, query: str, fields=None) -> int:
+        """Number of papers matching ``query`` (see ``search``)."""
+        try:
+            return self._conn.execute("SELECT COUNT(*) FROM text WHERE text MATCH ?",
+                                      (self._scoped(query, fields),)).fetchone()[0]
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid query {query!r}: {e}") from None
+
+    def check_criteria(self, criteria: list, fields=("title", "abstract"), k: int = 5) -> list:
+        """
+        Papers of the whole corpus matching each criterion as a phrase.
+
+        The ``extract-with-config`` exclusion test (the criterion quoted in the
+        title or abstract, by default) on indexed tokens, for every paper at
+        once. Returns ``{"criterion", "matches", "examples"}`` per criterion.
+        """
+        report = []
+        for criterion in criteria:
+            query = phrase_query(criterion)
+            if not query:
+                continue
+            report.append({"criterion": criterion, "matches": self.count(query, fields),
+                           "examples": [hit["source_file"] for hit in self.search(query, k, fields)]})
+        return report
+
+    def body(self, doi: str = "", source_file: str = "") -> str:
+        """
+        Indexed body text of a paper of an extraction table, or "" when unknown.
+
+        Papers are matched by DOI, else by file name when only one indexed paper
+        has it (same-named PDFs of different folders are ambiguous).
+        """
+        for column, value in (("lower(p.doi)", (doi or "").strip().lower()), ("p.source_file", source_file or "")):
+            if not value:
+                continue
+            rows = self._conn.execute(f"SELECT text.body FROM papers p JOIN text ON text.rowid = p.id "
+                                      f"WHERE {column} = ? LIMIT 2", (value,)).fetchall()
+            if len(rows) == 1:
+                return rows[0][0]
+        return ""
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,135 @@
+# autoreviewx/core/vector_index.py
+import json
+import os
+import threading
+
+import numpy as np
+
+DEFAULT_INDEX_DIR = "data/index"
+VECTORS_FILE = "vectors.f32"
+RECORDS_FILE = "records.jsonl"
+META_FILE = "meta.json"
+
+
+def record_keys(record: dict) -> list:
+    # ``key`` identifies the PDF itself (content hash); indexes written before it fall back to the file name
+    keys = []
+    if record.get("doi"):
+        keys.append("doi:" + record["doi"].strip().lower())
+    if record.get("key"):
+        keys.append(record["key"])
+    elif record.get("source_file"):
+        keys.append("file:" + record["source_file"])
+    return keys
+
+
+class VectorIndex:
+    """
+    Append-only on-disk index of document vectors.
+
+    Vectors are stored L2-normalized as raw float32 rows (``vectors.f32``) next to
+    one JSON record per row (``records.jsonl``). Queries memory-map the matrix and
+    rank the whole corpus with one matrix-vector product.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_DIR, dim: int = None, model: str = None):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if dim is not None and meta["dim"] != dim:
+                raise ValueError(f"Index {path} stores {meta['dim']}-d vectors, got {dim}")
+            if model is not None and meta.get("model") not in (None, model):
+                raise ValueError(f"Index {path} was built with {meta['model']}, not {model}")
+            self.dim, self.model = meta["dim"], meta.get("model")
+        else:
+            self.dim, self.model = dim, model
+        self.records = self._load_records()
+        self._keys = {key: i for i, r in enumerate(self.records) for key in record_keys(r)}
+
+    def _load_records(self) -> list:
+        path = os.path.join(self.path, RECORDS_FILE)
+        if not os.path.exists(path):
+            return []
+        with open(path, "r", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        # An interrupted append may leave one more record than vectors (or the reverse)
+        return records[:self._stored_rows()]
+
+    def _stored_rows(self) -> int:
+        path = os.path.join(self.path, VECTORS_FILE)
+        if not self.dim or not os.path.exists(path):
+            return 0
+        return os.path.getsize(path) // (4 * self.dim)
+
+    def __len__(self):
+        return len(self.records)
+
+    def find(self, doi: str = None, source_file: str = None, key: str = None):
+        """Row of a document by DOI, document key (see ``document_key``) or source file name, or None."""
+        for key in record_keys({"doi": doi, "key": key, "source_file": source_file}):
+            if key in self._keys:
+                return self._keys[key]
+        return None
+
+    def add(self, vector: np.ndarray, record: dict) -> bool:
+        """Append a document; returns False if it is already indexed (same DOI or key)."""
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return False
+        with self._lock:
+            if any(key in self._keys for key in record_keys(record)):
+                return False
+            if self.dim is None:
+                self.dim = len(vector)
+                with open(os.path.join(self.path, META_FILE), "w", encoding="utf-8") as f:
+                    json.dump({"dim": self.dim, "model": self.model}, f)
+            if len(vector) != self.dim:
+                raise ValueError(f"Expected a {self.dim}-d vector, got {len(vector)}")
+            with open(os.path.join(self.path, VECTORS_FILE), "ab") as f:
+                f.write((vector / norm).tobytes())
+            with open(os.path.join(self.path, RECORDS_FILE), "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            row = len(self.records)
+            self.records.append(record)
+            for key in record_keys(record):
+                self._keys[key] = row
+        return True
+
+    def matrix(self) -> np.ndarray:
+        """Read-only memory map of the (n, dim) normalized vectors."""
+        if not self.records:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        return np.memmap(os.path.join(self.path, VECTORS_FILE), dtype=np.float32, mode="r",
+                         shape=(len(self.records), self.dim))
+
+    def vector(self, row: int) -> np.ndarray:
+        return np.array(self.matrix()[row])
+
+    def search(self, vector: np.ndarray, k: int = 10, exclude: int = None) -> list:
+        """
+        The ``k`` most similar documents by cosine similarity.
+
+        Returns:
+            list: ``(score, record)`` pairs, best first.
+        """
+        matrix = self.matrix()
+        if not len(matrix):
+            return []
+        query = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+        scores = matrix @ (query / norm)
+        if exclude is not None:
+            scores[exclude] = -np.inf
+        k = min(k, len(scores) - (exclude is not None))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), self.records[i]) for i in top]
@@ -0,0 +1,203 @@
+# autoreviewx/core/watcher.py
+import json
+import os
+import time
+
+from autoreviewx.core.extractor import find_pdf_files
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:  # optional dependency, fall back to polling
+    INotify = None
+
+
+def file_signature(path: str):
+    """(size, mtime_ns) of a file, or None if it disappeared."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def looks_complete(path: str) -> bool:
+    """A fully written PDF ends with an ``%%EOF`` marker (possibly followed by whitespace)."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - 1024))
+            return b"%%EOF" in f.read()
+    except OSError:
+        return False
+
+
+class PollingSource:
+    """Change source that rescans the whole tree every interval."""
+
+    def __init__(self, folder: str):
+        self.folder = folder
+
+    def read(self, timeout: float) -> set:
+        time.sleep(timeout)
+        return set(find_pdf_files(self.folder, recursive=True))
+
+    def close(self):
+        pass
+
+
+class InotifySource:
+    """Change source backed by inotify: only paths touched since the last read are returned."""
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.inotify = INotify()
+        self.mask = (inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO | inotify_flags.CREATE
+                     | inotify_flags.MODIFY | inotify_flags.ATTRIB)
+        self.watches = {}
+        for root, _, _ in os.walk(folder):
+            self._add_watch(root)
+
+    def _add_watch(self, directory: str):
+        try:
+            wd = self.inotify.add_watch(directory, self.mask)
+        except OSError:
+            return
+        self.watches[wd] = directory
+
+    def read(self, timeout: float) -> set:
+        changed = set()
+        for event in self.inotify.read(timeout=int(timeout * 1000)):
+            directory = self.watches.get(event.wd)
+            if directory is None or not event.name:
+                continue
+            path = os.path.join(directory, event.name)
+            if event.mask & inotify_flags.ISDIR:
+                # New sub-folder: watch it and pick up files already moved into it
+                for root, _, _ in os.walk(path):
+                    self._add_watch(root)
+                changed.update(find_pdf_files(path, recursive=True))
+            elif path.lower().endswith(".pdf"):
+                changed.add(path)
+        return changed
+
+    def close(self):
+        self.inotify.close()
+
+
+def make_source(folder: str, use_inotify: bool = True):
+    if use_inotify and INotify is not None:
+        try:
+            return InotifySource(folder)
+        except OSError as e:
+            print(f"⚠️  inotify unavailable ({e}), falling back to polling")
+    return PollingSource(folder)
+
+
+class PdfWatcher:
+    """
+    Incrementally process PDFs dropped into a folder tree.
+
+    A file is handed to ``process`` once its size and mtime have been stable for
+    ``settle`` seconds and it ends with ``%%EOF``; files already processed with the
+    same signature are skipped. ``process`` returns the paths it handled
+    successfully: only their signatures are kept in a JSON state file, so
+    restarting the watcher only picks up the delta. Failed files (GROBID down,
+    timeouts) stay pending and are retried after ``backoff`` seconds, doubling
+    up to ``max_backoff``.
+    """
+
+    def __init__(self, folder: str, process, state_path: str, settle: float = 5.0,
+                 interval: float = 2.0, use_inotify: bool = True, backoff: float = 30.0,
+                 max_backoff: float = 3600.0):
+        self.folder = folder
+        self.process = process
+        self.state_path = state_path
+        self.settle = settle
+        self.interval = interval
+        self.use_inotify = use_inotify
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.state = self._load_state()
+        self.pending = {}  # path -> (signature, first seen with this signature)
+        self.failed = {}   # path -> (failed attempts, next retry time)
+
+    def _load_state(self) -> dict:
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            return {path: tuple(sig) for path, sig in json.load(f).items()}
+
+    def _save_state(self):
+        tmp = f"{self.state_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.state_path)
+
+    def _update(self, candidates):
+        now = time.monotonic()
+        for path in candidates:
+            sig = file_signature(path)
+            if sig is None or self.state.get(path) == sig:
+                self.pending.pop(path, None)
+                self.failed.pop(path, None)
+                continue
+            previous = self.pending.get(path)
+            if previous is None or previous[0] != sig:
+                self.pending[path] = (sig, now)
+                self.failed.pop(path, None)  # a new version gets a fresh attempt
+
+    def _settled(self) -> list:
+        now = time.monotonic()
+        return sorted(path for path, (sig, since) in self.pending.items()
+                      if now - since >= self.settle and self.failed.get(path, (0, now))[1] <= now)
+
+    def _ready(self) -> list:
+        return [path for path in self._settled() if looks_complete(path)]
+
+    def poll(self, candidates) -> list:
+        """Process the files that have settled; returns the paths handed to ``process``."""
+        self._update(candidates)
+        ready = self._ready()
+        if not ready:
+            return []
+        succeeded = set(self.process(ready) or ())
+        now = time.monotonic()
+        for path in ready:
+            if path in succeeded:
+                self.state[path] = self.pending.pop(path)[0]
+                self.failed.pop(path, None)
+                continue
+            attempts = self.failed.get(path, (0, now))[0] + 1
+            delay = min(self.max_backoff, self.backoff * 2 ** (attempts - 1))
+            self.failed[path] = (attempts, now + delay)
+            print(f"🔁 Retrying {os.path.relpath(path, self.folder)} in {delay:.0f}s (attempt {attempts} failed)")
+        if succeeded:
+            self._save_state()
+        return ready
+
+    def run(self, once: bool = False):
+        """
+        Watch until interrupted.
+
+        Args:
+            once (bool): Stop as soon as the files present at start-up have been processed.
+        """
+        source = make_source(self.folder, self.use_inotify)
+        print(f"👀 Watching {self.folder} ({type(source).__name__})")
+        candidates = set(find_pdf_files(self.folder, recursive=True))
+        try:
+            while True:
+                self.poll(candidates)
+                fresh = [path for path in self.pending if path not in self.failed]
+                if once and set(fresh) <= set(self._settled()):
+                    # Whatever else is left is stable but has no %%EOF marker: truncated or not a PDF
+                    for path in fresh:
+                        print(f"⚠️  Skipped incomplete PDF: {path}")
+                    for path in self.failed:
+                        print(f"⚠️  Failed, retried on the next run: {path}")
+                    break
+                candidates = source.read(self.interval) | set(self.pending)
+        except KeyboardInterrupt:
+            print("\n👋 Watcher stopped.")
+        finally:
+            source.close()
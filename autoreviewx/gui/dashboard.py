@@ -0,0 +1,103 @@
+# autoreviewx/gui/dashboard.py
+# Run with: autoreviewx dashboard --input data/extracted/metadata_file.parquet
+import argparse
+import os
+
+import pandas as pd
+import streamlit as st
+
+from autoreviewx.core.aggregates import DETAIL_COLUMNS, ReviewIndex, framework_of, table_columns
+from autoreviewx.core.schema import read_table
+
+MAX_DETAIL_ROWS = 1000
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", "-i", type=str, required=True)
+    return parser.parse_args()
+
+
+def file_version(path: str) -> tuple:
+    """Cache key part that changes whenever the table is rewritten."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+# The index lives once per server process and is shared by every session;
+# it is rebuilt only when the file changes.
+@st.cache_resource(max_entries=4, show_spinner="Indexing the review table…")
+def load_index(path: str, version: tuple) -> ReviewIndex:
+    return ReviewIndex.from_table(path)
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def summarize(path: str, version: tuple, filters: tuple, passes: tuple) -> dict:
+    index = load_index(path, version)
+    return index.summary(index.mask(dict(filters), list(passes)))
+
+
+@st.cache_data(max_entries=4, show_spinner="Loading paper details…")
+def load_details(path: str, version: tuple) -> pd.DataFrame:
+    columns = [c for c in DETAIL_COLUMNS if c in table_columns(path)]
+    return read_table(path, columns=columns)
+
+
+def main():
+    args = parse_args()
+    st.set_page_config(page_title="AutoReviewX dashboard", layout="wide")
+    st.title("🤖 AutoReviewX review dashboard")
+
+    if not os.path.exists(args.input):
+        st.error(f"❌ File not found: {args.input}")
+        return
+    version = file_version(args.input)
+    index = load_index(args.input, version)
+
+    st.sidebar.header("Filters")
+    filters = {}
+    for facet, values in index.values.items():
+        selected = st.sidebar.multiselect(facet.capitalize(), values)
+        if selected:
+            filters[facet] = tuple(selected)
+
+    passes = []
+    frameworks = {}
+    for column in index.passes:
+        frameworks.setdefault(framework_of(column), []).append(column)
+    for framework, columns in frameworks.items():
+        labels = {c[len(framework) + 1:-len("_pass")]: c for c in columns}
+        selected = st.sidebar.multiselect(f"{framework.upper()} criteria passed", list(labels))
+        passes += [labels[label] for label in selected]
+
+    summary = summarize(args.input, version, tuple(sorted(filters.items())), tuple(passes))
+
+    st.metric("Papers", f"{summary['papers']:,}", delta=f"of {index.size:,}", delta_color="off")
+
+    facet_columns = st.columns(max(len(summary["facets"]), 1))
+    for column, (facet, counts) in zip(facet_columns, summary["facets"].items()):
+        column.subheader(facet.capitalize())
+        counts = counts[counts > 0]
+        column.bar_chart(counts.sort_index() if facet == "year" else counts.head(20))
+
+    if len(summary["pass_rates"]):
+        st.subheader("Pass rates")
+        for framework, columns in frameworks.items():
+            rates = summary["pass_rates"][columns].rename(lambda c: c[len(framework) + 1:-len("_pass")])
+            st.caption(framework.upper())
+            st.bar_chart(rates)
+    if len(summary["scores"]):
+        st.subheader("Mean global scores")
+        st.dataframe(summary["scores"].rename("mean").to_frame())
+
+    # The text columns are only read when asked for, once per file version
+    if st.checkbox("Show papers"):
+        details = load_details(args.input, version)
+        mask = index.mask(filters, passes)
+        rows = details[mask]
+        st.caption(f"Showing {min(len(rows), MAX_DETAIL_ROWS):,} of {len(rows):,} papers")
+        st.dataframe(rows.head(MAX_DETAIL_ROWS))
+
+
+if __name__ == "__main__":  # `streamlit run` executes the script as __main__
+    main()
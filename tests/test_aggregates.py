@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from autoreviewx.core.aggregates import ReviewIndex, framework_of
+from autoreviewx.core.schema import write_table
+
+ROWS = pd.DataFrame({
+    "title": ["a", "b", "c", "d"],
+    "year": ["2020", "2021", "2020", None],
+    "methodology": ["mixed", "qualitative", "mixed", "mixed"],
+    "countries": ["France; Morocco", "Canada", "", "France"],
+    "casp_ethics_pass": [True, False, True, None],
+    "prisma_objective_pass": [True, True, False, True],
+    "score_casp": [0.5, 0.7, np.nan, 0.9],
+})
+
+
+def test_mask_combines_facets_and_passes():
+    index = ReviewIndex(ROWS)
+    assert index.mask({"year": ["2020"]}).tolist() == [True, False, True, False]
+    assert index.mask({"countries": ["France", "Canada"]}).tolist() == [True, True, False, True]
+    assert index.mask({"countries": ["unknown"]}).tolist() == [False, False, True, False]
+    mask = index.mask({"methodology": ["mixed"]}, ["casp_ethics_pass", "prisma_objective_pass"])
+    assert mask.tolist() == [True, False, False, False]
+
+
+def test_summary_counts_rates_and_scores():
+    index = ReviewIndex(ROWS)
+    summary = index.summary(index.mask({"methodology": ["mixed"]}))
+    assert summary["papers"] == 3
+    assert summary["facets"]["year"].to_dict() == {"2020": 2, "2021": 0, "unknown": 1}
+    assert summary["facets"]["countries"]["France"] == 2
+    assert summary["pass_rates"]["prisma_objective_pass"] == 2 / 3
+    assert np.isclose(summary["scores"]["score_casp"], 0.7)
+    assert index.summary(np.zeros(4, dtype=bool))["papers"] == 0
+    assert framework_of("kitch_limitations_pass") == "kitch"
+
+
+def test_from_table_on_a_large_table(tmp_path):
+    n = 100_000
+    rng = np.random.default_rng(0)
+    big = pd.DataFrame({
+        "year": rng.integers(2000, 2025, n).astype(str),
+        "methodology": rng.choice(["mixed", "qualitative", "quantitative"], n),
+        "countries": rng.choice(["France", "Canada; France", "Morocco", ""], n),
+        "casp_ethics_pass": rng.random(n) < 0.5,
+        "abstract": ["long text"] * n,
+    })
+    path = str(tmp_path / "big.parquet")
+    write_table(big, path)
+    index = ReviewIndex.from_table(path)
+    assert index.size == n
+
+    mask = index.mask({"year": ["2010", "2011"], "countries": ["France"]}, ["casp_ethics_pass"])
+    summary = index.summary(mask)
+    expected = (big["year"].isin(["2010", "2011"]) & big["countries"].str.contains("France") & big["casp_ethics_pass"])
+    assert summary["papers"] == expected.sum()
+
+
+def test_dashboard_caches_the_index_and_summaries(tmp_path, monkeypatch):
+    dashboard = pytest.importorskip("autoreviewx.gui.dashboard")
+    calls = {"from_table": 0, "summary": 0}
+
+    def counted(name, func):
+        def wrapper(*args, **kwargs):
+            calls[name] += 1
+            return func(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(ReviewIndex, "from_table", classmethod(counted("from_table", ReviewIndex.from_table.__func__)))
+    monkeypatch.setattr(ReviewIndex, "summary", counted("summary", ReviewIndex.summary))
+    dashboard.load_index.clear()
+    dashboard.summarize.clear()
+    path = str(tmp_path / "review.csv")
+    write_table(ROWS, path)
+    version = dashboard.file_version(path)
+
+    filters = (("methodology", ("mixed",)),)
+    for _ in range(3):
+        assert dashboard.summarize(path, version, filters, ())["papers"] == 3
+    dashboard.summarize(path, version, (("year", ("2020",)),), ("casp_ethics_pass",))
+    assert calls == {"from_table": 1, "summary": 2}  # one index per file, one aggregate per filter state
+
+    # A rewritten table gets a new version: indexed again
+    write_table(ROWS.head(2), path)
+    assert dashboard.summarize(path, dashboard.file_version(path), filters, ())["papers"] == 1
+    assert calls == {"from_table": 2, "summary": 3}
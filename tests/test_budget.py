@@ -0,0 +1,54 @@
+# tests/test_budget.py
+import re
+import time
+
+from autoreviewx.core.budget import StageBudget, time_limit, StageTimeout
+
+
+def test_runaway_regex_is_cancelled():
+    budget = StageBudget({"pico": 0.2})
+    start = time.monotonic()
+    result = budget.run("pico", re.match, r"(a+)+$", "a" * 40 + "b", default=dict)
+    assert time.monotonic() - start < 2
+    assert result == {} and budget.exceeded == ["pico"] and budget.summary == "pico"
+
+
+def test_stage_within_budget_keeps_result():
+    budget = StageBudget({"samples": 5})
+    assert budget.run("samples", lambda: {"participants": "30"}, default=dict) == {"participants": "30"}
+    assert budget.exceeded == [] and "samples" in budget.timings
+    # No budget for a stage: unlimited
+    assert StageBudget({}).run("goal", str.upper, "ok") == "OK"
+
+
+def test_time_limit_restores_previous_handler():
+    import signal
+    previous = signal.getsignal(signal.SIGALRM)
+    try:
+        with time_limit(0.05):
+            time.sleep(1)
+    except StageTimeout:
+        pass
+    assert signal.getsignal(signal.SIGALRM) == previous
+
+
+def test_goal_and_samples_patterns(monkeypatch):
+    import spacy
+    from autoreviewx.core.nlp import get_nlp
+    # enhanced_extraction loads the spaCy model at import
+    monkeypatch.setattr(spacy, "load", lambda *args, **kwargs: spacy.blank("en"))
+    get_nlp.cache_clear()
+    from autoreviewx.core.enhanced_extraction import detect_goal
+    get_nlp.cache_clear()
+    from autoreviewx.core.grobid_extractor import extract_samples
+
+    # Words with an "n" used to end the capture ([^.\\n] excluded the letter n)
+    assert detect_goal("This study aims to understand novice learning.") == \
+        "This study aims to understand novice learning"
+    assert detect_goal("The paper is long. It aims to be ignored.") == "not detected"
+    assert extract_samples("A total of 42 students took part (n = 42).")["participants_count"] == 42
+
+    start = time.monotonic()
+    detect_goal("this paper " + "x" * 200000)
+    extract_samples("n" + " " * 100000 + "=")
+    assert time.monotonic() - start < 2
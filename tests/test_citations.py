@@ -0,0 +1,39 @@
+from bs4 import BeautifulSoup
+
+from autoreviewx.core.citations import CitationGraph, parse_references, reference_key
+
+TEI = """<TEI xmlns="http://www.tei-c.org/ns/1.0"><text><back><div type="references"><listBibl>
+<biblStruct><analytic><title level="a">Deep learning for stress detection</title></analytic>
+  <monogr><title level="j">Sensors</title><imprint><date when="2019-05-01"/></imprint></monogr>
+  <idno type="DOI">https://doi.org/10.1/ABC</idno></biblStruct>
+<biblStruct><monogr><title level="m">Guidelines for performing systematic literature reviews</title>
+  <imprint><date>2007</date></imprint></monogr></biblStruct>
+<biblStruct><analytic><title>Short</title></analytic></biblStruct>
+</listBibl></div></back></text></TEI>"""
+
+
+def test_parse_references():
+    refs = parse_references(BeautifulSoup(TEI, "xml"))
+    assert [r["key"] for r in refs] == [
+        "doi:10.1/abc", reference_key(title="Guidelines for performing systematic literature reviews!")]
+    assert refs[0]["year"] == "2019" and refs[1]["year"] == "2007"
+    assert refs[1]["title"].startswith("Guidelines")
+
+
+def test_graph_counts_snowballing_and_reload(tmp_path):
+    graph = CitationGraph(str(tmp_path))
+    ref = lambda doi: {"key": reference_key(doi), "doi": doi, "title": "", "year": ""}
+    graph.add_document("10.1/a", "Paper A", "2020", [ref("10.1/x"), ref("10.1/b"), ref("10.1/x")])
+    graph.add_document("10.1/b", "Paper B", "2021", [ref("10.1/x"), ref("10.1/y")])
+    graph.add_document("10.1/c", "Paper C", "2022", [ref("10.1/b"), ref("10.1/x")])
+    # Re-extracting a paper does not duplicate its edges
+    assert graph.add_document("10.1/a", "Paper A", "2020", [ref("10.1/x")]) == 0
+
+    reloaded = CitationGraph(str(tmp_path))
+    assert len(reloaded) == 5 and len(reloaded.edges()) == 6
+    assert reloaded.to_csr().sum(axis=0).A1.tolist() == reloaded.citation_counts().tolist()
+
+    cited = reloaded.ranked(in_corpus=True)
+    assert [(n["doi"], n["citations"]) for n in cited] == [("10.1/b", 2)]
+    candidates = reloaded.ranked(in_corpus=False)
+    assert [(n["doi"], n["citations"]) for n in candidates] == [("10.1/x", 3), ("10.1/y", 1)]
@@ -0,0 +1,42 @@
+import random
+
+from autoreviewx.core.clustering import TopicClusterer, document_text
+
+TOPICS = {
+    "gaze": "eye tracking gaze fixation saccade pupil eeg sensor biosignal".split(),
+    "llm": "gpt chatgpt language model prompt transformer llm generation".split(),
+    "edu": "classroom teacher student feedback engagement curriculum assessment".split(),
+}
+
+
+def make_docs(n, rng):
+    topics = [rng.choice(sorted(TOPICS)) for _ in range(n)]
+    return topics, [" ".join(rng.choice(TOPICS[t]) for _ in range(25)) for t in topics]
+
+
+def test_incremental_clustering_separates_topics(tmp_path):
+    rng = random.Random(0)
+    clusterer = TopicClusterer(n_clusters=3, n_features=2 ** 14)
+    truth, docs = make_docs(600, rng)
+    for i in range(0, len(docs), 100):
+        clusterer.partial_fit(docs[i:i + 100])
+
+    path = tmp_path / "model.joblib"
+    clusterer.save(str(path))
+    reloaded = TopicClusterer.load(str(path))
+
+    # New papers are assigned (and learned) without refitting from scratch
+    new_truth, new_docs = make_docs(90, rng)
+    reloaded.partial_fit(new_docs)
+    assert reloaded.n_docs == 690
+    predicted = reloaded.predict(new_docs)
+    mapping = {}
+    for topic, label in zip(new_truth, predicted):
+        mapping.setdefault(topic, set()).add(label)
+    assert all(len(labels) == 1 for labels in mapping.values())
+    assert len(set().union(*mapping.values())) == 3
+    assert len(reloaded.cluster_labels()) == 3
+
+
+def test_document_text_skips_missing_columns():
+    assert document_text({"title": "A", "abstract": float("nan"), "keywords": "b; c"}) == "A b; c"
@@ -0,0 +1,68 @@
+import numpy as np
+import spacy
+from spacy.vectors import Vectors
+
+import autoreviewx.core.doc_cache as doc_cache
+from autoreviewx.core.doc_cache import DocCache, cosine
+
+WORDS = ["the", "study", "aims", "to", "measure", "students", "engagement", "results", "show", "gains"]
+TEXT = "The study aims to measure students engagement. Results show gains!"
+
+
+def blank_model():
+    nlp = spacy.blank("en")
+    rng = np.random.default_rng(0)
+    nlp.vocab.vectors = Vectors(strings=nlp.vocab.strings, keys=[nlp.vocab.strings.add(w) for w in WORDS],
+                                data=rng.normal(size=(len(WORDS), 8)).astype(np.float32))
+    return nlp
+
+
+def test_analyze_and_reuse(tmp_path, monkeypatch):
+    nlp = blank_model()
+    monkeypatch.setattr(doc_cache, "get_nlp", lambda model=None: nlp)
+    cache = DocCache(str(tmp_path), sentences=True)
+
+    analysis = cache.analyze(TEXT)
+    assert np.allclose(analysis["vector"], nlp(TEXT).vector, atol=1e-6)
+    assert [TEXT[s:e] for s, e in analysis["sentences"]] == [
+        "The study aims to measure students engagement.", "Results show gains!"]
+    first = nlp("The study aims to measure students engagement.").vector
+    assert cosine(analysis["sentence_vectors"][0], first) > 0.9999
+
+    # Second run (new process state): served from disk, no spaCy work
+    again = DocCache(str(tmp_path), sentences=True)
+    monkeypatch.setattr(nlp, "tokenizer", None)
+    assert np.array_equal(again.analyze(TEXT)["vector"], analysis["vector"])
+    assert (again.hits, again.misses) == (1, 0)
+
+
+def test_key_depends_on_text_and_settings(tmp_path, monkeypatch):
+    nlp = blank_model()
+    monkeypatch.setattr(doc_cache, "get_nlp", lambda model=None: nlp)
+    cache = DocCache(str(tmp_path))
+    assert cache.key(TEXT) != cache.key(TEXT + " ")
+    assert cache.key(TEXT) != DocCache(str(tmp_path), sentences=True).key(TEXT)
+    assert list(cache.analyze(TEXT)) == ["vector"]  # sentence artefacts are opt-in
+
+
+def test_pipeline_components_and_length_limit_are_skipped(tmp_path, monkeypatch):
+    nlp = blank_model()
+    nlp.add_pipe("sentencizer")
+    nlp.max_length = 20  # nlp.pipe would raise E088 on TEXT
+    monkeypatch.setattr(doc_cache, "get_nlp", lambda model=None: nlp)
+    monkeypatch.setattr(nlp, "pipe", lambda *a, **k: (_ for _ in ()).throw(AssertionError("full pipeline")))
+    vectors = [a["vector"] for a in DocCache(str(tmp_path)).analyze_many([TEXT, "study"])]
+    assert np.allclose(vectors[0], nlp.tokenizer(TEXT).vector, atol=1e-6)
+    assert np.allclose(vectors[1], nlp.tokenizer("study").vector, atol=1e-6)
+
+
+def test_truncated_entry_is_recomputed(tmp_path, monkeypatch):
+    nlp = blank_model()
+    monkeypatch.setattr(doc_cache, "get_nlp", lambda model=None: nlp)
+    cache = DocCache(str(tmp_path))
+    cache.analyze(TEXT)
+    path = cache._file(cache.key(TEXT))
+    with open(path, "r+b") as f:
+        f.truncate(20)
+    assert cache.get(TEXT) is None
+    assert cache.analyze(TEXT)["vector"].shape == (8,)
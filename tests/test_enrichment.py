@@ -0,0 +1,120 @@
+# tests/test_enrichment.py
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from autoreviewx.core.enrichment import Enricher, EnrichmentCache, TokenBucket, enrich_frame
+
+OPENALEX = {
+    "10.1000/a": {"doi": "https://doi.org/10.1000/a", "title": "Paper A", "publication_year": 1998,
+                  "primary_location": {"source": {"display_name": "Journal A"}}},
+    "10.1000/b": {"doi": "https://doi.org/10.1000/b", "title": "Chatbots for novice programmers",
+                  "publication_year": 2021, "primary_location": {"source": {"display_name": "Computers & Education"}}},
+}
+CROSSREF = {
+    "10.1000/c": {"DOI": "10.1000/C", "title": ["Paper C"], "issued": {"date-parts": [[2015, 3]]},
+                  "container-title": ["Journal C"]},
+}
+
+
+def start_stub():
+    """OpenAlex (/openalex/works) and Crossref (/crossref/works) stand-in recording its queries."""
+    queries = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+            queries.append((url.path, params))
+            if url.path == "/openalex/works":
+                name, _, value = params["filter"].partition(":")
+                if name == "doi":
+                    items = [OPENALEX[doi] for doi in value.split("|") if doi in OPENALEX]
+                else:
+                    items = [work for work in OPENALEX.values() if work["title"].lower() == value]
+                body = {"results": items}
+            else:
+                dois = [part.partition(":")[2] for part in params.get("filter", "").split(",") if part]
+                body = {"message": {"items": [CROSSREF[doi] for doi in dois if doi in CROSSREF]}}
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    return server, {"openalex": f"{base}/openalex", "crossref": f"{base}/crossref"}, queries
+
+
+def test_enrichment_batches_falls_back_and_caches(tmp_path):
+    server, urls, queries = start_stub()
+    df = pd.DataFrame({
+        "title": ["Paper A", "Chatbots for Novice Programmers!", "Paper C", "Paper D"],
+        "doi": ["10.1000/A", "", "https://doi.org/10.1000/c", "10.1000/d"],
+        "year": ["", "", "", "2020"],
+        "journal": ["", "", "Known", ""],
+    })
+    cache_path = str(tmp_path / "enrichment.sqlite")
+    enricher = Enricher(EnrichmentCache(cache_path), urls=urls)
+    enriched = enrich_frame(df, enricher)
+
+    assert list(enriched["year"]) == ["1998", "2021", "2015", "2020"]
+    assert list(enriched["journal"]) == ["Journal A", "Computers & Education", "Known", ""]
+    assert enriched.loc[1, "doi"] == "10.1000/b"  # found by title
+    assert list(enriched["enrichment_source"].fillna("")) == ["openalex", "openalex", "crossref", ""]
+    # One bulk DOI query and one title search per source; Crossref only gets what OpenAlex missed
+    openalex = [params for path, params in queries if path == "/openalex/works"]
+    crossref = [params for path, params in queries if path == "/crossref/works"]
+    assert len(openalex) == 2 and len(crossref) == 1
+    assert sorted(crossref[0]["filter"].split(",")) == ["doi:10.1000/c", "doi:10.1000/d"]
+
+    # Rerun: everything (matches and misses) comes from the cache
+    queries.clear()
+    rerun = Enricher(EnrichmentCache(cache_path), urls=urls)
+    assert enrich_frame(df, rerun).equals(enriched)
+    assert queries == [] and rerun.requests == 0
+    server.shutdown()
+
+
+def test_failed_requests_are_not_cached(tmp_path):
+    enricher = Enricher(EnrichmentCache(str(tmp_path / "cache.sqlite")), sources=["openalex"],
+                        urls={"openalex": "http://127.0.0.1:9"}, timeout=0.5)
+    df = pd.DataFrame({"title": ["Paper A"], "doi": ["10.1000/a"], "year": [""], "journal": [""]})
+    assert enrich_frame(df, enricher)["enrichment_source"].isna().all()
+    assert enricher.errors == 1 and len(enricher.cache) == 0
+
+
+def test_token_bucket_rate():
+    async def take(bucket, n):
+        for _ in range(n):
+            await bucket.acquire()
+
+    bucket = TokenBucket(rate=20, burst=1)
+    start = time.monotonic()
+    asyncio.run(take(bucket, 5))
+    assert time.monotonic() - start >= 0.19
+
+
+def test_extraction_enriches_from_a_stage_thread(tmp_path):
+    from autoreviewx.core.grobid_extractor import FieldSelection, parse_tei, run_extraction
+
+    cache = EnrichmentCache(str(tmp_path / "cache.sqlite"))  # opened here, used by the enrichment stage thread
+    cache.put_many("openalex", {"doi:10.1000/a": {"doi": "10.1000/a", "title": "Paper A", "year": "1998",
+                                                  "journal": "Journal A"}})
+    tei = ("<TEI><teiHeader><titleStmt><title>Paper A</title></titleStmt><sourceDesc><biblStruct>"
+           '<idno type="DOI">10.1000/a</idno></biblStruct></sourceDesc></teiHeader></TEI>')
+    enricher = Enricher(cache, sources=["openalex"], offline=True)
+    selection = FieldSelection(fields=["doi", "year", "journal", "enrichment_source"])
+    row = run_extraction([parse_tei(tei, "a.pdf")], selection, enricher=enricher)[0]
+    assert (row["year"], row["journal"], row["enrichment_source"]) == ("1998", "Journal A", "openalex")
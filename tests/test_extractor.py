@@ -1,3 +1,136 @@
 # tests/test_extractor.py
 def test_dummy():
-    assert 1 + 1 == 2
\ No newline at end of file
+    assert 1 + 1 == 2
+
+
+def test_metadata_from_text():
+    from autoreviewx.core.extractor import extract_metadata_from_text
+    text = "\n".join([
+        "Learning to Program with Conversational Agents in Higher Education",
+        "Alice Martin, Bob Durand, Chloe Petit",
+        "Abstract",
+        "We study students using chatbots.",
+        "Keywords: chatbots, programming, education.",
+        "https://doi.org/10.1145/1234567.890 published 2023",
+    ])
+    metadata = extract_metadata_from_text(text, "data/raw_pdfs/paper.pdf")
+    assert metadata["title"].startswith("Learning to Program")
+    assert metadata["authors"] == "Alice Martin; Bob Durand; Chloe Petit"
+    assert metadata["abstract"].startswith("We study students")
+    assert metadata["keywords"] == "chatbots; programming; education"
+    assert metadata["doi"] == "10.1145/1234567.890" and metadata["year"] == "2023"
+    assert metadata["source_file"] == "paper.pdf"
+
+
+def test_grobid_failure_falls_back_to_local_extraction(tmp_path, monkeypatch):
+    import fitz
+    import numpy as np
+    from autoreviewx.core import frameworks as fw
+    from autoreviewx.core import grobid_extractor
+    from autoreviewx.core.frameworks import get_registry
+    from autoreviewx.core.grobid_client import GrobidPool
+
+    monkeypatch.setattr(fw, "document_vectors", lambda texts, model=None: np.ones((len(texts), 4), dtype=np.float32))
+    monkeypatch.setattr(get_registry(), "_phrase_matrix", None)
+    monkeypatch.setattr(grobid_extractor, "text_vector", lambda text, model=None: np.ones(4, dtype=np.float32))
+    monkeypatch.setattr(grobid_extractor, "text_vectors",
+                        lambda texts, model=None, **kwargs: np.ones((len(texts), 4), dtype=np.float32))
+
+    path = str(tmp_path / "paper.pdf")
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "A Qualitative Study of Programming Students\nAlice Martin, Bob Durand, "
+                                         "Chloe Petit\nAbstract\nWe interviewed 30 students.")
+    doc.save(path)
+
+    pool = GrobidPool(["http://127.0.0.1:9"], timeout=0.5, max_attempts=1)
+    assert "error" in grobid_extractor.extract_metadata_with_grobid(path, pool=pool)
+    row = grobid_extractor.extract_metadata_with_grobid(path, pool=pool, fallback=True)
+    assert row["extraction_source"] == "local"
+    assert row["title"] == "A Qualitative Study of Programming Students"
+    assert row["methodology"] == "qualitative" and row["participants_count"] == 30
+    assert "score_casp" in row
+
+
+def test_pipe_indexed_maps_docs_back():
+    import spacy
+    from autoreviewx.core.nlp import pipe_indexed
+
+    nlp = spacy.blank("en")
+    texts = ["a b c d e f", "a", "", "a b c", "a b"]
+    for n_process in (1, 2):
+        docs = dict(pipe_indexed(nlp, texts, batch_size=2, n_process=n_process))
+        assert {i: len(doc) for i, doc in docs.items()} == {0: 6, 1: 1, 2: 0, 3: 3, 4: 2}
+
+
+def test_batch_extraction_batches_nlp_per_chunk(tmp_path, monkeypatch):
+    import os
+
+    import numpy as np
+    from autoreviewx.core import frameworks as fw
+    from autoreviewx.core import grobid_extractor
+    from autoreviewx.core.frameworks import get_registry
+
+    def fake_vectors(texts, model=None, **kwargs):
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+    batches = []
+
+    def fake_text_vectors(texts, model=None, **kwargs):
+        batches.append(len(texts))
+        return fake_vectors(texts)
+
+    def no_single_document_nlp(*args, **kwargs):
+        raise AssertionError("documents must be vectorized in batches")
+
+    monkeypatch.setattr(fw, "document_vectors", fake_vectors)
+    monkeypatch.setattr(get_registry(), "_phrase_matrix", None)
+    monkeypatch.setattr(grobid_extractor, "document_vectors", fake_vectors)
+    monkeypatch.setattr(grobid_extractor, "text_vectors", fake_text_vectors)
+    monkeypatch.setattr(grobid_extractor, "text_vector", no_single_document_nlp)
+
+    class FakePool:
+        capacity = 3
+        hedged = 0
+
+        def process_fulltext(self, path):
+            name = os.path.basename(path)
+            return (f"<TEI><teiHeader><titleStmt><title>Paper {name}</title></titleStmt></teiHeader><text><body>"
+                    f"<div><head>Methods</head><p>Participants were recruited for {name}.</p></div></body></text></TEI>")
+
+    for i in range(5):
+        (tmp_path / f"p{i}.pdf").write_bytes(b"%PDF-1.4")
+    rows = grobid_extractor.extract_batch_metadata_with_grobid(str(tmp_path), pool=FakePool(), nlp_batch=2)
+    assert [row["title"] for row in rows] == [f"Paper p{i}.pdf" for i in range(5)]
+    assert batches == [2, 2, 1]
+    assert all(row["casp_recruitment"] and row["extraction_source"] == "grobid" for row in rows)
+
+
+def test_local_batch_scores_without_grobid(tmp_path, monkeypatch):
+    import fitz
+    import numpy as np
+    from autoreviewx.core import frameworks as fw
+    from autoreviewx.core import grobid_extractor
+    from autoreviewx.core.frameworks import get_registry
+    from autoreviewx.core.schema import export_columns, to_frame
+
+    fake = lambda texts, model=None, **kwargs: np.ones((len(texts), 4), dtype=np.float32)
+    monkeypatch.setattr(fw, "document_vectors", fake)
+    monkeypatch.setattr(get_registry(), "_phrase_matrix", None)
+    monkeypatch.setattr(grobid_extractor, "text_vectors", fake)
+    monkeypatch.setattr(grobid_extractor, "document_vectors", fake)
+
+    for i in range(3):
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), f"Paper {i} on Programming Students\nAlice Martin\nAbstract\n"
+                                             f"We interviewed {10 + i} students.\nMethods\nA qualitative study.")
+        doc.save(str(tmp_path / f"paper_{i}.pdf"))
+    (tmp_path / "broken.pdf").write_bytes(b"not a pdf")
+
+    rows = grobid_extractor.extract_batch_metadata_locally(str(tmp_path), workers=1, chunk_size=2)
+    assert [row["source_file"] for row in rows] == ["paper_0.pdf", "paper_1.pdf", "paper_2.pdf"]
+    assert [row["participants_count"] for row in rows] == [10, 11, 12]
+    assert all(row["extraction_source"] == "local" and "score_casp" in row for row in rows)
+    assert list(to_frame(rows).columns) == export_columns()  # same layout as the GROBID batches
+
+    pooled = grobid_extractor.extract_batch_metadata_locally(str(tmp_path), workers=2, chunk_size=2)
+    assert pooled == rows
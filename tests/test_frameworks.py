@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from autoreviewx.core import frameworks as fw
+from autoreviewx.core.config import ConfigError
+from autoreviewx.core.frameworks import FrameworkRegistry, load_frameworks, get_registry, register_framework
+
+TEXT = (
+    "The aim of this study is to assess a qualitative case study. We recruited 30 students; "
+    "informed consent was obtained and the IRB approved the procedure. "
+    "Thematic analysis was used. Results show clear implications. We propose a replication."
+)
+
+
+def test_load_frameworks_default_file():
+    frameworks = load_frameworks()
+    assert {"casp", "kitchenham", "prisma", "tapupas"} <= set(frameworks)
+
+
+def test_rules_single_scan():
+    registry = get_registry()
+    out = registry.evaluate(TEXT, semantic=False)
+    assert out["casp_clear_aim"] and out["casp_ethics"] and out["casp_analysis"]
+    assert out["kitch_contribution"] and out["kitch_replication"]
+    assert not out["kitch_validity"]
+    # count mode: "qualitative" and "case study" (pattern shared with CASP)
+    assert out["specificity"] == 2
+    assert out["propriety"] == 2
+    assert out["transparency"] == 2
+
+
+def test_overlapping_patterns_at_same_position():
+    registry = FrameworkRegistry({
+        "demo": {"rules": {"short": ["data"], "long": ["data analysis"]}},
+    })
+    assert registry.evaluate("the data analysis step", semantic=False) == {"short": True, "long": True}
+
+
+def test_semantic_scores_use_shared_matrix(monkeypatch):
+    vectors = {"alpha": [1.0, 0.0], "beta": [0.0, 1.0], "doc": [1.0, 0.2]}
+    monkeypatch.setattr(fw, "document_vectors",
+                        lambda texts, model=None: np.array([vectors[t] for t in texts], dtype=np.float32))
+    registry = FrameworkRegistry({
+        "demo": {"threshold": 0.9, "semantic": {"demo_a": ["alpha"], "demo_b": ["beta", "alpha"]}},
+    })
+    out = registry.evaluate("doc")
+    assert out["demo_a_score"] == pytest.approx(0.981, abs=1e-3)
+    assert out["demo_a_pass"] and out["demo_b_pass"]
+
+
+def test_register_framework_plugin():
+    register_framework("demo_plugin", {"rules": {"demo_flag": ["eye[- ]tracking"]}})
+    try:
+        out = get_registry().evaluate("We used eye-tracking.", frameworks=["demo_plugin"], semantic=False)
+        assert out == {"demo_flag": True}
+    finally:
+        fw._PLUGINS.pop("demo_plugin")
+        get_registry.cache_clear()
+
+
+def test_invalid_framework():
+    with pytest.raises(ConfigError):
+        register_framework("broken", {"rules": {"dim": ["(unclosed"]}})
+    with pytest.raises(ConfigError):
+        load_frameworks("nonexistent.yaml")
+
+
+def test_cascade_scores_uncertain_dimensions_on_full_text(monkeypatch):
+    vectors = {"alpha": [1.0, 0.0], "beta": [0.0, 1.0], "gamma": [1.0, 1.0], "doc": [0.3, 1.0]}
+    calls = []
+
+    def fake_vectors(texts, model=None):
+        calls.extend(texts)
+        return np.array([vectors[t] for t in texts], dtype=np.float32)
+
+    monkeypatch.setattr(fw, "document_vectors", fake_vectors)
+    registry = FrameworkRegistry({
+        "demo": {"threshold": 0.8, "semantic": {"demo_a": ["alpha"], "demo_b": ["beta"], "demo_c": ["gamma"]}},
+    })
+    registry.phrase_matrix  # built before counting
+    calls.clear()
+    abstract = np.array([1.0, 0.05], dtype=np.float32)  # a: clear pass, b: clear fail, c: ~0.74, uncertain
+    assert list(registry.escalated(abstract, margin=0.1)) == [False, False, True]
+    out = registry.evaluate("doc", abstract_vector=abstract, margin=0.1)
+    assert (out["demo_a_tier"], out["demo_b_tier"], out["demo_c_tier"]) == ("abstract", "abstract", "fulltext")
+    assert out["demo_a_pass"] and not out["demo_b_pass"] and out["demo_c_pass"]
+    assert out["demo_c_score"] == pytest.approx(0.880, abs=1e-3) and calls == ["doc"]
+
+    # A clear abstract never touches the full text; no abstract means full text for everything
+    calls.clear()
+    out = registry.evaluate("doc", frameworks=["demo"], abstract_vector=abstract, margin=0.01)
+    assert calls == [] and set(out[f"demo_{d}_tier"] for d in "abc") == {"abstract"}
+    out = registry.evaluate("doc", abstract_vector=np.zeros(2, dtype=np.float32))
+    assert set(out[f"demo_{d}_tier"] for d in "abc") == {"fulltext"}
@@ -0,0 +1,148 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from autoreviewx.core.grobid_client import GrobidError, GrobidPool
+
+
+def start_stub(status=200, delay=0.0, alive=True):
+    """Local GROBID stand-in: answers isalive and processFulltextDocument."""
+    stats = {"requests": 0, "in_flight": 0, "max_in_flight": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, code, body=b""):
+            self.send_response(code)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            self._reply(200 if alive else 500, b"true")
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            with lock:
+                stats["requests"] += 1
+                stats["in_flight"] += 1
+                stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+            time.sleep(delay)
+            with lock:
+                stats["in_flight"] -= 1
+            self._reply(status, b"<TEI/>" if status == 200 else b"")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}", stats
+
+
+@pytest.fixture
+def pdf(tmp_path):
+    path = tmp_path / "paper.pdf"
+    path.write_bytes(b"%PDF-1.4\n%%EOF\n")
+    return str(path)
+
+
+def test_least_outstanding_spreads_load(pdf):
+    servers = [start_stub(delay=0.05) for _ in range(2)]
+    pool = GrobidPool([url for _, url, _ in servers], max_concurrency=2)
+    threads = [threading.Thread(target=pool.process_fulltext, args=(pdf,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    counts = [stats["requests"] for _, _, stats in servers]
+    assert sum(counts) == 8 and min(counts) >= 3
+    assert all(stats["max_in_flight"] <= 2 for _, _, stats in servers)
+    for server, _, _ in servers:
+        server.shutdown()
+
+
+def test_failing_endpoint_taken_out_of_rotation(pdf):
+    bad_server, bad_url, bad_stats = start_stub(status=502)
+    good_server, good_url, good_stats = start_stub()
+    pool = GrobidPool([bad_url, good_url], failure_threshold=2, cooldown=60)
+    for _ in range(6):
+        assert pool.process_fulltext(pdf) == "<TEI/>"
+    assert bad_stats["requests"] == 2
+    assert pool.endpoints[0].disabled_until > 0
+    bad_server.shutdown()
+    good_server.shutdown()
+
+
+def test_503_halves_concurrency(pdf):
+    busy_server, busy_url, _ = start_stub(status=503)
+    good_server, good_url, _ = start_stub()
+    pool = GrobidPool([busy_url, good_url], max_concurrency=4)
+    pool.endpoints[1].outstanding = 4  # force the first attempt onto the busy endpoint
+    threading.Timer(0.05, lambda: pool.release(pool.endpoints[1], "ok")).start()
+    assert pool.process_fulltext(pdf) == "<TEI/>"
+    assert pool.endpoints[0].limit == 2
+    assert pool.endpoints[0].disabled_until == 0.0
+    busy_server.shutdown()
+    good_server.shutdown()
+
+
+def test_endless_503_trips_the_breaker(pdf):
+    busy_server, busy_url, busy_stats = start_stub(status=503)
+    good_server, good_url, _ = start_stub()
+    pool = GrobidPool([busy_url, good_url], max_concurrency=2, failure_threshold=2, cooldown=60)
+    for _ in range(6):
+        pool.endpoints[1].outstanding = 2  # force attempts onto the busy endpoint while it is in rotation
+        threading.Timer(0.05, lambda: pool.release(pool.endpoints[1], "ok")).start()
+        assert pool.process_fulltext(pdf) == "<TEI/>"
+    # Halved to one slot (2 -> 1), then two more 503s take it out of rotation
+    assert busy_stats["requests"] == 3
+    assert pool.endpoints[0].limit == 1 and pool.endpoints[0].disabled_until > 0
+    busy_server.shutdown()
+    good_server.shutdown()
+
+
+def test_health_check_and_all_down(pdf):
+    dead_server, dead_url, _ = start_stub(alive=False)
+    pool = GrobidPool([dead_url, "http://127.0.0.1:9"], timeout=0.5, cooldown=60)
+    assert pool.check_health() == []
+    with pytest.raises(GrobidError):
+        pool.process_fulltext(pdf)
+    dead_server.shutdown()
+
+
+def test_rejected_document_not_retried(pdf):
+    server, url, stats = start_stub(status=400)
+    pool = GrobidPool([url], failure_threshold=1)
+    with pytest.raises(GrobidError):
+        pool.process_fulltext(pdf)
+    assert stats["requests"] == 1
+    assert pool.endpoints[0].disabled_until == 0.0
+    server.shutdown()
+
+
+def test_deadline_bounds_a_hanging_document(pdf):
+    server, url, _ = start_stub(delay=2.0)
+    pool = GrobidPool([url], deadline=0.3, failure_threshold=1)
+    start = time.monotonic()
+    with pytest.raises(GrobidError):
+        pool.process_fulltext(pdf)
+    assert time.monotonic() - start < 1.5
+    # The document's fault, not the endpoint's
+    assert pool.endpoints[0].disabled_until == 0.0
+    server.shutdown()
+
+
+def test_slow_request_hedged_on_other_endpoint(pdf):
+    slow_server, slow_url, _ = start_stub(delay=2.0)
+    fast_server, fast_url, fast_stats = start_stub()
+    pool = GrobidPool([slow_url, fast_url], hedge_percentile=95, hedge_min_samples=3)
+    assert pool.hedge_delay() is None
+    pool._latencies.extend([0.05, 0.1, 0.1])
+    start = time.monotonic()
+    assert pool.process_fulltext(pdf) == "<TEI/>"
+    assert time.monotonic() - start < 1.5
+    assert pool.hedged == 1 and fast_stats["requests"] == 1
+    slow_server.shutdown()
+    fast_server.shutdown()
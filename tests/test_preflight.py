@@ -0,0 +1,42 @@
+import fitz
+
+from autoreviewx.core.preflight import inspect_pdf, triage, write_report
+
+TEXT = "A systematic review of stress detection from wearable sensors. " * 10
+
+
+def make_pdf(path, pages=1, text=TEXT, **save_options):
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page()
+        if text:
+            page.insert_textbox(fitz.Rect(50, 50, 550, 800), text)
+    doc.save(str(path), **save_options)
+    doc.close()
+    return str(path)
+
+
+def test_inspect_pdf_reasons(tmp_path):
+    assert inspect_pdf(make_pdf(tmp_path / "ok.pdf"))["status"] == "ok"
+    assert inspect_pdf(make_pdf(tmp_path / "scan.pdf", text=""))["reason"].startswith("no text layer")
+    encrypted = make_pdf(tmp_path / "locked.pdf", encryption=fitz.PDF_ENCRYPT_AES_256, user_pw="secret",
+                         owner_pw="owner")
+    assert inspect_pdf(encrypted)["reason"] == "encrypted"
+    (tmp_path / "empty.pdf").write_bytes(b"")
+    assert inspect_pdf(str(tmp_path / "empty.pdf"))["reason"] == "empty file"
+    (tmp_path / "broken.pdf").write_bytes(b"not a pdf at all" * 10)
+    assert inspect_pdf(str(tmp_path / "broken.pdf"))["reason"].startswith("corrupted")
+    assert inspect_pdf(make_pdf(tmp_path / "long.pdf", pages=5), max_pages=4)["reason"] == "more than 4 pages"
+
+
+def test_triage_orders_largest_first(tmp_path):
+    paths = [make_pdf(tmp_path / f"{n}.pdf", pages=n) for n in (1, 4, 2)]
+    paths.append(make_pdf(tmp_path / "scan.pdf", pages=6, text=""))
+    accepted, skipped = triage(paths)
+    assert accepted == [paths[1], paths[2], paths[0]]
+    assert [r["file"] for r in skipped] == [paths[3]]
+
+    report = tmp_path / "out" / "quarantine.csv"
+    write_report(skipped, str(report))
+    lines = report.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "file,status,reason,size_bytes,pages,text_chars" and len(lines) == 2
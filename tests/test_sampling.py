@@ -0,0 +1,77 @@
+# tests/test_sampling.py
+import numpy as np
+import pandas as pd
+
+from autoreviewx.core.sampling import StratifiedSampler, estimate_corpus, sample_until, stratum_of
+
+
+def corpus(sizes, rates, seed=1):
+    rng = np.random.default_rng(seed)
+    paths, strata, truth = [], [], {}
+    for stratum, size in sizes.items():
+        for i in range(size):
+            path = f"{stratum}/paper_{i}.pdf"
+            paths.append(path)
+            strata.append(stratum)
+            truth[path] = bool(rng.random() < rates[stratum])
+    return paths, strata, truth
+
+
+def test_sampler_allocates_proportionally_without_replacement():
+    paths, strata, _ = corpus({"a": 600, "b": 300, "c": 10}, {"a": 0, "b": 0, "c": 0})
+    sampler = StratifiedSampler(paths, strata, seed=3)
+    first = sampler.draw(91)
+    assert sampler.drawn == {"a": 60, "b": 30, "c": 2}  # small strata still get two papers
+    second = sampler.draw(91)
+    drawn = [path for path, _ in first + second]
+    assert len(drawn) == len(set(drawn)) == sum(sampler.drawn.values())
+    assert all(path.startswith(f"{stratum}/") for path, stratum in first + second)
+    rest = sampler.draw(10_000)
+    assert len(drawn) + len(rest) == 910 and sampler.remaining == 0 and sampler.draw(5) == []
+    assert stratum_of("/corpus/2020/x/paper.pdf", "/corpus") == "2020/x"
+    assert stratum_of("/corpus/paper.pdf", "/corpus") == "."
+
+
+def test_stratified_intervals_cover_the_corpus_rate():
+    paths, strata, truth = corpus({"a": 6000, "b": 3000, "c": 1000}, {"a": 0.2, "b": 0.5, "c": 0.9})
+    sampler = StratifiedSampler(paths, strata, seed=3)
+    sample = sampler.draw(400)
+    rows = pd.DataFrame({"casp_recruitment_pass": [truth[path] for path, _ in sample]}).astype("boolean")
+    report = estimate_corpus(rows, [stratum for _, stratum in sample], sampler.population)
+    row = report.iloc[0]
+    true_rate = np.mean(list(truth.values()))
+    assert row["statistic"] == "pass rate" and row["n"] == 400
+    assert row["ci_low"] <= true_rate <= row["ci_high"]
+    assert abs(row["estimate"] - true_rate) < 0.05
+
+    # A fully processed corpus has no sampling uncertainty left
+    everything = sampler.draw(10_000) + sample
+    rows = pd.DataFrame({"casp_recruitment_pass": [truth[path] for path, _ in everything]}).astype("boolean")
+    report = estimate_corpus(rows, [stratum for _, stratum in everything], sampler.population)
+    assert report.loc[0, "width"] == 0 and abs(report.loc[0, "estimate"] - true_rate) < 1e-4
+
+
+def test_sample_until_stops_at_the_target_width():
+    paths, strata, truth = corpus({"a": 3000, "b": 1000}, {"a": 0.3, "b": 0.7})
+    sampler = StratifiedSampler(paths, strata, seed=0)
+    calls = []
+
+    def extract(batch):
+        calls.append(len(batch))
+        return [None if path.endswith("7.pdf") else
+                {"error": "GROBID down", "source_file": path} if path.endswith("3.pdf") else
+                {"casp_recruitment_pass": truth[path], "score_casp": 0.5 + 0.2 * truth[path],
+                 "population": "students" if truth[path] else ""} for path in batch]
+
+    rows, row_strata, report, failures = sample_until(sampler, extract, 100, target_width=0.12)
+    assert len(calls) > 1 and report["width"].max() <= 0.12
+    # Failed papers (None or error rows) are left out of the sample and its n, and returned apart
+    assert len(rows) == len(row_strata) == sum(calls) - len(failures)
+    assert all("error" not in row for row in rows)
+    assert {f["error"] for f in failures} == {"no result", "GROBID down"}
+    assert report["n"].max() == len(rows)
+    assert set(report["statistic"]) == {"pass rate", "mean", "completeness"}
+
+    sampler = StratifiedSampler(paths, strata, seed=0)
+    _, _, report, _ = sample_until(sampler, extract, 100)  # a single round without a target
+    assert sum(sampler.drawn.values()) == 100 and len(report) == 3
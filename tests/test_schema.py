@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from autoreviewx.core import frameworks as fw
+from autoreviewx.core.frameworks import get_registry
+from autoreviewx.core.schema import apply_schema, export_columns, export_schema, read_table, to_frame, write_table
+
+
+def test_schema_matches_registry_output(monkeypatch):
+    registry = get_registry()
+    monkeypatch.setattr(fw, "document_vectors",
+                        lambda texts, model=None: np.ones((len(texts), 4), dtype=np.float32))
+    monkeypatch.setattr(registry, "_phrase_matrix", None)
+    produced = set(registry.evaluate("The results show a qualitative design."))
+    columns = export_columns()
+    assert produced <= set(columns)
+    assert len(columns) == len(set(columns))
+    assert "kitch_search_strategy_pass" in columns and "kitch_validity" in columns
+    schema = export_schema()
+    assert schema["casp_ethics"] == "boolean" and schema["transparency"] == "Int8"
+    assert schema["casp_ethics_score"] == "float32" and schema["score_casp"] == "float32"
+
+
+def test_to_frame_types_and_extras():
+    rows = [{"title": "A", "year": "2021", "casp_ethics": True, "casp_ethics_score": 0.81,
+             "transparency": 2, "participants_count": "", "error": "boom"},
+            {"title": "B", "casp_ethics": False}]
+    df = to_frame(rows)
+    assert list(df.columns[:2]) == ["title", "authors"] and df.columns[-1] == "error"
+    assert df["casp_ethics"].dtype == "boolean" and df["casp_ethics_score"].dtype == np.float32
+    assert df["participants_count"].isna().all() and df["transparency"].dtype == "Int8"
+    assert "error" not in to_frame(rows, extra=False).columns
+
+
+@pytest.mark.parametrize("extension", [".csv", ".parquet", ".feather"])
+def test_round_trip(tmp_path, extension):
+    df = to_frame([{"title": "A", "year": 2021, "casp_ethics_pass": True, "score_casp": 0.5},
+                   {"title": "B", "casp_ethics_pass": None, "score_casp": None}])
+    path = str(tmp_path / f"out{extension}")
+    write_table(df, path)
+    back = read_table(path)
+    assert back["casp_ethics_pass"].tolist()[0] is True and pd.isna(back["casp_ethics_pass"][1])
+    assert back["score_casp"].dtype == np.float32
+    assert back["year"].astype("string").tolist()[0] == "2021"
+    assert list(read_table(path, columns=["title", "score_casp"]).columns) == ["title", "score_casp"]
+
+
+def test_apply_schema_parses_csv_strings():
+    df = apply_schema(pd.DataFrame({"casp_ethics": ["True", "false", None], "year": [2020.0, None, 2021.0]}))
+    assert df["casp_ethics"].tolist()[:2] == [True, False]
+    assert df["year"].astype("string").tolist()[0] == "2020"
+
+
+def test_append_only_for_csv(tmp_path):
+    df = to_frame([{"title": "A"}])
+    write_table(df, str(tmp_path / "a.csv"), append=True)
+    write_table(df, str(tmp_path / "a.csv"), append=True)
+    assert len(read_table(str(tmp_path / "a.csv"))) == 2
+    with pytest.raises(ValueError):
+        write_table(df, str(tmp_path / "a.parquet"), append=True)
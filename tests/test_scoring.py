@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from autoreviewx.core.scoring import rescore, global_scores, parse_key_values
+
+
+def make_frame():
+    return pd.DataFrame({
+        "casp_clear_aim_score": [0.80, 0.70, np.nan],
+        "casp_ethics_score": [0.76, 0.90, np.nan],
+        "kitch_limitations_score": [0.60, 0.95, 0.75],
+        "transparency": [2, 0, 1],
+        "accuracy": [4, 0, 1],
+        "population": ["students", "", None],
+        "outcome": ["engagement", "grades", None],
+    })
+
+
+def test_rescore_default_threshold():
+    out = rescore(make_frame())
+    assert out["casp_clear_aim_pass"].tolist() == [True, False, False]
+    assert out["score_casp"].tolist()[:2] == [1.0, 0.5]
+    assert np.isnan(out["score_casp"].iloc[2])
+    assert out["score_kitchenham"].tolist() == [0.0, 1.0, 1.0]
+    assert out["score_tapupas"].tolist() == [1.5, 0.0, 0.5]
+    assert out["score_pico"].tolist() == [1.0, 0.5, 0.0]
+
+
+def test_rescore_dimension_threshold_overrides_framework():
+    out = rescore(make_frame(), thresholds={"casp": 0.85, "casp_clear_aim": 0.5})
+    assert out["casp_clear_aim_pass"].tolist() == [True, True, False]
+    assert out["casp_ethics_pass"].tolist() == [False, True, False]
+
+
+def test_rescore_weights():
+    out = rescore(make_frame(), weights={"casp_ethics": 3})
+    # Row 1: clear_aim fails (weight 1), ethics passes (weight 3)
+    assert out["score_casp"].iloc[1] == 0.75
+
+
+def test_global_scores_single_record():
+    scores = global_scores({"prisma_objective_score": 0.9, "prisma_registration_score": 0.1})
+    assert scores == {"score_prisma": 0.5}
+
+
+def test_parse_key_values():
+    assert parse_key_values(["casp=0.8", "kitch_limitations = 0.6"]) == {"casp": 0.8, "kitch_limitations": 0.6}
+    with pytest.raises(ValueError):
+        parse_key_values(["casp"])
+
+
+def test_frameworks_yaml_thresholds_and_plugin_score_columns(monkeypatch):
+    from autoreviewx.core import frameworks as fw
+
+    casp = {**fw.load_frameworks()["casp"], "threshold": 0.85}
+    monkeypatch.setitem(fw._PLUGINS, "casp", casp)
+    monkeypatch.setitem(fw._PLUGINS, "demo", {"score_column": "score_demo", "threshold": 0.5,
+                                              "semantic": {"demo_aim": ["The aim is"], "demo_gap": ["A gap"]}})
+    monkeypatch.setitem(fw._PLUGINS, "ruled", {"score_column": "score_ruled",
+                                               "rules": {"ruled_code": ["github"], "ruled_data": ["dataset"]}})
+    fw.get_registry.cache_clear()
+    try:
+        out = rescore(make_frame())  # 0.80 and 0.76 no longer pass at the YAML threshold
+        assert out["casp_clear_aim_pass"].tolist() == [False, False, False]
+        assert out["score_casp"].tolist()[:2] == [0.0, 0.5]
+        assert out["score_kitchenham"].tolist() == [0.0, 1.0, 1.0]  # still 0.75
+        assert rescore(make_frame(), default_threshold=0.75)["score_casp"].tolist()[:2] == [1.0, 0.5]
+        assert rescore(make_frame(), thresholds={"casp": 0.75})["score_casp"].tolist()[:2] == [1.0, 0.5]
+
+        scores = global_scores({"demo_aim_score": 0.6, "demo_gap_score": 0.4, "ruled_code": True, "ruled_data": False})
+        assert scores == {"score_demo": 0.5, "score_ruled": 0.5}
+    finally:
+        fw.get_registry.cache_clear()
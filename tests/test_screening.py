@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import autoreviewx.core.screening as screening
+
+VOCAB = ["programming", "students", "eeg", "chatgpt", "theory", "conceptual", "hardware", "education"]
+
+
+def fake_vectors(texts, model=None):
+    # Bag of known words: enough to make similarities meaningful
+    return np.array([[t.lower().count(w) for w in VOCAB] for t in texts], dtype=np.float32)
+
+
+CONFIG = {
+    "inclusion_criteria": ["Programming education with students"],
+    "exclusion_criteria": ["Conceptual theory papers", "Hardware only"],
+    "tools_of_interest": ["ChatGPT"],
+    "modalities": ["EEG"],
+}
+
+
+def test_screen_ranks_and_suggests(monkeypatch):
+    monkeypatch.setattr(screening, "bag_of_words_vectors", fake_vectors)
+    df = pd.DataFrame({
+        "title": ["ChatGPT for programming students", "A conceptual theory", "Hardware design", "EEG of students"],
+        "abstract": ["EEG study in programming education", "theory theory", "hardware", None],
+    })
+    result = screening.screen(df, CONFIG, batch_size=2)
+    assert result.index[0] == 0
+    assert result.loc[0, "screen_suggestion"] == "include"
+    assert set(result.loc[[1, 2], "screen_suggestion"]) == {"exclude"}
+    assert result.loc[1, "screen_best_exclusion"] == "Conceptual theory papers"
+    assert result.loc[2, "screen_best_exclusion"] == "Hardware only"
+    assert list(result["screen_score"]) == sorted(result["screen_score"], reverse=True)
+
+
+def test_protocols_share_one_embedding_pass(monkeypatch):
+    embedded = []
+
+    def counting(texts, model=None):
+        embedded.extend(texts)
+        return fake_vectors(texts)
+
+    monkeypatch.setattr(screening, "bag_of_words_vectors", counting)
+    df = pd.DataFrame({
+        "title": ["ChatGPT for programming students", "A conceptual theory", "Hardware only", "EEG of students"],
+        "abstract": ["EEG study in programming education", "theory theory", "hardware", None],
+        "source_file": ["a.pdf", "b.pdf", "c.pdf", "d.pdf"],
+    })
+    other = {"inclusion_criteria": ["EEG"], "exclusion_criteria": ["conceptual theory"]}
+    (first, dropped_first), (second, dropped_second) = screening.apply_protocols(df, [CONFIG, other],
+                                                                                 screen_papers=True)
+    assert list(dropped_first["source_file"]) == ["c.pdf"] and list(dropped_second["source_file"]) == ["b.pdf"]
+    assert first.index[0] == 0 and "screen_score" in first.columns
+    assert second.loc[3, "screen_suggestion"] != "exclude"
+    # Papers embedded once for both configs, plus each config's criteria
+    papers = [t for t in embedded if t in {screening.screening_text(r) for r in df.to_dict("records")}]
+    assert len(papers) == len(df)
+    # Same screening as a single-config run on the kept papers
+    alone = screening.screen(df[df["source_file"] != "c.pdf"], CONFIG)
+    assert first["screen_score"].equals(alone["screen_score"])
+
+    filtered_only = screening.apply_protocols(df, [other])[0][0]
+    assert list(filtered_only["source_file"]) == ["a.pdf", "c.pdf", "d.pdf"]
+
+
+def test_protocols_keep_their_own_framework_columns():
+    df = pd.DataFrame({"source_file": ["a.pdf"], "title": ["A study"], "population": ["students"],
+                       "score_pico": [0.5], "transparency": [2], "score_tapupas": [1.0],
+                       "casp_ethics_score": [0.8], "casp_ethics_pass": [True], "score_casp": [1.0]})
+    configs = [{"framework": "PICO"}, {"framework": "TAPUPAS"}, {"framework": "casp"}]
+    pico, tapupas, casp = [table for table, _ in screening.apply_protocols(df, configs, views=True)]
+    assert list(pico.columns) == ["source_file", "title", "population", "score_pico"]
+    assert list(tapupas.columns) == ["source_file", "title", "transparency", "score_tapupas"]
+    assert list(casp.columns) == ["source_file", "title", "casp_ethics_score", "casp_ethics_pass", "score_casp"]
+    assert list(screening.apply_protocols(df, [{}], views=True)[0][0].columns) == list(df.columns)
+    with pytest.raises(ValueError):
+        screening.apply_protocols(df, [{"framework": "GRADE"}], views=True)
+    # Without views (one config, or explicit --fields/--frameworks) every extracted column is kept
+    assert list(screening.apply_protocols(df, [{"framework": "PICO"}])[0][0].columns) == list(df.columns)
+
+
+def test_screen_requires_inclusion_criteria():
+    with pytest.raises(ValueError):
+        screening.screen(pd.DataFrame({"title": ["x"]}), {"exclusion_criteria": ["y"]})
+
+
+def test_bag_of_words_vectors_match_doc_vector_direction(monkeypatch):
+    import spacy
+    from spacy.vectors import Vectors
+    import autoreviewx.core.nlp as nlp_module
+
+    nlp = spacy.blank("en")
+    rng = np.random.default_rng(0)
+    keys = [nlp.vocab.strings.add(w) for w in VOCAB]
+    nlp.vocab.vectors = Vectors(strings=nlp.vocab.strings, data=rng.normal(size=(len(VOCAB), 16)).astype(np.float32),
+                                keys=keys)
+    monkeypatch.setattr(nlp_module, "get_nlp", lambda model=None: nlp)
+
+    texts = ["programming students eeg unknownword", "theory of hardware education", ""]
+    fast = nlp_module.bag_of_words_vectors(texts)
+    exact = np.array([doc.vector for doc in nlp.tokenizer.pipe(texts)])
+    assert not fast[2].any()
+    cosine = (fast[:2] * exact[:2]).sum(axis=1) / np.linalg.norm(fast[:2], axis=1) / np.linalg.norm(exact[:2], axis=1)
+    assert np.allclose(cosine, 1, atol=1e-5)
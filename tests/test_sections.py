@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+from bs4 import BeautifulSoup
+
+from autoreviewx.core import frameworks as fw
+from autoreviewx.core.config import ConfigError
+from autoreviewx.core.frameworks import FrameworkRegistry, validate_framework
+from autoreviewx.core.sections import classify_head, split_sections
+
+TEI = """<TEI><teiHeader><profileDesc><abstract><p>We study tutoring.</p></abstract></profileDesc></teiHeader>
+<text><body>
+<div><p>Untitled preamble.</p></div>
+<div><head>1 Introduction</head><p>Tutoring matters.</p></div>
+<div><head>2. Method</head><p>Participants were recruited online.</p></div>
+<div><head>2.1 Apparatus</head><p>A laptop.</p></div>
+<div><head>3 Experimental results</head><p>Results show gains.</p></div>
+<div><head>5 Discussion and limitations</head><p>Small sample.</p></div>
+</body><back>
+<div type="acknowledgement"><div><head>Acknowledgements</head><p>Thanks.</p></div></div>
+<div><head>Ethics statement</head><p>Informed consent was obtained.</p></div>
+</back></text></TEI>"""
+
+
+def test_classify_head():
+    assert classify_head("3.1 Participants") == "methods"
+    assert classify_head("IV. RESULTS AND DISCUSSION") == "results"
+    assert classify_head("Threats to Validity") == "limitations"
+    assert classify_head("Acknowledgements") is None and classify_head("") is None
+
+
+def test_split_sections():
+    sections = split_sections(BeautifulSoup(TEI, "xml"))
+    assert set(sections) == {"abstract", "introduction", "methods", "results", "limitations", "ethics"}
+    assert "recruited" in sections["methods"] and "laptop" in sections["methods"]
+    assert "preamble" not in " ".join(sections.values())
+    assert "Thanks" not in " ".join(sections.values())
+    assert "Informed consent" in sections["ethics"]
+
+
+def test_dimensions_scored_on_their_sections(monkeypatch):
+    words = ["consent", "recruited", "gains"]
+    monkeypatch.setattr(fw, "document_vectors", lambda texts, model=None: np.array(
+        [[t.lower().count(w) + 0.01 for w in words] for t in texts], dtype=np.float32))
+    registry = FrameworkRegistry({"demo": {
+        "threshold": 0.9,
+        "semantic": {"demo_recruitment": ["recruited"]},
+        "rules": {"demo_ethics": ["informed consent"], "demo_results": ["gains"]},
+        "sections": {"demo_recruitment": ["methods"], "demo_ethics": ["ethics"], "demo_results": ["conclusion"]},
+    }})
+    text = "Participants were recruited. Results show gains. Informed consent in results, consent, consent."
+    sections = {"methods": "Participants were recruited.", "results": "Results show gains. Informed consent..."}
+
+    whole = registry.evaluate(text)
+    scoped = registry.evaluate(text, sections=sections)
+    assert scoped["demo_recruitment_score"] > whole["demo_recruitment_score"]
+    assert scoped["demo_recruitment_pass"] and not whole["demo_recruitment_pass"]
+    assert whole["demo_ethics"] and not registry.evaluate(text, sections={**sections, "ethics": "None."})["demo_ethics"]
+    # Sections not found in the paper: whole text
+    assert scoped["demo_ethics"] and scoped["demo_results"]
+
+
+def test_invalid_sections():
+    definition = {"rules": {"dim": ["x"]}, "sections": {"dim": ["appendix"]}}
+    with pytest.raises(ConfigError):
+        validate_framework("broken", definition)
+    with pytest.raises(ConfigError):
+        validate_framework("broken", {"rules": {"dim": ["x"]}, "sections": {"other": ["methods"]}})
+
+
+def test_split_text_sections():
+    from autoreviewx.core.sections import split_text_sections
+    text = "\n".join([
+        "A Study of Tutors", "Alice Martin", "Abstract: We study tutors.",
+        "1. Introduction", "Tutors help.", "2 Methods", "We recruited 12 students.",
+        "2.1 Apparatus", "A laptop was used.", "Results of the survey were positive, with",
+        "3. Results", "Gains were large.", "References", "[1] Smith. Results. 2020.",
+    ])
+    sections = split_text_sections(text)
+    assert sections["abstract"] == "We study tutors."
+    assert sections["introduction"] == "Tutors help."
+    assert "recruited" in sections["methods"] and "laptop" in sections["methods"]  # sub-section kept
+    assert sections["results"] == "Gains were large."
+    assert "Smith" not in " ".join(sections.values())
+
+
+def test_wrapped_body_lines_are_not_headings():
+    from autoreviewx.core.sections import split_text_sections
+    text = "\n".join([
+        "Introduction", "",
+        "Chatbots are used in classrooms and", "Results from prior work", "suggest gains in motivation.", "",
+        "Methods", "",
+        "We surveyed 40 students.", "Ethical approval was obtained", "from the board.", "",
+        "Procedure and apparatus", "",  # standalone and recognized: still methods
+        "A laptop was used.", "",
+        "Open questions", "",  # standalone but unknown: body text
+        "Results", "",
+        "Gains were large.",
+    ])
+    sections = split_text_sections(text)
+    assert sections["introduction"] == ("Chatbots are used in classrooms and Results from prior work "
+                                        "suggest gains in motivation.")
+    assert sections["methods"] == ("We surveyed 40 students. Ethical approval was obtained from the board. "
+                                   "A laptop was used. Open questions")
+    assert sections["results"] == "Gains were large."
+    assert "ethics" not in sections
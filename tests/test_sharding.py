@@ -0,0 +1,81 @@
+import csv
+
+import pandas as pd
+import pytest
+
+from autoreviewx.core.schema import read_table, to_frame, write_table
+from autoreviewx.core.sharding import merge_results, parse_shard, select_shard, shard_of
+
+
+def test_parse_shard():
+    assert parse_shard("1/4") == (1, 4)
+    for spec in ["4/4", "1", "a/b", "0/0"]:
+        with pytest.raises(ValueError):
+            parse_shard(spec)
+
+
+def test_shards_partition_files(tmp_path):
+    paths = [str(tmp_path / "sub" / f"paper_{i}.pdf") for i in range(200)]
+    shards = [select_shard(paths, f"{i}/3", str(tmp_path)) for i in range(3)]
+    assert sorted(sum(shards, [])) == sorted(paths)
+    assert all(len(s) > 40 for s in shards)
+    # Stable: the same relative path always lands on the same shard
+    assert shard_of("sub/paper_7.pdf", 3) == shard_of("sub/paper_7.pdf", 3)
+
+
+def test_select_shard_by_content(tmp_path):
+    a = tmp_path / "a.pdf"
+    b = tmp_path / "moved" / "b.pdf"
+    b.parent.mkdir()
+    a.write_bytes(b"same bytes")
+    b.write_bytes(b"same bytes")
+    for i in range(4):
+        selected = select_shard([str(a), str(b)], (i, 4), str(tmp_path), by="content")
+        assert len(selected) in (0, 2)
+
+
+def write_csv(path, rows, columns):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def test_merge_results_dedupes_and_unions_columns(tmp_path):
+    write_csv(tmp_path / "s0.csv", [
+        {"title": "Paper A", "doi": "10.1/A", "source_file": "a.pdf"},
+        {"title": "Paper B", "doi": "", "source_file": "b.pdf"},
+    ], ["title", "doi", "source_file"])
+    write_csv(tmp_path / "s1.csv", [
+        {"title": "paper a", "doi": "https://doi.org/10.1/a", "source_file": "a2.pdf", "score_casp": "0.5"},
+        {"title": "Paper  B!", "doi": "", "source_file": "b2.pdf", "score_casp": "0.1"},
+        {"title": "Paper C", "doi": "", "source_file": "c.pdf", "score_casp": "0.9"},
+    ], ["source_file", "title", "doi", "score_casp"])
+
+    out = tmp_path / "merged.csv"
+    stats = merge_results([str(tmp_path / "s0.csv"), str(tmp_path / "s1.csv")], str(out), ["title", "doi"])
+    assert stats == {"rows": 3, "duplicates": 2}
+    with open(out, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == ["title", "doi", "source_file", "score_casp"]
+    assert [r["source_file"] for r in rows] == ["a.pdf", "b.pdf", "c.pdf"]
+
+
+def test_merge_parquet_shards(tmp_path):
+    pytest.importorskip("pyarrow")
+    write_table(to_frame([{"title": "Paper A", "doi": "10.1/A", "source_file": "a.pdf", "year": "2020"},
+                          {"title": "Paper B", "source_file": "b.pdf"}]), str(tmp_path / "s0.parquet"))
+    write_table(to_frame([{"title": "paper a", "doi": "https://doi.org/10.1/a", "source_file": "a2.pdf"},
+                          {"error": "GROBID down", "source_file": "x.pdf"},
+                          {"title": "Paper C", "source_file": "c.pdf", "year": "2021"}]), str(tmp_path / "s1.parquet"))
+    shards = [str(tmp_path / "s0.parquet"), str(tmp_path / "s1.parquet")]
+
+    stats = merge_results(shards, str(tmp_path / "merged.parquet"), ["title", "doi"])
+    assert stats == {"rows": 3, "duplicates": 1}
+    merged = read_table(str(tmp_path / "merged.parquet"))
+    assert list(merged["source_file"]) == ["a.pdf", "b.pdf", "c.pdf"]
+    assert list(merged["year"].astype("string").fillna("")) == ["2020", "", "2021"]
+
+    # Same rows when the output is a CSV
+    assert merge_results(shards, str(tmp_path / "merged.csv"), ["title", "doi"]) == stats
+    assert list(pd.read_csv(tmp_path / "merged.csv")["source_file"]) == ["a.pdf", "b.pdf", "c.pdf"]
@@ -0,0 +1,116 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+import spacy
+from spacy.vectors import Vectors
+
+from autoreviewx.core import shared_vectors
+from autoreviewx.core.nlp import document_vectors, get_nlp
+
+WORDS = ["students", "programming", "eeg", "theory", "education"]
+
+
+@pytest.fixture
+def model_path(tmp_path, monkeypatch):
+    """Small on-disk model with a pruned table: two keys share the last row."""
+    monkeypatch.setenv(shared_vectors.SHARED_VECTORS_ENV, "{}")  # restored (unset) after the test
+    nlp = spacy.blank("en")
+    rng = np.random.default_rng(0)
+    keys = [nlp.vocab.strings.add(w) for w in WORDS]
+    nlp.vocab.vectors = Vectors(strings=nlp.vocab.strings, data=rng.normal(size=(len(WORDS), 16)).astype(np.float32),
+                                keys=keys)
+    nlp.vocab.vectors.add(nlp.vocab.strings.add("pupils"), row=0)
+    path = str(tmp_path / "tiny_model")
+    nlp.to_disk(path)
+    yield path
+    get_nlp.cache_clear()
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16"])
+def test_shared_table_matches_model(model_path, tmp_path, dtype):
+    text = "programming students and pupils in education"
+    expected = document_vectors([text], model_path)[0]
+
+    prefix = shared_vectors.enable_shared_vectors(model_path, str(tmp_path / "vectors"), dtype=dtype)
+    assert prefix.endswith(f"tiny_model-local-{dtype}")
+    nlp = get_nlp(model_path)
+    table = nlp.vocab.vectors
+    assert isinstance(table.data, np.memmap) and table.data.dtype == np.dtype(dtype)
+    assert table.find(key="pupils") == table.find(key="students")
+
+    shared = document_vectors([text], model_path)[0]
+    cosine = shared @ expected / np.linalg.norm(shared) / np.linalg.norm(expected)
+    assert cosine > 0.9999
+
+
+def test_static_vector_components_need_float32(model_path, tmp_path):
+    nlp = spacy.load(model_path)
+    embed = {"@architectures": "spacy.MultiHashEmbed.v2", "width": 8, "attrs": ["NORM"], "rows": [100],
+             "include_static_vectors": True}
+    encode = {"@architectures": "spacy.MaxoutWindowEncoder.v2", "width": 8, "depth": 1, "window_size": 1,
+              "maxout_pieces": 2}
+    nlp.add_pipe("tok2vec", config={"model": {"@architectures": "spacy.Tok2Vec.v2", "embed": embed,
+                                              "encode": encode}})
+    nlp.add_pipe("sentencizer")
+    nlp.initialize()
+    path = str(tmp_path / "tok2vec_model")
+    nlp.to_disk(path)
+    texts = ["students in education", "eeg theory"]
+    expected = document_vectors(texts, path)
+
+    shared_vectors.enable_shared_vectors(path, str(tmp_path / "vectors"))
+    assert get_nlp(path).pipe_names == ["tok2vec", "sentencizer"]
+    assert all(doc.tensor.shape[0] == len(doc) for doc in get_nlp(path).pipe(texts))
+
+    shared_vectors.enable_shared_vectors(path, str(tmp_path / "vectors"), dtype="float16")
+    half = get_nlp(path)
+    assert half.pipe_names == ["sentencizer"]  # BLIS rejects float16 in StaticVectors (E896)
+    assert [len(list(doc.sents)) for doc in half.pipe(texts)] == [1, 1]
+    assert np.allclose(document_vectors(texts, path), expected, atol=1e-2)
+
+
+def test_workers_map_the_exported_table(model_path, tmp_path):
+    shared_vectors.enable_shared_vectors(model_path, str(tmp_path / "vectors"), dtype="float16")
+    texts = ["theory of eeg", "students"]
+    with multiprocessing.get_context("spawn").Pool(2) as pool:
+        results = pool.starmap(document_vectors, [(texts, model_path)] * 2)
+    for result in results:
+        assert np.allclose(result, document_vectors(texts, model_path))
+
+
+def test_phrase_matrix_built_once(model_path, tmp_path):
+    calls = []
+
+    def build():
+        calls.append(1)
+        return np.eye(3, dtype=np.float32)
+
+    assert shared_vectors.shared_phrase_matrix(["a"], model_path, build) is not None and len(calls) == 1
+    shared_vectors.enable_shared_vectors(model_path, str(tmp_path / "vectors"))
+    first = shared_vectors.shared_phrase_matrix(["a", "b"], model_path, build)
+    second = shared_vectors.shared_phrase_matrix(["a", "b"], model_path, build)
+    assert len(calls) == 2 and isinstance(second, np.memmap)
+    assert np.array_equal(first, second)
+
+
+def test_unknown_dtype(model_path, tmp_path):
+    with pytest.raises(ValueError):
+        shared_vectors.export_vectors(model_path, str(tmp_path), dtype="int8")
+
+
+def test_export_builds_no_components(model_path, tmp_path, monkeypatch):
+    nlp = spacy.load(model_path)
+    nlp.add_pipe("sentencizer")
+    nlp.to_disk(model_path)
+    loaded = []
+    load = spacy.load
+
+    def recording(*args, **kwargs):
+        loaded.append(load(*args, **kwargs))
+        return loaded[-1]
+
+    monkeypatch.setattr(shared_vectors.spacy, "load", recording)
+    prefix = shared_vectors.export_vectors(model_path, str(tmp_path / "vectors"))
+    assert [nlp.pipe_names for nlp in loaded] == [[]]
+    assert np.load(f"{prefix}.data.npy").shape == (len(WORDS), 16)
@@ -0,0 +1,117 @@
+# tests/test_stages.py
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from autoreviewx.core.stages import Stage, StageGraph
+
+
+def test_only_needed_stages_run_in_dependency_order():
+    calls = []
+
+    def stage(name, *inputs):
+        def func(*values):
+            calls.append(name)
+            return name
+        return Stage(name, func, inputs)
+
+    graph = StageGraph([stage("c", "a", "b"), stage("a", "doc"), stage("b", "doc"), stage("unused", "doc")])
+    values = graph.run({"doc": "text"}, ["c"])
+    assert calls == ["a", "b", "c"] and values["c"] == "c" and "unused" not in values
+    with pytest.raises(KeyError):
+        graph.plan(["missing"])
+    with pytest.raises(ValueError):
+        StageGraph([Stage("x", len, ["y"]), Stage("y", len, ["x"])]).plan(["x"])
+
+
+def test_io_stages_overlap_with_cpu_stages():
+    started = threading.Event()
+
+    def fetch(doc):
+        started.set()
+        time.sleep(0.3)
+        return "fetched"
+
+    def compute(doc):
+        assert started.wait(1), "the io stage should already be running"
+        time.sleep(0.3)
+        return "computed"
+
+    graph = StageGraph([Stage("fetch", fetch, ["doc"], io=True), Stage("compute", compute, ["doc"])])
+    start = time.monotonic()
+    values = graph.run({"doc": None}, ["fetch", "compute"])
+    assert values["fetch"] == "fetched" and values["compute"] == "computed"
+    assert time.monotonic() - start < 0.55
+
+
+def test_field_selection_skips_unneeded_stages(monkeypatch):
+    from autoreviewx.core import frameworks as fw
+    from autoreviewx.core import grobid_extractor
+    from autoreviewx.core.frameworks import get_registry
+    from autoreviewx.core.grobid_extractor import FieldSelection, parse_tei, run_extraction
+
+    def no_nlp(*args, **kwargs):
+        raise AssertionError("no vectors are needed for bibliographic fields")
+
+    monkeypatch.setattr(grobid_extractor, "text_vectors", no_nlp)
+    monkeypatch.setattr(grobid_extractor, "document_vectors", no_nlp)
+    tei = ("<TEI><teiHeader><titleStmt><title>A Study of Tutors</title></titleStmt>"
+           "<idno type='DOI'>10.1/x</idno></teiHeader><text><body><div><head>Methods</head>"
+           "<p>We interviewed 12 participants.</p></div></body></text></TEI>")
+    parsed = parse_tei(tei, "paper.pdf")
+
+    row = run_extraction([parsed], FieldSelection(fields=["title", "doi", "samples"]))[0]
+    assert set(row) == {"title", "doi", "source_file", "participants", "participants_count", "stage_timeouts"}
+
+    fake = lambda texts, model=None, **kwargs: np.ones((len(texts), 4), dtype=np.float32)
+    monkeypatch.setattr(fw, "document_vectors", fake)
+    monkeypatch.setattr(grobid_extractor, "text_vectors", fake)
+    monkeypatch.setattr(grobid_extractor, "document_vectors", fake)
+    selection = FieldSelection(frameworks=["casp"])
+    monkeypatch.setattr(selection.registry, "_phrase_matrix", None)
+    row = run_extraction([parsed], selection)[0]
+    assert "score_casp" in row and "casp_recruitment" in row
+    assert not any(column.startswith(("kitch", "prisma")) or column == "score_tapupas" for column in row)
+    assert selection.registry is get_registry().select(["casp"])
+
+    with pytest.raises(ValueError):
+        FieldSelection(fields=["title", "no_such_column"])
+    with pytest.raises(ValueError):
+        FieldSelection(frameworks=["cochrane"])
+
+
+def test_cascade_only_vectorizes_escalated_papers(monkeypatch):
+    from autoreviewx.core import frameworks as fw
+    from autoreviewx.core import grobid_extractor
+    from autoreviewx.core.frameworks import get_registry
+    from autoreviewx.core.grobid_extractor import FieldSelection, parse_tei, run_extraction
+
+    word_vectors = {"aim": [1.0, 0.0], "clear": [1.0, 0.0], "vague": [0.7, 0.7]}
+    vectorized = []
+
+    def fake(texts, model=None, **kwargs):
+        vectorized.extend(texts)
+        return np.array([np.sum([word_vectors.get(w, [0.0, 1.0]) for w in t.lower().split()], axis=0)
+                         for t in texts], dtype=np.float32)
+
+    monkeypatch.setattr(fw, "document_vectors", fake)
+    monkeypatch.setattr(grobid_extractor, "document_vectors", fake)
+    monkeypatch.setattr(grobid_extractor, "text_vectors", fake)
+    monkeypatch.setitem(fw._PLUGINS, "demo", {"threshold": 0.8, "semantic": {"demo_aim": ["aim"]}})
+    get_registry.cache_clear()
+    monkeypatch.setattr(get_registry(), "_phrase_matrix", None)
+    papers = [parse_tei(f"<TEI><teiHeader><titleStmt><title>{name}</title></titleStmt><abstract><p>{abstract}</p>"
+                        f"</abstract></teiHeader><text><body><div><p>{name} body aim aim aim aim aim</p></div>"
+                        "</body></text></TEI>",
+                        f"{name}.pdf") for name, abstract in [("one", "clear"), ("two", "vague"), ("three", "")]]
+    selection = FieldSelection(fields=["frameworks"], frameworks=["demo"], cascade=0.1)
+    selection.registry.phrase_matrix
+    vectorized.clear()
+    rows = run_extraction(papers, selection)
+    get_registry.cache_clear()
+    assert [row["demo_aim_tier"] for row in rows] == ["abstract", "fulltext", "fulltext"]
+    assert rows[0]["demo_aim_pass"] and rows[1]["demo_aim_pass"]
+    assert not any("one body" in text for text in vectorized)  # settled by its abstract
+    assert sum("body" in text for text in vectorized) == 2
@@ -0,0 +1,88 @@
+# tests/test_text_index.py
+import pytest
+
+from autoreviewx.core.text_index import TextIndex, phrase_query, terms_query
+
+PAPERS = [
+    {"source_file": "a.pdf", "doi": "10.1/a", "title": "Chatbots for novice programmers",
+     "abstract": "We study students using a chatbot.", "body": "Informed consent was obtained. Students wrote code."},
+    {"source_file": "b.pdf", "doi": "", "title": "A conceptual theory of learning",
+     "abstract": "Conceptual or opinion-only papers are common.", "body": "No students took part."},
+    {"source_file": "c.pdf", "doi": "", "title": "Eye tracking in classrooms",
+     "abstract": "EEG and eye tracking of students.", "body": "Consent was informed by the chatbot literature."},
+] + [{"source_file": f"filler_{i}.pdf", "title": "Unrelated", "abstract": "Other topic.", "body": "Nothing here."}
+     for i in range(3)]  # BM25 gives no weight to terms found in most of the corpus
+
+
+def test_bm25_phrases_and_fields(tmp_path):
+    index = TextIndex(str(tmp_path / "fulltext.sqlite"))
+    index.add_many(PAPERS)
+
+    hits = index.search("chatbot")
+    assert [hit["source_file"] for hit in hits] == ["a.pdf", "c.pdf"]  # title match weighs more
+    assert hits[0]["score"] > hits[1]["score"] and "[" in hits[0]["snippet"]
+    assert index.count(phrase_query("informed consent")) == 1  # positions: c.pdf only has both words
+    assert index.count(terms_query("informed consent")) == 2
+    assert index.count("student*", fields=["body"]) == 2
+    assert index.count("students", fields=["title"]) == 0
+    with pytest.raises(ValueError):
+        index.search('"unbalanced')
+    with pytest.raises(ValueError):
+        index.search("chatbot", fields=["appendix"])
+
+    # Indexing a paper again replaces it
+    index.add(**{**PAPERS[0], "body": "No consent mentioned."})
+    assert len(index) == 6 and index.count(phrase_query("informed consent")) == 0
+
+    report = index.check_criteria(["Conceptual or opinion-only papers", "Hardware only", "..."])
+    assert [(item["criterion"], item["matches"], item["examples"]) for item in report] == [
+        ("Conceptual or opinion-only papers", 1, ["b.pdf"]), ("Hardware only", 0, [])]
+
+
+def test_extraction_fills_the_text_index(tmp_path, monkeypatch):
+    from autoreviewx.core import grobid_extractor
+    from autoreviewx.core.grobid_extractor import FieldSelection, parse_tei, run_extraction
+
+    tei = ("<TEI><teiHeader><titleStmt><title>A Study of Tutors</title></titleStmt>"
+           "<abstract><p>Tutoring with chatbots.</p></abstract></teiHeader><text><body><div><head>Methods</head>"
+           "<p>We interviewed 12 participants after informed consent.</p></div></body></text></TEI>")
+    index = TextIndex(str(tmp_path / "fulltext.sqlite"))
+    run_extraction([parse_tei(tei, "tutors.pdf")], FieldSelection(fields=["title"]), text_index=index)
+    hit = index.search(phrase_query("informed consent"))[0]
+    assert (hit["source_file"], hit["title"]) == ("tutors.pdf", "A Study of Tutors")
+    assert index.count("chatbots", fields=["abstract"]) == 1
+
+    # The local batch hands the (still empty) index to its chunks
+    (tmp_path / "pdfs").mkdir()
+    (tmp_path / "pdfs" / "tutors.pdf").write_bytes(b"%PDF-1.4")
+    monkeypatch.setattr(grobid_extractor, "parse_local", lambda path: parse_tei(tei, path))
+    index = TextIndex(str(tmp_path / "local.sqlite"))
+    grobid_extractor.extract_batch_metadata_locally(str(tmp_path / "pdfs"), selection=FieldSelection(fields=["title"]),
+                                                    text_index=index)
+    assert len(index) == 1
+
+
+def test_same_file_name_in_two_folders(tmp_path):
+    from autoreviewx.core.grobid_extractor import FieldSelection, parse_tei, run_extraction
+
+    parsed = []
+    for folder, title in (("a", "First Paper"), ("b", "Second Paper")):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / "paper.pdf").write_bytes(f"%PDF-1.4 {title}".encode())
+        tei = f"<TEI><teiHeader><titleStmt><title>{title}</title></titleStmt></teiHeader></TEI>"
+        parsed.append(parse_tei(tei, str(tmp_path / folder / "paper.pdf")))
+    index = TextIndex(str(tmp_path / "fulltext.sqlite"))
+    run_extraction(parsed, FieldSelection(fields=["title"]), text_index=index)
+    assert len(index) == 2 and index.count("paper", fields=["title"]) == 2
+    # Extracting a folder again replaces its papers
+    run_extraction(parsed[:1], FieldSelection(fields=["title"]), text_index=index)
+    assert len(index) == 2
+
+
+def test_body_of_a_table_row(tmp_path):
+    index = TextIndex(str(tmp_path / "fulltext.sqlite"))
+    index.add_many(PAPERS[:2] + [{"key": "sha1:other", "source_file": "b.pdf", "title": "Same name", "body": "x"}])
+    assert index.body(doi="10.1/A") == PAPERS[0]["body"]
+    assert index.body(doi="10.1/unknown", source_file="a.pdf") == PAPERS[0]["body"]
+    assert index.body(source_file="b.pdf") == ""  # two indexed papers named b.pdf
+    assert index.body() == ""
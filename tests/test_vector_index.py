@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from autoreviewx.core.vector_index import VectorIndex
+
+
+def test_add_search_and_reload(tmp_path):
+    index = VectorIndex(str(tmp_path), model="test-model")
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(50, 8)).astype(np.float32)
+    for i, v in enumerate(vectors):
+        assert index.add(v, {"title": f"Paper {i}", "doi": f"10.1/{i}", "source_file": f"p{i}.pdf"})
+    # Same DOI or file is not indexed twice
+    assert not index.add(vectors[0], {"doi": "10.1/0"})
+
+    reloaded = VectorIndex(str(tmp_path))
+    assert len(reloaded) == 50
+    row = reloaded.find(doi="10.1/7")
+    assert reloaded.find(source_file="p7.pdf") == row == 7
+
+    hits = reloaded.search(reloaded.vector(row), k=3, exclude=row)
+    assert len(hits) == 3 and all(r["doi"] != "10.1/7" for _, r in hits)
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-normalized @ normalized[7])
+    assert [r["source_file"] for _, r in hits] == [f"p{i}.pdf" for i in expected[1:4]]
+
+
+def test_dimension_and_model_mismatch(tmp_path):
+    VectorIndex(str(tmp_path), model="a").add(np.ones(4), {"source_file": "x.pdf"})
+    with pytest.raises(ValueError):
+        VectorIndex(str(tmp_path), dim=8)
+    with pytest.raises(ValueError):
+        VectorIndex(str(tmp_path), model="b")
+
+
+def test_same_file_name_in_two_folders(tmp_path):
+    from autoreviewx.core.sharding import document_key
+    for folder, text in (("a", b"%PDF-1.4 first"), ("b", b"%PDF-1.4 second")):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / "paper.pdf").write_bytes(text)
+    keys = [document_key(str(tmp_path / folder / "paper.pdf")) for folder in "ab"]
+    index = VectorIndex(str(tmp_path / "index"))
+    assert index.add(np.ones(4), {"source_file": "paper.pdf", "key": keys[0]})
+    assert index.add(np.arange(4), {"source_file": "paper.pdf", "key": keys[1]})
+    assert not index.add(np.ones(4), {"source_file": "renamed.pdf", "key": keys[0]})
+    assert [index.find(key=key) for key in keys] == [0, 1]
@@ -0,0 +1,69 @@
+from autoreviewx.core.watcher import PdfWatcher
+
+
+def record(processed):
+    """``process`` callback that succeeds for every path."""
+    def process(paths):
+        processed.extend(paths)
+        return paths
+    return process
+
+
+def write_pdf(path, body=b"%PDF-1.4 test", complete=True):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(body + (b"\n%%EOF\n" if complete else b""))
+
+
+def test_watcher_processes_only_delta(tmp_path):
+    root = tmp_path / "pdfs"
+    write_pdf(root / "a.pdf")
+    write_pdf(root / "sub" / "b.pdf")
+    write_pdf(root / "sub" / "partial.pdf", complete=False)
+    processed = []
+    state = tmp_path / "out.csv.state.json"
+
+    watcher = PdfWatcher(str(root), record(processed), state_path=str(state), settle=0, use_inotify=False)
+    watcher.run(once=True)
+    assert sorted(p.rsplit("/", 1)[-1] for p in processed) == ["a.pdf", "b.pdf"]
+
+    # A restarted watcher only sees new or changed files
+    processed.clear()
+    write_pdf(root / "c.pdf")
+    write_pdf(root / "a.pdf", body=b"%PDF-1.4 changed")
+    watcher = PdfWatcher(str(root), record(processed), state_path=str(state), settle=0, use_inotify=False)
+    watcher.run(once=True)
+    assert sorted(p.rsplit("/", 1)[-1] for p in processed) == ["a.pdf", "c.pdf"]
+
+
+def test_watcher_debounces_unsettled_files(tmp_path):
+    write_pdf(tmp_path / "a.pdf")
+    processed = []
+    watcher = PdfWatcher(str(tmp_path), record(processed), state_path=str(tmp_path / "s.json"), settle=60)
+    assert watcher.poll([str(tmp_path / "a.pdf")]) == []
+    assert processed == []
+
+
+def test_failed_files_are_retried_with_backoff(tmp_path):
+    write_pdf(tmp_path / "a.pdf")
+    write_pdf(tmp_path / "b.pdf")
+    paths = [str(tmp_path / "a.pdf"), str(tmp_path / "b.pdf")]
+    attempts = []
+
+    def process(batch):  # GROBID is down for b.pdf
+        attempts.extend(batch)
+        return [path for path in batch if not path.endswith("b.pdf")]
+
+    state = tmp_path / "s.json"
+    watcher = PdfWatcher(str(tmp_path), process, state_path=str(state), settle=0, backoff=60)
+    assert watcher.poll(paths) == paths
+    assert watcher.poll(paths) == []  # b.pdf waits for its backoff
+    assert list(watcher.state) == [paths[0]] and watcher.failed[paths[1]][0] == 1
+
+    watcher.backoff = 0
+    watcher.failed[paths[1]] = (1, 0)  # backoff elapsed
+    assert watcher.poll(paths) == [paths[1]] and watcher.failed[paths[1]][0] == 2
+
+    # A restarted watcher retries it, and --once stops after reporting the failure
+    attempts.clear()
+    PdfWatcher(str(tmp_path), process, state_path=str(state), settle=0, use_inotify=False).run(once=True)
+    assert attempts == [paths[1]]